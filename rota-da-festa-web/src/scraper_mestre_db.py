@@ -109,38 +109,54 @@ def gerar_eventos_para_db():
             "status": "aprovado"
         })
 
-    # 3. Inserir no Supabase (Upsert)
-    total_sucesso = 0
-    total_erro = 0
-
+    # 3. Inserir no Supabase (Upsert em lotes)
     print(f"📦 A processar {len(eventos_para_inserir)} eventos...")
+    inicio = time.monotonic()
+    total_sucesso, total_erro = upsert_em_lotes(eventos_para_inserir)
+    elapsed = time.monotonic() - inicio
 
-    for evento in eventos_para_inserir:
-        try:
-            # on_conflict="nome,data" assume que criaste uma constraint UNIQUE na BD
-            # Se não criaste, ele vai inserir duplicados. O ideal é ter a constraint.
-            response = supabase.table("eventos").upsert(evento).execute()
-            
-            # Verificar se houve erro na resposta (supabase-py v2 lança exceção, mas verificamos response)
-            if hasattr(response, 'error') and response.error:
-                print(f"❌ Erro ao inserir '{evento['nome']}': {response.error}")
-                total_erro += 1
-            else:
-                print(f"✅ Inserido/Atualizado: {evento['nome']}")
-                total_sucesso += 1
-                
-        except Exception as e:
-            # Captura erros de rede ou constraint violations
-            print(f"⚠️ Exceção no evento '{evento['nome']}': {e}")
-            total_erro += 1
-            
-        # Pequeno delay para não saturar a API (opcional)
-        time.sleep(0.1)
-
-    print(f"
-🏁 Processo concluído!")
+    print(f"\n🏁 Processo concluído em {elapsed:.1f}s "
+          f"({total_sucesso / elapsed if elapsed > 0 else 0:.0f} eventos/s)")
     print(f"   Sucessos: {total_sucesso}")
     print(f"   Erros/Saltados: {total_erro}")
 
+
+def upsert_em_lotes(eventos, tamanho_lote=None):
+    """Upsert em lotes (um pedido por lote em vez de um por evento).
+
+    Cada lote só leva eventos com as mesmas colunas (num upsert em bloco as
+    colunas em falta iriam a NULL). Um lote que falha é partido ao meio até
+    isolar o evento problemático. Devolve (sucessos, erros).
+    """
+    tamanho_lote = tamanho_lote or int(os.environ.get("SUPABASE_LOTE", "200"))
+    grupos = {}
+    for evento in eventos:
+        grupos.setdefault(frozenset(evento), []).append(evento)
+
+    sucessos = 0
+    erros = 0
+
+    def _enviar(lote):
+        nonlocal sucessos, erros
+        try:
+            # Tal como antes, sem on_conflict (os eventos gerados não trazem id)
+            supabase.table("eventos").upsert(lote).execute()
+            sucessos += len(lote)
+            print(f"✅ Inseridos/Atualizados: {len(lote)} eventos")
+        except Exception as e:
+            if len(lote) == 1:
+                print(f"⚠️ Exceção no evento '{lote[0]['nome']}': {e}")
+                erros += 1
+                return
+            meio = len(lote) // 2
+            _enviar(lote[:meio])
+            _enviar(lote[meio:])
+
+    for grupo in grupos.values():
+        for i in range(0, len(grupo), tamanho_lote):
+            _enviar(grupo[i:i + tamanho_lote])
+    return sucessos, erros
+
+
 if __name__ == "__main__":
     gerar_eventos_para_db()
@@ -0,0 +1,96 @@
+"""
+Benchmark das distâncias do dashboard — Rota da Festa
+======================================================
+Compara, sobre eventos sintéticos espalhados por Portugal continental:
+  - `df.apply(haversine, axis=1)` por linha (como era feito em app.py)
+  - `haversine_km` vetorizado sobre as colunas
+  - `GrelhaEspacial.dentro_do_raio` para vários raios
+e confirma que as distâncias e os eventos dentro de cada raio coincidem.
+
+Uso:
+    python bench/bench_distancias.py [--eventos 100000]
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from geo_espacial import GrelhaEspacial, haversine_km  # noqa: E402
+
+PONTO = (41.1469, -8.6111)  # Porto (Aliados)
+RAIOS = [5, 25, 100, 200]
+
+
+def _haversine(lat1, lon1, lat2, lon2):
+    """A versão por linha que app.py usava."""
+    R = 6371
+    dlat = math.radians(lat2 - lat1)
+    dlon = math.radians(lon2 - lon1)
+    a = math.sin(dlat/2) * math.sin(dlat/2) + \
+        math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * \
+        math.sin(dlon/2) * math.sin(dlon/2)
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
+    return R * c
+
+
+def _gerar(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    # Metade concentrada à volta do Porto/Braga/Aveiro, metade espalhada
+    centros = np.array([[41.15, -8.61], [41.55, -8.42], [40.64, -8.65]])
+    perto = centros[rng.integers(0, len(centros), n // 2)] + rng.normal(0, 0.15, (n // 2, 2))
+    longe = np.column_stack([rng.uniform(37.0, 42.1, n - n // 2), rng.uniform(-9.5, -6.2, n - n // 2)])
+    coords = np.vstack([perto, longe])
+    return pd.DataFrame({"latitude": coords[:, 0], "longitude": coords[:, 1]})
+
+
+def _medir(fn, repeticoes: int = 5):
+    melhor, resultado = float("inf"), None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = fn()
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return melhor, resultado
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--eventos", type=int, default=100000)
+    args = ap.parse_args()
+
+    df = _gerar(args.eventos)
+    lat, lon = PONTO
+    lats, lons = df["latitude"].to_numpy(), df["longitude"].to_numpy()
+
+    t_apply, esperado = _medir(lambda: df.apply(
+        lambda row: _haversine(lat, lon, row["latitude"], row["longitude"]), axis=1).to_numpy(), 1)
+    t_vetor, obtido = _medir(lambda: haversine_km(lat, lon, lats, lons))
+    erro = float(np.max(np.abs(esperado - obtido)))
+    t_build, grelha = _medir(lambda: GrelhaEspacial(lats, lons))
+
+    print(f"{len(df)} eventos, distâncias a partir de {PONTO}")
+    print(f"  df.apply(haversine):  {t_apply * 1000:9.1f} ms")
+    print(f"  haversine_km (NumPy): {t_vetor * 1000:9.1f} ms  (erro máximo {erro:.1e} km)")
+    print(f"  GrelhaEspacial:       {t_build * 1000:9.1f} ms a construir, {len(grelha)} pontos")
+
+    diferentes = int(erro > 1e-6)
+    for raio in RAIOS:
+        t_mascara, pos_mascara = _medir(lambda: np.flatnonzero(haversine_km(lat, lon, lats, lons) <= raio))
+        t_grelha, (pos_grelha, dist) = _medir(lambda: grelha.dentro_do_raio(lat, lon, raio))
+        iguais = np.array_equal(pos_mascara, pos_grelha) and np.allclose(dist, obtido[pos_grelha])
+        diferentes += not iguais
+        print(f"  ≤ {raio:3d} km: {len(pos_grelha):6d} eventos  máscara {t_mascara * 1000:6.2f} ms"
+              f"  grelha {t_grelha * 1000:6.2f} ms  {'✅' if iguais else '❌'}")
+
+    print(f"⚡ {t_apply / t_vetor:.0f}x  {'✅ resultados idênticos' if not diferentes else f'❌ {diferentes} diferenças'}")
+    sys.exit(1 if diferentes else 0)
+
+
+if __name__ == "__main__":
+    main()
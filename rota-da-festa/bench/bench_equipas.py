@@ -0,0 +1,96 @@
+"""
+Benchmark do índice de nomes de equipas — Rota da Festa
+========================================================
+Compara a varredura linear com `_team_match` (como era feito em
+geolocalizar_estadio / is_portuguese_game) com `IndiceEquipas`, sobre alguns
+milhares de equipas e jogos sintéticos, e confirma que a chave devolvida é
+sempre a mesma.
+
+Uso:
+    python bench/bench_equipas.py [--equipas 3000] [--jogos 3000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "benchmark")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from scraper_mestre import CACHE_ESTADIOS, _team_match  # noqa: E402
+from team_index import IndiceEquipas  # noqa: E402
+
+_PREFIXOS = ["", "", "", "FC ", "SC ", "CD ", "GD ", "AD ", "UD ", "Sporting ", "Académico "]
+_SUFIXOS = ["", "", "", " FC", " SC", " B", " Sub-19", " Sub-17", " Feminino", " AC"]
+_LOCAIS = [
+    "Alvite", "Amares", "Arcos", "Barcelos", "Cabeceiras", "Celorico", "Esposende",
+    "Fafe", "Guimarães", "Maia", "Vizela", "Trofa", "Tirsense", "Famalicão", "Lousada",
+    "Felgueiras", "Paredes", "Penafiel", "Gondomar", "Valongo", "Ermesinde", "Leça",
+    "Matosinhos", "Gaia", "Espinho", "Feira", "Ovar", "Oliveirense", "Estarreja", "Ílhavo",
+]
+
+
+def _gerar(rng: random.Random, n_equipas: int, n_jogos: int):
+    equipas = list(CACHE_ESTADIOS)
+    while len(equipas) < n_equipas:
+        local = rng.choice(_LOCAIS)
+        if rng.random() < 0.5:
+            local = f"{local} {rng.choice(_LOCAIS)}"
+        equipas.append(f"{rng.choice(_PREFIXOS)}{local}{rng.randint(1, 999)}")
+    nomes = []
+    for _ in range(n_jogos * 2):
+        base = rng.choice(equipas)
+        r = rng.random()
+        if r < 0.3:
+            nomes.append(base)
+        elif r < 0.4:
+            nomes.append(f"{base}{rng.choice(_SUFIXOS)}".upper())
+        elif r < 0.6:
+            nomes.append(f" {base}{rng.choice(_SUFIXOS)} ")
+        else:
+            nomes.append(f"{rng.choice(_PREFIXOS)}{rng.choice(_LOCAIS)} {rng.choice(_LOCAIS)}")
+    return equipas, nomes
+
+
+def _linear(equipas, nome):
+    for k in equipas:
+        if _team_match(k, nome):
+            return k
+    return None
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--equipas", type=int, default=3000)
+    ap.add_argument("--jogos", type=int, default=3000)
+    args = ap.parse_args()
+
+    equipas, nomes = _gerar(random.Random(7), args.equipas, args.jogos)
+
+    inicio = time.perf_counter()
+    esperado = [_linear(equipas, n) for n in nomes]
+    t_linear = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    indice = IndiceEquipas(equipas)
+    t_build = time.perf_counter() - inicio
+
+    inicio = time.perf_counter()
+    obtido = [indice.procurar(n) for n in nomes]
+    t_indice = time.perf_counter() - inicio
+
+    diferentes = sum(1 for a, b in zip(esperado, obtido) if a != b)
+    matches = sum(1 for a in esperado if a is not None)
+    print(f"{len(equipas)} equipas × {len(nomes)} nomes ({matches} com match)")
+    print(f"  linear (_team_match): {t_linear * 1000:9.1f} ms  ({t_linear / len(nomes) * 1e6:7.1f} µs/nome)")
+    print(f"  IndiceEquipas:        {t_indice * 1000:9.1f} ms  ({t_indice / len(nomes) * 1e6:7.1f} µs/nome)"
+          f"  + {t_build * 1000:.1f} ms a construir")
+    print(f"⚡ {t_linear / t_indice:.0f}x  {'✅ resultados idênticos' if not diferentes else f'❌ {diferentes} diferenças'}")
+    sys.exit(1 if diferentes else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark do mapa do dashboard — Rota da Festa
+===============================================
+Mede o tempo de construção + renderização do HTML do mapa e o tamanho da
+página, com eventos sintéticos à volta de Aveiro/Porto/Braga:
+  - clássico: um `folium.Marker` com popup HTML por evento num MarkerCluster
+    (como app.py faz até LIMITE_MARCADORES eventos)
+  - rápido: `camada_rapida` com todos os eventos num só array
+  - rápido + desbaste: só o que `desbastar` deixa passar para a vista inicial
+
+Uso:
+    python bench/bench_mapa.py [--eventos 1000 10000 50000] [--sem-classico-acima 10000]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import folium  # noqa: E402
+from folium.plugins import MarkerCluster  # noqa: E402
+
+from geo_espacial import haversine_km  # noqa: E402
+from mapa_rapido import MAX_PONTOS, camada_rapida, desbastar, vista_inicial  # noqa: E402
+
+PONTO = (40.6405, -8.6538)  # Aveiro (Centro), o local por omissão do dashboard
+ZOOM = 11
+
+
+def _gerar(n: int) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    centros = np.array([[40.64, -8.65], [41.15, -8.61], [41.55, -8.42]])
+    coords = centros[rng.integers(0, len(centros), n)] + rng.normal(0, 0.3, (n, 2))
+    futebol = rng.random(n) < 0.6
+    df = pd.DataFrame({
+        "nome": [f"{'Jogo' if f else 'Festa'} {i} — Clube & Associação <{i % 97}>" for i, f in enumerate(futebol)],
+        "tipo": np.where(futebol, "Futebol", "Festa"),
+        "data": "2026-06-13",
+        "hora": "16:00",
+        "preco": "Grátis",
+        "latitude": coords[:, 0],
+        "longitude": coords[:, 1],
+    })
+    df["url_maps"] = [f"https://www.google.com/maps/search/?api=1&query={a:.5f},{b:.5f}"
+                      for a, b in zip(df["latitude"], df["longitude"])]
+    df["distancia"] = haversine_km(*PONTO, df["latitude"].to_numpy(), df["longitude"].to_numpy())
+    return df
+
+
+def _mapa():
+    return folium.Map(location=list(PONTO), zoom_start=ZOOM, tiles="Cartodb Positron")
+
+
+def _classico(df):
+    m = _mapa()
+    cluster = MarkerCluster().add_to(m)
+    for _, row in df.iterrows():
+        cor = "green" if row['tipo'] == "Futebol" else "red"
+        icon = "futbol-o" if row['tipo'] == "Futebol" else "glass"
+        html = f"""
+        <div style='font-family: sans-serif; min-width: 180px'>
+            <b>{row['nome']}</b><br>
+            <small>{row['data']} • {row['hora']}</small><br>
+            <span style='color: green'>{row['preco']}</span><br>
+            <a href='{row['url_maps']}' target='_blank'>Navegar ➔</a>
+        </div>
+        """
+        folium.Marker(
+            [row['latitude'], row['longitude']],
+            popup=html,
+            tooltip=f"{row['nome']} ({row['distancia']:.1f} km)",
+            icon=folium.Icon(color=cor, icon=icon, prefix="fa")
+        ).add_to(cluster)
+    return m.get_root().render()
+
+
+def _rapido(df):
+    m = _mapa()
+    camada_rapida(df).add_to(m)
+    return m.get_root().render()
+
+
+def _desbastado(df):
+    m = _mapa()
+    posicoes = desbastar(df['latitude'], df['longitude'], vista_inicial(*PONTO, ZOOM))
+    camada_rapida(df.iloc[posicoes]).add_to(m)
+    return m.get_root().render(), len(posicoes)
+
+
+def _medir(fn):
+    inicio = time.perf_counter()
+    resultado = fn()
+    return time.perf_counter() - inicio, resultado
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--eventos", type=int, nargs="+", default=[1000, 10000, 50000])
+    ap.add_argument("--sem-classico-acima", type=int, default=10000,
+                    help="não medir o modo clássico acima deste número de eventos")
+    args = ap.parse_args()
+
+    falhas = 0
+    for n in args.eventos:
+        df = _gerar(n)
+        print(f"{n} eventos")
+        if n <= args.sem_classico_acima:
+            t, html = _medir(lambda: _classico(df))
+            print(f"  clássico (Marker por evento): {t * 1000:9.0f} ms  {len(html) / 1024:9.0f} KB")
+        t_rapido, html = _medir(lambda: _rapido(df))
+        print(f"  rápido (FastMarkerCluster):   {t_rapido * 1000:9.0f} ms  {len(html) / 1024:9.0f} KB")
+        t, (html, desenhados) = _medir(lambda: _desbastado(df))
+        print(f"  rápido + desbaste:            {t * 1000:9.0f} ms  {len(html) / 1024:9.0f} KB"
+              f"  ({desenhados} eventos desenhados)")
+        # Tudo o que está na vista inicial tem de ser desenhado
+        sul, oeste, norte, leste = vista_inicial(*PONTO, ZOOM)
+        na_vista = ((df['latitude'] >= sul) & (df['latitude'] <= norte)
+                    & (df['longitude'] >= oeste) & (df['longitude'] <= leste)).sum()
+        if min(na_vista, MAX_PONTOS) > desenhados:
+            print(f"  ❌ {na_vista} eventos na vista inicial, só {desenhados} desenhados")
+            falhas += 1
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Micro-benchmark dos backends de parsing HTML — Rota da Festa
+=============================================================
+Compara, sobre as fixtures em bench/fixtures, o fluxo antigo (html.parser,
+com a página re-parseada pelo diagnóstico/segundo extractor) com o fluxo
+actual (uma única soup partilhada) em cada backend disponível, e confirma
+que os jogos extraídos são os mesmos.
+
+Uso:
+    python bench/bench_parser.py [--repeticoes 20]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+# O scraper exige credenciais ao importar; para o benchmark bastam valores fictícios
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "benchmark")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from fixtures import carregar  # noqa: E402
+from html_backend import _PARSER_PADRAO, make_soup  # noqa: E402
+import scraper_mestre as sm  # noqa: E402
+
+
+def _extrair(html, parser: str, partilhada: bool):
+    """Corre os extractores como o scraper (agenda → parse_games; resto → ambos)."""
+    if partilhada:
+        soup = make_soup(html, parser)
+        return sm.extract_games_from_page(soup) + sm.parse_games_from_html(soup), soup.title
+    # Fluxo antigo: cada extractor e o diagnóstico parseiam o documento de novo
+    jogos = sm.extract_games_from_page(make_soup(html, parser)) + sm.parse_games_from_html(make_soup(html, parser))
+    return jogos, make_soup(html, parser).title
+
+
+def _medir(fn, repeticoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        fn()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de parsing HTML")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    args = parser.parse_args()
+
+    backends = ["html.parser"]
+    if _PARSER_PADRAO == "lxml":
+        backends.append("lxml")
+    else:
+        print("⚠️ lxml não instalado — só html.parser será medido")
+
+    fixtures = carregar()
+    print(f"{'fixture':<30} {'KB':>5} {'fluxo':<28} {'parse ms':>9} {'total ms':>9} {'speedup':>8} jogos")
+    total_base, total_melhor = 0.0, 0.0
+    for nome, html in fixtures.items():
+        parse_ms = _medir(lambda: make_soup(html, "html.parser"), args.repeticoes)
+        # O fluxo antigo parseia cada documento 3 vezes (dois extractores + diagnóstico)
+        base_ms = _medir(lambda: _extrair(html, "html.parser", False), args.repeticoes)
+        base_jogos, _ = _extrair(html, "html.parser", False)
+        print(f"{nome:<30} {len(html) // 1024:>5} {'html.parser (re-parse)':<28} "
+              f"{parse_ms * 3:>9.2f} {base_ms:>9.2f} {'1.0x':>8} {len(base_jogos)}")
+        melhor = base_ms
+        for backend in backends:
+            parse_ms = _medir(lambda: make_soup(html, backend), args.repeticoes)
+            ms = _medir(lambda: _extrair(html, backend, True), args.repeticoes)
+            jogos, _ = _extrair(html, backend, True)
+            igual = "✅" if jogos == base_jogos else "⚠️ difere"
+            print(f"{'':<30} {'':>5} {backend + ' (soup única)':<28} "
+                  f"{parse_ms:>9.2f} {ms:>9.2f} {base_ms / ms:>7.1f}x {len(jogos)} {igual}")
+            melhor = min(melhor, ms)
+        total_base += base_ms
+        total_melhor += melhor
+    print(f"\n⚡ Total: {total_base:.1f} ms → {total_melhor:.1f} ms por ronda de fixtures "
+          f"({total_base / total_melhor:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
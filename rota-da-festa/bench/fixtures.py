@@ -0,0 +1,224 @@
+"""
+Fixtures HTML para benchmarks e verificação dos extractores — Rota da Festa
+===========================================================================
+As páginas em bench/fixtures/*.html imitam a estrutura do ZeroZero (agenda,
+competição, edição/próximos jogos e página de jogo). As datas estão escritas
+como marcadores {{D+n}} e são substituídas ao carregar, para que os filtros de
+janela temporal dos extractores continuem a aceitar os jogos.
+
+Uso:
+    python bench/fixtures.py --gerar               # (re)gera as fixtures sintéticas
+    python bench/fixtures.py --gravar URL [URL...] # grava páginas reais do ZeroZero
+"""
+
+import argparse
+import os
+import random
+import re
+from datetime import datetime, timedelta
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+_EQUIPAS = [
+    "Merelinense", "Vilaverdense", "Dumiense FC", "Brito SC", "Arões SC", "Águias de Alvite",
+    "Serzedelo", "Martim", "GD Joane", "Pevidém", "Caçadores das Taipas", "Berço SC",
+    "CD Celeirós", "Forjães SC", "AD Ninense", "GD Prado", "Maria da Fonte", "Santa Maria FC",
+    "Real Madrid", "Barcelona", "Atlético Madrid", "Sevilla", "Lyon", "Inter", "Ajax",
+    "Benfica", "Sporting", "FC Porto", "SC Braga", "Vitória SC", "Rio Ave", "Famalicão",
+    "Leixões", "Feirense", "Oliveirense", "Padroense", "Infesta", "Foz", "Canidelo",
+]
+_COMPETICOES = [
+    ("Liga Portugal Betclic", True), ("Liga Portugal 2", True), ("Liga 3", True),
+    ("Pro-Nacional AF Braga", True), ("Divisão de Honra AF Porto", True),
+    ("Juniores A Sub-19 AF Braga", True), ("Juvenis Sub-17 AF Aveiro", True),
+    ("Iniciados Sub-15 AF Porto", True), ("LaLiga", False), ("Serie A", False),
+    ("Ligue 1", False), ("Eredivisie", False), ("Amigável", False),
+]
+
+
+def _ruido(rnd: random.Random, n: int) -> str:
+    """Navegação, scripts e sidebar — o peso típico de uma página real."""
+    links = "".join(
+        f'<li><a href="/noticia/{rnd.randint(100000, 999999)}" class="nav_item">Notícia {i}</a></li>'
+        for i in range(n)
+    )
+    script = "<script>var zz={" + ",".join(f'"k{i}":{i}' for i in range(n)) + "};</script>"
+    return f'<div id="header"><ul class="menu">{links}</ul></div>{script}'
+
+
+def _agenda(rnd: random.Random, n: int = 400) -> str:
+    linhas, matchboxes = [], []
+    for _ in range(n):
+        casa, fora = rnd.sample(_EQUIPAS, 2)
+        comp, pt = rnd.choice(_COMPETICOES)
+        dia = rnd.randint(0, 6)
+        gid = rnd.randint(9000000, 9999999)
+        hora = f"{rnd.randint(10, 21):02d}:{rnd.choice(['00', '15', '30', '45'])}"
+        flag = '<div class="image"><img src="/flags/flag:PT.png"></div>' if pt else '<div class="image"></div>'
+        resultado = rnd.choice(["vs", "x", f"{rnd.randint(0, 4)}-{rnd.randint(0, 4)}"])
+        linhas.append(
+            f'<tr class="parent"><td class="time">{hora}</td><td class="info">'
+            f'<div class="main_info">{flag}<span class="comp">{comp}</span></div>'
+            f'<a href="/jogo/{{{{D+{dia}}}}}-{casa.lower().replace(" ", "-")}/{gid}">{casa} {resultado} {fora}</a>'
+            f'<div class="match_info">{comp}</div></td>'
+            f'<td class="tv"><a href="/tv/{gid}">TV</a></td></tr>'
+        )
+        if rnd.random() < 0.3:
+            gid2 = rnd.randint(9000000, 9999999)
+            matchboxes.append(
+                f'<li class="game"><a href="/live-ao-minuto/{{{{D+{dia}}}}}-x/{gid2}"></a>'
+                f'<div class="team"><span class="title">{casa}</span></div>'
+                f'<div class="team"><span class="title">{fora}</span></div>'
+                f'<div class="date"><span>{{{{D+{dia}}}}} {hora}</span></div>'
+                f'<div class="comp">{flag} {comp}</div></li>'
+            )
+    return (
+        "<!DOCTYPE html><html><head><title>Agenda de jogos | zerozero.pt</title></head><body>"
+        + _ruido(rnd, 300)
+        + '<table class="agenda_list">' + "".join(linhas) + "</table>"
+        + '<ul class="matchbox">' + "".join(matchboxes) + "</ul>"
+        + "</body></html>"
+    )
+
+
+def _edicao(rnd: random.Random, n: int = 60) -> str:
+    linhas = []
+    for i in range(n):
+        casa, fora = rnd.sample(_EQUIPAS[:18], 2)
+        dia = rnd.randint(-3, 20)
+        data = f"{{{{D+{dia}}}}}" if dia >= 0 else f"{{{{D{dia}}}}}"
+        gid = rnd.randint(8000000, 8999999)
+        hora = f"{rnd.randint(10, 18):02d}:00"
+        jogo_link = (
+            f'<a href="/jogo/{data}-{casa.lower().replace(" ", "-")}/{gid}">vs</a>'
+            if i % 7 else f'<a href="/jogo/{gid}">vs</a><span class="data">{data}</span>'
+        )
+        linhas.append(
+            f'<tr><td class="date">{data}</td><td class="hour">{hora}</td>'
+            f'<td class="home"><a href="/equipa/{casa.lower().replace(" ", "-")}/{gid % 1000}">'
+            f'<img src="/logo.png"></a><a href="/equipa/{casa.lower().replace(" ", "-")}/{gid % 1000}">{casa}</a></td>'
+            f'<td class="result">{jogo_link}</td>'
+            f'<td class="away"><a href="/equipa/{fora.lower().replace(" ", "-")}/{gid % 997}">{fora}</a></td></tr>'
+        )
+    return (
+        "<!DOCTYPE html><html><head><title>Pro-Nacional AF Braga 2026/27 | zerozero.pt</title></head><body>"
+        + _ruido(rnd, 200)
+        + '<div class="header"><h1>Pro-Nacional AF Braga</h1></div>'
+        + '<table class="zztable stats">' + "".join(linhas) + "</table>"
+        + '<div id="sidebar"><a href="/jogo/{{D+1}}-outro/7777777">Outro vs Jogo</a></div>'
+        + "</body></html>"
+    )
+
+
+def _edicao_formacao(rnd: random.Random, n: int = 50) -> str:
+    """Edição distrital de formação: equipas só em texto nas <td> vizinhas do link."""
+    linhas = []
+    for i in range(n):
+        casa, fora = rnd.sample(_EQUIPAS[:18], 2)
+        dia = rnd.randint(-2, 18)
+        data = f"{{{{D+{dia}}}}}" if dia >= 0 else f"{{{{D{dia}}}}}"
+        gid = rnd.randint(7000000, 7999999)
+        hora = rnd.choice(["10:30", "11h00", "15.00", "09:45"])
+        if i % 5 == 0:
+            # Link com o texto do jogo (fallback 1)
+            linhas.append(
+                f'<tr><td>{data}</td><td><a href="/jogo/{data}-x/{gid}">{casa} - {fora}</a></td></tr>'
+            )
+            continue
+        linhas.append(
+            f'<tr><td class="d">{data}</td><td>{hora}</td><td class="c">{casa}</td>'
+            f'<td><a href="/jogo/{data}-{gid}/{gid}">{rnd.choice(["", "vs", "2 - 1"])}</a></td>'
+            f'<td>{rnd.choice(["", "1-1", "-"])}</td><td class="f">{fora}</td><td>x</td></tr>'
+        )
+    return (
+        "<!DOCTYPE html><html><head><title>Iniciados AF Braga | zerozero.pt</title></head><body>"
+        + _ruido(rnd, 150)
+        + '<h2 class="header_title">Iniciados Sub-15 AF Braga</h2>'
+        + '<table class="zztable">' + "".join(linhas) + "</table>"
+        + '<ul><li class="game"><a href="/jogo/{{D+2}}-y/6666666"></a>'
+        '<div class="team"><span class="title">Merelinense</span></div>'
+        '<div class="team"><span class="title">Brito SC</span></div>'
+        '<span class="tag time">16:00</span><div class="comp">AF Braga</div></li></ul>'
+        + "</body></html>"
+    )
+
+
+def _competicao(rnd: random.Random) -> str:
+    links = "".join(
+        f'<li><a href="/competicao/af-braga-serie-{i}">Série {i}</a>'
+        f' <a href="/edicao/af-braga-serie-{i}-2026-27/{190000 + i}">2026/27</a>'
+        f' <a href="/edicao/af-braga-serie-{i}-2025-26/{180000 + i}">2025/26</a></li>'
+        for i in range(25)
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>AF Braga | zerozero.pt</title></head><body>"
+        + _ruido(rnd, 200) + f'<h1>AF Braga</h1><ul class="competicoes">{links}</ul></body></html>'
+    )
+
+
+def _jogo(rnd: random.Random) -> str:
+    return (
+        "<!DOCTYPE html><html><head><title>Merelinense vs Vilaverdense | zerozero.pt</title></head><body>"
+        + _ruido(rnd, 250)
+        + '<div id="match-header"><a href="/equipa/merelinense/1234"><img></a>'
+        '<a href="/equipa/merelinense/1234">Merelinense</a>'
+        '<a href="/equipa/vilaverdense/5678">Vilaverdense</a></div>'
+        '<div class="info"><a href="/edition/pro-nacional-af-braga-2026-27/190001">Classificação</a></div>'
+        "</body></html>"
+    )
+
+
+def gerar():
+    """Gera as fixtures sintéticas (determinísticas)."""
+    rnd = random.Random(2026)
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    paginas = {
+        "agenda.html": _agenda(rnd),
+        "competicao.html": _competicao(rnd),
+        "edicao_proximos_jogos.html": _edicao(rnd),
+        "edicao_formacao.html": _edicao_formacao(rnd),
+        "jogo.html": _jogo(rnd),
+    }
+    for nome, html in paginas.items():
+        with open(os.path.join(FIXTURES_DIR, nome), "w", encoding="utf-8") as f:
+            f.write(html)
+        print(f"💾 {nome}: {len(html) // 1024} KB")
+
+
+def gravar(urls: list):
+    """Grava páginas reais (curl_cffi, impersonate Chrome) como fixtures."""
+    from curl_cffi import requests as cf_requests
+    os.makedirs(FIXTURES_DIR, exist_ok=True)
+    session = cf_requests.Session(impersonate="chrome")
+    for url in urls:
+        resp = session.get(url, timeout=30)
+        nome = "real_" + re.sub(r"[^a-z0-9]+", "_", url.lower().split("zerozero.pt")[-1]).strip("_") + ".html"
+        with open(os.path.join(FIXTURES_DIR, nome), "w", encoding="utf-8") as f:
+            f.write(resp.text)
+        print(f"💾 {nome}: HTTP {resp.status_code}, {len(resp.text) // 1024} KB")
+
+
+def carregar() -> dict:
+    """Devolve {nome: html} com os marcadores {{D+n}} trocados por datas reais."""
+    hoje = datetime.now()
+
+    def _data(m):
+        return (hoje + timedelta(days=int(m.group(1)))).strftime("%Y-%m-%d")
+
+    fixtures = {}
+    for nome in sorted(os.listdir(FIXTURES_DIR)):
+        if nome.endswith(".html"):
+            with open(os.path.join(FIXTURES_DIR, nome), "r", encoding="utf-8") as f:
+                fixtures[nome] = re.sub(r"\{\{D([+-]\d+)\}\}", _data, f.read())
+    return fixtures
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--gerar", action="store_true", help="gera as fixtures sintéticas")
+    parser.add_argument("--gravar", nargs="+", metavar="URL", help="grava páginas reais")
+    args = parser.parse_args()
+    if args.gravar:
+        gravar(args.gravar)
+    if args.gerar or not args.gravar:
+        gerar()
@@ -0,0 +1,81 @@
+"""
+Verificação dos extractores ZeroZero contra o corpus gravado — Rota da Festa
+=============================================================================
+Para cada fixture em bench/fixtures, corre parse_games_from_html e
+extract_games_from_page e compara com o resultado esperado gravado em
+bench/fixtures/esperado/<fixture>.json (datas guardadas como {{D+n}}).
+
+Uso:
+    python bench/verificar_extractores.py             # compara (exit 1 se diferir)
+    python bench/verificar_extractores.py --gravar    # grava o resultado actual como esperado
+"""
+
+import argparse
+import json
+import os
+import re
+import sys
+from datetime import datetime
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "benchmark")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from fixtures import FIXTURES_DIR, carregar  # noqa: E402
+import scraper_mestre as sm  # noqa: E402
+
+ESPERADO_DIR = os.path.join(FIXTURES_DIR, "esperado")
+
+
+def _extrair(html: str) -> dict:
+    return {
+        "parse_games_from_html": sm.parse_games_from_html(html),
+        "extract_games_from_page": sm.extract_games_from_page(html),
+    }
+
+
+def _para_marcadores(texto: str) -> str:
+    """Troca datas reais pelos marcadores {{D+n}} relativos a hoje."""
+    hoje = datetime.now().date()
+
+    def _marcador(m):
+        try:
+            n = (datetime.strptime(m.group(0), "%Y-%m-%d").date() - hoje).days
+        except ValueError:
+            return m.group(0)
+        return f"{{{{D{n:+d}}}}}"
+
+    return re.sub(r"\d{4}-\d{2}-\d{2}", _marcador, texto)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Verificação dos extractores")
+    parser.add_argument("--gravar", action="store_true", help="grava o resultado actual como esperado")
+    args = parser.parse_args()
+
+    os.makedirs(ESPERADO_DIR, exist_ok=True)
+    falhas = 0
+    for nome, html in carregar().items():
+        caminho = os.path.join(ESPERADO_DIR, nome.replace(".html", ".json"))
+        actual = _para_marcadores(json.dumps(_extrair(html), ensure_ascii=False, indent=1))
+        if args.gravar:
+            with open(caminho, "w", encoding="utf-8") as f:
+                f.write(actual + "\n")
+            print(f"💾 {nome}: esperado gravado")
+            continue
+        if not os.path.exists(caminho):
+            print(f"⚠️ {nome}: sem resultado esperado (corre com --gravar)")
+            continue
+        with open(caminho, "r", encoding="utf-8") as f:
+            esperado = f.read().rstrip("\n")
+        if actual == esperado:
+            n = {k: len(v) for k, v in json.loads(actual).items()}
+            print(f"✅ {nome}: idêntico {n}")
+        else:
+            falhas += 1
+            print(f"❌ {nome}: resultado difere do esperado")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
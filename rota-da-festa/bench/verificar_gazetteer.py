@@ -0,0 +1,88 @@
+"""
+Verificação do gazetteer offline incluído no repositório — Rota da Festa
+==========================================================================
+Carrega data/gazetteer_pt.tsv e confirma, sem rede:
+  - localidades conhecidas resolvem perto das coordenadas esperadas
+  - homónimos em sítios diferentes só resolvem com o distrito
+  - o scraper mestre localiza equipas "X de Y" pelo gazetteer antes de
+    qualquer pedido ao Nominatim, e grava-as com fonte "gazetteer"
+
+Uso:
+    python bench/verificar_gazetteer.py
+"""
+
+import os
+import sys
+import tempfile
+
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_SERVICE_KEY", "benchmark")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import scraper_mestre as sm  # noqa: E402
+from gazetteer import Gazetteer  # noqa: E402
+from geo_store import GeoStore  # noqa: E402
+
+# (nome, distrito, lat, lon esperados)
+LOCALIDADES = [
+    ("Ponte de Lima", None, 41.767, -8.584),
+    ("Cabeceiras de Basto", None, 41.514, -7.989),
+    ("lousada", None, 41.278, -8.280),
+    ("Vizela", None, 41.391, -8.264),
+    ("Lagoa", "Faro", 37.135, -8.453),
+    ("Lagoa", "Açores", 37.745, -25.572),
+]
+# Nomes que existem em sítios diferentes: sem distrito não se arrisca
+AMBIGUOS = ["Lagoa", "Madalena"]
+# (equipa, competição, lat, lon esperados)
+EQUIPAS = [
+    ("Águias de Sande", "AF Braga - Divisão de Honra", 41.702, -8.392),
+    ("Estrela de Vinhais", "AF Bragança - Divisão de Honra", 41.835, -7.005),
+]
+
+
+def _perto(lugar, lat: float, lon: float) -> bool:
+    return bool(lugar) and abs(lugar["lat"] - lat) < 0.01 and abs(lugar["lon"] - lon) < 0.01
+
+
+def main():
+    falhas = 0
+    gaz = Gazetteer()
+    print(f"📖 {gaz.caminho}: {len(gaz)} lugares")
+    if not gaz.disponivel:
+        print("❌ gazetteer em falta")
+        sys.exit(1)
+
+    for nome, distrito, lat, lon in LOCALIDADES:
+        ok = _perto(gaz.procurar(nome, distrito), lat, lon)
+        falhas += not ok
+        print(f"  {'✅' if ok else '❌'} {nome}{f' ({distrito})' if distrito else ''}")
+    for nome in AMBIGUOS:
+        ok = gaz.procurar(nome) is None
+        falhas += not ok
+        print(f"  {'✅' if ok else '❌'} {nome} sem distrito é ambíguo")
+
+    # Sem rede: qualquer pedido ao Nominatim é uma falha
+    pedidos = []
+    sm.geolocator.geocode = lambda query, **kw: pedidos.append(query)
+    with tempfile.TemporaryDirectory() as tmp:
+        sm.geo_store = GeoStore(origem="verificacao", caminho=os.path.join(tmp, "geocoding.sqlite"))
+        for equipa, comp, lat, lon in EQUIPAS:
+            geo, conhecido = sm._estadio_conhecido(equipa, comp)
+            linha = sm.geo_store._ligacao().execute(
+                "SELECT fonte FROM geocoding WHERE tipo = 'estadio' AND chave = ?",
+                (sm.normalizar(equipa),)).fetchone()
+            ok = conhecido and _perto(geo, lat, lon) and linha == ("gazetteer",)
+            falhas += not ok
+            print(f"  {'✅' if ok else '❌'} {equipa} → {geo and geo['local']} (fonte {linha and linha[0]})")
+        sm.geo_store.close()
+    if pedidos:
+        print(f"  ❌ {len(pedidos)} pedidos ao Nominatim: {pedidos}")
+        falhas += 1
+
+    print(f"🗺️ {gaz.resumo()}")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
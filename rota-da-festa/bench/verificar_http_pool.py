@@ -0,0 +1,76 @@
+"""
+Verificação da contagem de ligações da SessaoHTTP — Rota da Festa
+==================================================================
+Levanta dois servidores HTTP locais e faz vários pedidos seguidos com uma
+SessaoHTTP a cada um:
+  - HTTP/1.1 com keep-alive: uma ligação para todos os pedidos
+  - HTTP/1.0 (fecha a ligação depois de cada resposta): uma ligação por pedido
+e compara as ligações contadas pela sessão com as aceites pelo servidor.
+
+Uso:
+    python bench/verificar_http_pool.py [--pedidos 5]
+"""
+
+import argparse
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from http_pool import SessaoHTTP  # noqa: E402
+
+
+def _servidor(versao: str):
+    """Servidor local com o protocolo `versao`; devolve (servidor, contador de ligações aceites)."""
+    aceites = [0]
+
+    class _Handler(BaseHTTPRequestHandler):
+        protocol_version = versao
+
+        def setup(self):
+            aceites[0] += 1
+            super().setup()
+
+        def do_GET(self):
+            corpo = b"ok"
+            self.send_response(200)
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+        def log_message(self, *args):
+            pass
+
+    servidor = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor, aceites
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--pedidos", type=int, default=5)
+    args = ap.parse_args()
+
+    falhas = 0
+    for versao, esperadas in (("HTTP/1.1", 1), ("HTTP/1.0", args.pedidos)):
+        servidor, aceites = _servidor(versao)
+        sessao = SessaoHTTP(timeout=5)
+        url = f"http://127.0.0.1:{servidor.server_address[1]}/"
+        for _ in range(args.pedidos):
+            sessao.get(url).raise_for_status()
+        sessao.close()
+        servidor.shutdown()
+        servidor.server_close()
+
+        contadas = sessao.estatisticas.ligacoes
+        ok = contadas == aceites[0] == esperadas
+        falhas += not ok
+        print(f"{'✅' if ok else '❌'} {versao}: {sessao.estatisticas.resumo()}; "
+              f"servidor aceitou {aceites[0]} ligações (esperado {esperadas})")
+    sys.exit(1 if falhas else 0)
+
+
+if __name__ == "__main__":
+    main()
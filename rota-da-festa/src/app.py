@@ -5,9 +5,13 @@ from streamlit_folium import st_folium
 from folium.plugins import MarkerCluster, LocateControl
 import json
 import os
-import math
 from datetime import datetime
 
+from geo_espacial import GrelhaEspacial, haversine_km
+from mapa_rapido import LIMITE_MARCADORES, camada_rapida, desbastar, vista_inicial
+
+ZOOM_INICIAL = 11
+
 # --- CONFIGURAÇÃO GLOBAL ---
 st.set_page_config(
     page_title="Rota da Festa 🇵🇹",
@@ -53,17 +57,6 @@ st.markdown("""
 
 # --- FUNÇÕES UTILITÁRIAS ---
 
-def haversine(lat1, lon1, lat2, lon2):
-    """Calcula a distância em km entre dois pontos."""
-    R = 6371  # Raio da Terra em km
-    dlat = math.radians(lat2 - lat1)
-    dlon = math.radians(lon2 - lon1)
-    a = math.sin(dlat/2) * math.sin(dlat/2) + \
-        math.cos(math.radians(lat1)) * math.cos(math.radians(lat2)) * \
-        math.sin(dlon/2) * math.sin(dlon/2)
-    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1-a))
-    return R * c
-
 @st.cache_data
 def carregar_dados():
     path = os.path.join(os.path.dirname(__file__), '../data/eventos.json')
@@ -77,8 +70,16 @@ def carregar_dados():
     if not df.empty:
         df['data_obj'] = pd.to_datetime(df['data'])
         df['dia_semana'] = df['data_obj'].dt.strftime('%a') # Seg, Ter...
+        df['latitude'] = pd.to_numeric(df['latitude'], errors='coerce')
+        df['longitude'] = pd.to_numeric(df['longitude'], errors='coerce')
     return df
 
+@st.cache_resource
+def indice_espacial():
+    """Grelha dos eventos de carregar_dados(), construída uma vez e partilhada entre reruns."""
+    df = carregar_dados()
+    return GrelhaEspacial(df['latitude'].to_numpy(), df['longitude'].to_numpy())
+
 # --- GESTÃO DE ESTADO (FAVORITOS) ---
 if 'favoritos' not in st.session_state:
     st.session_state.favoritos = set()
@@ -89,6 +90,13 @@ def toggle_fav(id_evento):
     else:
         st.session_state.favoritos.add(id_evento)
 
+# --- GESTÃO DE ESTADO (LISTA) ---
+# Cursor da lista: quantos cartões estão à vista; "Mostrar mais" avança uma página
+POR_PAGINA = [10, 25, 50, 100]
+
+def mostrar_mais(n):
+    st.session_state.lista_visiveis += n
+
 # --- SIDEBAR (CONTROLO) ---
 with st.sidebar:
     st.image("https://cdn-icons-png.flaticon.com/512/785/785116.png", width=80)
@@ -106,6 +114,9 @@ with st.sidebar:
     }
     user_loc_name = st.selectbox("📍 Onde estás?", list(locais_base.keys()))
     user_lat, user_lon = locais_base[user_loc_name]
+    raio_km = st.select_slider("📏 Até", options=[5, 10, 25, 50, 100, 200, "Sem limite"],
+                               value="Sem limite",
+                               format_func=lambda r: r if isinstance(r, str) else f"{r} km")
 
     st.divider()
 
@@ -125,18 +136,21 @@ with st.sidebar:
     search_term = st.text_input("🔎 Pesquisar evento...", "").lower()
 
 # --- LÓGICA DE FILTRAGEM ---
-# Calcular distâncias primeiro
-df['distancia'] = df.apply(
-    lambda row: haversine(user_lat, user_lon, row['latitude'], row['longitude']), axis=1
-)
+# Calcular distâncias primeiro (vetorizado; com raio, só os eventos das células próximas)
+if raio_km == "Sem limite":
+    df_perto = df
+    df_perto['distancia'] = haversine_km(user_lat, user_lon, df['latitude'].to_numpy(), df['longitude'].to_numpy())
+else:
+    posicoes, distancias = indice_espacial().dentro_do_raio(user_lat, user_lon, raio_km)
+    df_perto = df.iloc[posicoes].copy()
+    df_perto['distancia'] = distancias
 
 # Aplicar filtros
-mask = (
-    (df['tipo'].isin(tipos)) &
-    (df['data_obj'].dt.date >= data_filtro) &
-    (df['nome'].str.lower().str.contains(search_term) | df['local'].str.lower().str.contains(search_term))
-)
-df_filtrado = df[mask].sort_values(by=['data_obj', 'distancia'])
+mask = (df_perto['tipo'].isin(tipos)) & (df_perto['data_obj'] >= pd.Timestamp(data_filtro))
+if search_term:
+    mask &= (df_perto['nome'].str.lower().str.contains(search_term, regex=False)
+             | df_perto['local'].str.lower().str.contains(search_term, regex=False))
+df_filtrado = df_perto[mask].sort_values(by=['data_obj', 'distancia'])
 
 # --- DASHBOARD (KPIs) ---
 col1, col2, col3, col4 = st.columns(4)
@@ -149,7 +163,7 @@ col4.metric("Favoritos", len(st.session_state.favoritos))
 st.subheader("🗺️ Mapa de Eventos")
 
 # Mapa Base
-m = folium.Map(location=[user_lat, user_lon], zoom_start=11, tiles="Cartodb Positron")
+m = folium.Map(location=[user_lat, user_lon], zoom_start=ZOOM_INICIAL, tiles="Cartodb Positron")
 
 # Adicionar "Eu"
 folium.Marker(
@@ -158,29 +172,38 @@ folium.Marker(
     icon=folium.Icon(color="blue", icon="user", prefix="fa")
 ).add_to(m)
 
-# Cluster para eventos
-marker_cluster = MarkerCluster().add_to(m)
+# Cluster para eventos: um folium.Marker por evento enquanto são poucos;
+# acima disso um só array com os marcadores criados no browser
+if len(df_filtrado) <= LIMITE_MARCADORES:
+    marker_cluster = MarkerCluster().add_to(m)
 
-for _, row in df_filtrado.iterrows():
-    # Cor baseada no tipo
-    cor = "green" if row['tipo'] == "Futebol" else "red"
-    icon = "futbol-o" if row['tipo'] == "Futebol" else "glass"
+    for _, row in df_filtrado.iterrows():
+        # Cor baseada no tipo
+        cor = "green" if row['tipo'] == "Futebol" else "red"
+        icon = "futbol-o" if row['tipo'] == "Futebol" else "glass"
     
-    html = f"""
-    <div style='font-family: sans-serif; min-width: 180px'>
-        <b>{row['nome']}</b><br>
-        <small>{row['data']} • {row['hora']}</small><br>
-        <span style='color: green'>{row['preco']}</span><br>
-        <a href='{row['url_maps']}' target='_blank'>Navegar ➔</a>
-    </div>
-    """
+        html = f"""
+        <div style='font-family: sans-serif; min-width: 180px'>
+            <b>{row['nome']}</b><br>
+            <small>{row['data']} • {row['hora']}</small><br>
+            <span style='color: green'>{row['preco']}</span><br>
+            <a href='{row['url_maps']}' target='_blank'>Navegar ➔</a>
+        </div>
+        """
     
-    folium.Marker(
-        [row['latitude'], row['longitude']],
-        popup=html,
-        tooltip=f"{row['nome']} ({row['distancia']:.1f} km)",
-        icon=folium.Icon(color=cor, icon=icon, prefix="fa")
-    ).add_to(marker_cluster)
+        folium.Marker(
+            [row['latitude'], row['longitude']],
+            popup=html,
+            tooltip=f"{row['nome']} ({row['distancia']:.1f} km)",
+            icon=folium.Icon(color=cor, icon=icon, prefix="fa")
+        ).add_to(marker_cluster)
+else:
+    posicoes = desbastar(df_filtrado['latitude'], df_filtrado['longitude'],
+                         vista_inicial(user_lat, user_lon, ZOOM_INICIAL))
+    camada_rapida(df_filtrado.iloc[posicoes]).add_to(m)
+    if len(posicoes) < len(df_filtrado):
+        st.caption(f"⚡ {len(posicoes)} de {len(df_filtrado)} eventos no mapa: "
+                   "todos os da vista inicial e um por zona fora dela.")
 
 # OTIMIZAÇÃO CRÍTICA: returned_objects=[] impede que o mapa recarregue a app ao fazer zoom/pan
 st_folium(m, width="100%", height=450, returned_objects=[])
@@ -194,7 +217,16 @@ with tab1:
     if df_filtrado.empty:
         st.info("Nenhum evento corresponde aos filtros.")
     else:
-        for idx, row in df_filtrado.iterrows():
+        por_pagina = st.selectbox("Eventos por página", POR_PAGINA, index=1)
+        # Filtros ou página diferentes recomeçam a lista do início
+        filtros = (user_loc_name, raio_km, tuple(tipos), data_filtro, search_term, por_pagina)
+        if st.session_state.get('lista_filtros') != filtros:
+            st.session_state.lista_filtros = filtros
+            st.session_state.lista_visiveis = por_pagina
+        visiveis = min(st.session_state.lista_visiveis, len(df_filtrado))
+
+        # Só os cartões até ao cursor são criados (widgets incluídos)
+        for idx, row in df_filtrado.iloc[:visiveis].iterrows():
             # Cartão Customizado HTML + Streamlit
             with st.container():
                 col_info, col_action = st.columns([3, 1])
@@ -214,12 +246,15 @@ with tab1:
                     # Botão Favorito
                     is_fav = row['id'] in st.session_state.favoritos
                     label_fav = "❤️ Remover" if is_fav else "🤍 Guardar"
-                    if st.button(label_fav, key=f"fav_{row['id']}"):
-                        toggle_fav(row['id'])
-                        st.rerun()
+                    st.button(label_fav, key=f"fav_{row['id']}", on_click=toggle_fav, args=(row['id'],))
                         
                     st.markdown(f"[📍 Ir Agora]({row['url_maps']})", unsafe_allow_html=True)
 
+        st.caption(f"A mostrar {visiveis} de {len(df_filtrado)} eventos")
+        if visiveis < len(df_filtrado):
+            st.button(f"⬇️ Mostrar mais {min(por_pagina, len(df_filtrado) - visiveis)}",
+                      key="mostrar_mais", on_click=mostrar_mais, args=(por_pagina,))
+
 with tab2:
     if not st.session_state.favoritos:
         st.info("Ainda não tens favoritos. Adiciona alguns na aba 'Todos'!")
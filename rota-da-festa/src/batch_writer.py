@@ -0,0 +1,138 @@
+"""
+Escrita em lotes para o Supabase — Rota da Festa
+=================================================
+Substitui o `upsert(ev).execute()` linha a linha (um round-trip HTTP por
+evento) por upserts de N linhas:
+  - lotes de SUPABASE_LOTE linhas (200 por omissão)
+  - linhas repetidas na mesma chave de conflito (ex: nome+data) são fundidas
+    antes de enviar — o Postgres recusa afectar a mesma linha duas vezes no
+    mesmo comando, e a fusão dá o mesmo estado final que os upserts em série
+  - cada lote só leva linhas com as mesmas colunas: num upsert em bloco as
+    colunas em falta iriam a NULL e apagariam valores já existentes
+  - um lote que falha é partido ao meio e re-tentado (bissecção) até isolar
+    as linhas problemáticas, que são reportadas uma a uma
+"""
+
+import os
+import time
+
+
+def _tamanho_lote() -> int:
+    return max(1, int(os.environ.get("SUPABASE_LOTE", "200")))
+
+
+class ResultadoEscrita:
+    """Contagens de uma escrita em lotes."""
+
+    def __init__(self, total: int):
+        self.total = total
+        self.guardados = 0
+        self.fundidos = 0
+        self.pedidos = 0
+        self.falhados = []  # [(linha, erro)]
+        self.segundos = 0.0
+
+    @property
+    def erros(self) -> int:
+        return len(self.falhados)
+
+    def somar(self, outro: "ResultadoEscrita"):
+        """Acumula outra escrita nesta (ex: lotes sucessivos de um pipeline)."""
+        self.total += outro.total
+        self.guardados += outro.guardados
+        self.fundidos += outro.fundidos
+        self.pedidos += outro.pedidos
+        self.falhados += outro.falhados
+        self.segundos += outro.segundos
+
+    def resumo(self) -> str:
+        taxa = self.guardados / self.segundos if self.segundos > 0 else 0.0
+        extra = f", {self.fundidos} repetidos fundidos" if self.fundidos else ""
+        return (f"{self.guardados}/{self.total} linhas em {self.pedidos} pedidos, "
+                f"{self.segundos:.1f}s ({taxa:.0f} linhas/s), {self.erros} erros{extra}")
+
+
+def em_lotes(itens, tamanho: int = None):
+    """Agrupa um iterável (ex: um gerador de eventos) em listas de `tamanho`."""
+    tamanho = tamanho or _tamanho_lote()
+    lote = []
+    for item in itens:
+        lote.append(item)
+        if len(lote) >= tamanho:
+            yield lote
+            lote = []
+    if lote:
+        yield lote
+
+
+def _fundir_repetidos(linhas: list, chaves: list) -> tuple:
+    """Funde linhas com a mesma chave de conflito (a última sobrepõe, como em série)."""
+    if not chaves:
+        return list(linhas), 0
+    por_chave = {}
+    for linha in linhas:
+        k = tuple(linha.get(c) for c in chaves)
+        por_chave[k] = {**por_chave[k], **linha} if k in por_chave else linha
+    return list(por_chave.values()), len(linhas) - len(por_chave)
+
+
+def _por_colunas(linhas: list) -> list:
+    """Agrupa as linhas pelo conjunto de colunas, mantendo a ordem de chegada."""
+    grupos = {}
+    for linha in linhas:
+        grupos.setdefault(frozenset(linha), []).append(linha)
+    return list(grupos.values())
+
+
+def upsert_em_lotes(cliente, tabela: str, linhas: list, on_conflict: str = "nome,data",
+                    tamanho_lote: int = None, max_erros_log: int = 5) -> ResultadoEscrita:
+    """Upsert de `linhas` em `tabela` em lotes, com bissecção dos lotes que falham."""
+    tamanho_lote = tamanho_lote or _tamanho_lote()
+    resultado = ResultadoEscrita(len(linhas))
+    inicio = time.monotonic()
+
+    chaves = [c.strip() for c in on_conflict.split(",") if c.strip()]
+    unicas, resultado.fundidos = _fundir_repetidos(linhas, chaves)
+
+    def _enviar(lote: list):
+        resultado.pedidos += 1
+        try:
+            cliente.table(tabela).upsert(lote, on_conflict=on_conflict).execute()
+            resultado.guardados += len(lote)
+        except Exception as e:
+            if len(lote) == 1:
+                resultado.falhados.append((lote[0], e))
+                if resultado.erros <= max_erros_log:
+                    print(f"  Erro DB: {e}")
+                elif max_erros_log and resultado.erros == max_erros_log + 1:
+                    print("  ... (mais erros omitidos)")
+                return
+            meio = len(lote) // 2
+            _enviar(lote[:meio])
+            _enviar(lote[meio:])
+
+    for grupo in _por_colunas(unicas):
+        for i in range(0, len(grupo), tamanho_lote):
+            _enviar(grupo[i:i + tamanho_lote])
+
+    resultado.segundos = time.monotonic() - inicio
+    return resultado
+
+
+def atualizar_por_ids(cliente, tabela: str, valores: dict, ids: list,
+                      tamanho_lote: int = None) -> ResultadoEscrita:
+    """Aplica o mesmo `update(valores)` a muitas linhas, um pedido por lote de ids."""
+    tamanho_lote = tamanho_lote or _tamanho_lote()
+    resultado = ResultadoEscrita(len(ids))
+    inicio = time.monotonic()
+    for i in range(0, len(ids), tamanho_lote):
+        lote = ids[i:i + tamanho_lote]
+        resultado.pedidos += 1
+        try:
+            cliente.table(tabela).update(valores).in_("id", lote).execute()
+            resultado.guardados += len(lote)
+        except Exception as e:
+            resultado.falhados.extend((id_, e) for id_ in lote)
+            print(f"  Erro DB: {e}")
+    resultado.segundos = time.monotonic() - inicio
+    return resultado
@@ -0,0 +1,85 @@
+"""
+Gestão do clearance Cloudflare (Estratégia 2) — Rota da Festa
+==============================================================
+Na Estratégia 2 o FlareSolverr resolve o challenge uma vez e os cookies
+(cf_clearance & co.) e o User-Agent do browser são injectados na sessão
+curl_cffi, que faz o resto do crawl sem browser. O cookie expira, e a
+partir daí cada pedido devolvia o challenge até ao fim da execução.
+
+O GestorClearance mantém essa sessão válida:
+  - regista a idade do clearance e renova-o antes de expirar
+    (ZZ_CF_RENOVAR_MIN)
+  - quando um pedido recebe o challenge, resolve de novo uma vez e
+    re-injecta os cookies; o pedido é repetido logo a seguir
+  - várias threads que apanham o mesmo challenge ao mesmo tempo originam
+    uma só resolução (contador de geração)
+  - uma resolução falhada não volta a ser tentada durante `espera_falha`
+    segundos, para não pôr o FlareSolverr a resolver em ciclo
+"""
+
+import threading
+import time
+
+
+class GestorClearance:
+    """Cookies Cloudflare de uma sessão curl_cffi, renovados via FlareSolverr."""
+
+    def __init__(self, session, resolver, e_challenge, url: str, dominio: str,
+                 max_idade: float = 25 * 60, espera_falha: float = 60):
+        self.session = session
+        self.url = url
+        self.dominio = dominio
+        self.max_idade = max_idade
+        self.espera_falha = espera_falha
+        self._resolver = resolver      # url -> (html, cookies, user_agent)
+        self._e_challenge = e_challenge
+        self._lock = threading.Lock()
+        self._obtido = None
+        self._falhou_em = None
+        self.geracao = 0
+        self.renovacoes = 0
+        self.proactivas = 0
+        self.falhas = 0
+
+    def injetar(self, cookies: dict, ua: str = ""):
+        """Coloca cookies e User-Agent do browser na sessão e reinicia a idade."""
+        if ua:
+            self.session.headers["User-Agent"] = ua
+        for name, value in cookies.items():
+            self.session.cookies.set(name, value, domain=self.dominio)
+        self._obtido = time.monotonic()
+        self.geracao += 1
+
+    def idade(self) -> float:
+        return time.monotonic() - self._obtido if self._obtido is not None else 0.0
+
+    def renovar(self, geracao: int, proactiva: bool = False) -> bool:
+        """Resolve o challenge de novo (se ninguém o fez desde `geracao`); True se há clearance novo."""
+        with self._lock:
+            if self.geracao != geracao:
+                return True  # outra thread já renovou
+            if self._falhou_em is not None and time.monotonic() - self._falhou_em < self.espera_falha:
+                return False
+            html, cookies, ua = self._resolver(self.url)
+            if not cookies or not html or self._e_challenge(html):
+                self.falhas += 1
+                self._falhou_em = time.monotonic()
+                print("  ⚠️ Clearance: FlareSolverr não conseguiu renovar os cookies")
+                return False
+            idade = self.idade()
+            self.injetar(cookies, ua)
+            self.renovacoes += 1
+            self.proactivas += proactiva
+            self._falhou_em = None
+            print(f"  🍪 Clearance renovado ({len(cookies)} cookies, anterior com {idade / 60:.0f} min)")
+            return True
+
+    def antes_do_pedido(self) -> int:
+        """Renova por antecipação se o clearance está perto de expirar; devolve a geração actual."""
+        if self.idade() > self.max_idade:
+            self.renovar(self.geracao, proactiva=True)
+        return self.geracao
+
+    def resumo(self) -> str:
+        return (f"{self.renovacoes} renovações ({self.proactivas} por idade), "
+                f"{self.falhas} falhas, clearance actual com {self.idade() / 60:.0f} min")
@@ -0,0 +1,114 @@
+"""
+Checkpoint de crawls longos — Rota da Festa
+============================================
+Um ficheiro JSON Lines onde cada unidade de trabalho concluída (uma agenda,
+uma edição, uma competição) fica registada com os dados que produziu:
+
+    {"incremental": true, "criado": 1792300000.0}           ← cabeçalho
+    {"tipo": "agenda", "chave": "2026-10-18", "dados": [...]}
+    {"tipo": "edicao", "chave": "https://...", "dados": {...}}
+
+Cada linha é escrita e despejada logo (append), por isso um processo morto a
+meio (timeout do job, FlareSolverr em baixo) perde no máximo a unidade em
+curso; uma última linha truncada é ignorada ao carregar. Com `retomar`, as
+unidades registadas não voltam a ser buscadas — os seus dados são reaproveitados.
+
+O checkpoint só vale para o mesmo modo e dentro da validade (contada desde
+a execução que o criou, por isso retomas sucessivas não o prolongam); fora
+disso começa-se do zero.
+"""
+
+import json
+import os
+import threading
+import time
+
+
+class Checkpoint:
+    """Unidades concluídas de um crawl, persistidas à medida que terminam (thread-safe)."""
+
+    def __init__(self, caminho: str, modo: dict, retomar: bool = False,
+                 validade_horas: float = 30):
+        self.caminho = caminho
+        self.modo = modo
+        self.validade = validade_horas * 3600
+        self.criado = time.time()
+        self.retomadas = 0
+        self._feitos = {}
+        self._lock = threading.Lock()
+        if retomar:
+            self._carregar()
+        # Reescrever só as linhas válidas (descarta uma última linha truncada)
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        self._f = open(caminho, "w", encoding="utf-8")
+        self._escrever({**modo, "criado": self.criado})
+        for (tipo, chave), dados in self._feitos.items():
+            self._escrever({"tipo": tipo, "chave": chave, "dados": dados})
+
+    def _carregar(self):
+        if not os.path.exists(self.caminho):
+            print("♻️  Checkpoint: nenhum encontrado — a começar do zero")
+            return
+        try:
+            with open(self.caminho, "r", encoding="utf-8") as f:
+                linhas = iter(f)
+                cabecalho = json.loads(next(linhas, "null")) or {}
+                criado = cabecalho.pop("criado", 0)
+                if cabecalho != self.modo:
+                    print("♻️  Checkpoint de outro modo — a começar do zero")
+                    return
+                if time.time() - criado > self.validade:
+                    print("♻️  Checkpoint expirado — a começar do zero")
+                    return
+                self.criado = criado
+                for linha in linhas:
+                    try:
+                        reg = json.loads(linha)
+                    except ValueError:
+                        break  # escrita interrompida a meio
+                    self._feitos[(reg["tipo"], reg["chave"])] = reg["dados"]
+        except Exception as e:
+            print(f"⚠️ Erro ao carregar checkpoint: {e}")
+            self._feitos = {}
+            return
+        print(f"♻️  Checkpoint: {self.resumo()} a retomar")
+
+    def _escrever(self, registo: dict):
+        self._f.write(json.dumps(registo, ensure_ascii=False) + "\n")
+        self._f.flush()
+
+    def obter(self, tipo: str, chave: str):
+        """Dados de uma unidade já concluída, ou None."""
+        with self._lock:
+            dados = self._feitos.get((tipo, chave))
+            if dados is not None:
+                self.retomadas += 1
+            return dados
+
+    def marcar(self, tipo: str, chave: str, dados):
+        """Regista uma unidade como concluída (fica logo no disco)."""
+        with self._lock:
+            self._feitos[(tipo, chave)] = dados
+            try:
+                self._escrever({"tipo": tipo, "chave": chave, "dados": dados})
+            except (OSError, ValueError) as e:
+                print(f"  ⚠️ Checkpoint: erro a gravar {tipo} {chave}: {e}")
+
+    def resumo(self) -> str:
+        contagem = {}
+        for tipo, _ in self._feitos:
+            contagem[tipo] = contagem.get(tipo, 0) + 1
+        return ", ".join(f"{n} {tipo}" for tipo, n in sorted(contagem.items())) or "vazio"
+
+    def close(self):
+        with self._lock:
+            if not self._f.closed:
+                self._f.close()
+
+    def concluir(self):
+        """Crawl terminado e escrito: o checkpoint deixa de ser preciso."""
+        self.close()
+        try:
+            os.remove(self.caminho)
+        except OSError:
+            pass
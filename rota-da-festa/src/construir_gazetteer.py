@@ -0,0 +1,167 @@
+"""
+Construção do gazetteer offline — Rota da Festa
+================================================
+Gera data/gazetteer_pt.tsv (ver gazetteer.py) a partir do GeoNames
+(https://download.geonames.org/export/dump/, CC BY 4.0), de uma de duas fontes:
+  - o dump de Portugal (PT.zip): ADM2 → concelho, ADM3 → freguesia, lugares
+    povoados (classe P) → localidade (sem os históricos, abandonados ou
+    destruídos)
+  - o extrato cities500 que vem no pacote geonamescache do PyPI (--cidades):
+    só localidades com 500 habitantes ou mais, mas sem descarregar nada do
+    GeoNames. É daqui que sai o ficheiro incluído no repositório
+  - distrito/região autónoma a partir do código admin1 (tabela ADMIN1_PT, ou
+    admin1CodesASCII.txt com --admin1)
+  - repetidos (mesmo nome, tipo e distrito a menos de ~5 km) ficam uma vez,
+    o de maior população
+  - coordenadas com 4 casas decimais (~10 m), para o ficheiro ficar compacto
+
+Uso:
+    python rota-da-festa/src/construir_gazetteer.py
+    python rota-da-festa/src/construir_gazetteer.py --dump PT.zip --admin1 admin1CodesASCII.txt
+    python rota-da-festa/src/construir_gazetteer.py --cidades geonamescache/data/cities500.json
+"""
+
+import argparse
+import io
+import json
+import os
+import zipfile
+
+import requests
+
+from gazetteer import GAZETTEER_PADRAO, _MESMO_SITIO, _PRIORIDADE
+from geo_store import normalizar
+
+URL_DUMP = "https://download.geonames.org/export/dump/PT.zip"
+
+# Códigos admin1 do GeoNames para Portugal (admin1CodesASCII.txt, já com os
+# nomes usados nos scrapers)
+ADMIN1_PT = {
+    "02": "Aveiro", "03": "Beja", "04": "Braga", "05": "Bragança",
+    "06": "Castelo Branco", "07": "Coimbra", "08": "Évora", "09": "Faro",
+    "10": "Madeira", "11": "Guarda", "13": "Leiria", "14": "Lisboa",
+    "16": "Portalegre", "17": "Porto", "18": "Santarém", "19": "Setúbal",
+    "20": "Viana do Castelo", "21": "Vila Real", "22": "Viseu", "23": "Açores",
+}
+
+_TIPOS_ADM = {"ADM2": "concelho", "ADM3": "freguesia"}
+_LUGARES_EXCLUIDOS = {"PPLH", "PPLQ", "PPLW"}
+# Nomes do admin1 do GeoNames que diferem dos usados nos scrapers
+_DISTRITOS_PT = {"lisbon": "Lisboa", "azores": "Açores"}
+
+
+def _ler(origem: str) -> bytes:
+    """Conteúdo de um ficheiro local ou de um URL."""
+    if os.path.exists(origem):
+        with open(origem, "rb") as f:
+            return f.read()
+    print(f"⬇️  {origem}")
+    resp = requests.get(origem, timeout=120)
+    resp.raise_for_status()
+    return resp.content
+
+
+def carregar_distritos(origem: str) -> dict:
+    """Código admin1 de Portugal ("17") → nome do distrito ("Porto")."""
+    distritos = {}
+    for linha in _ler(origem).decode("utf-8").splitlines():
+        campos = linha.split("\t")
+        if len(campos) >= 2 and campos[0].startswith("PT."):
+            nome = campos[1].strip()
+            distritos[campos[0][3:]] = _DISTRITOS_PT.get(normalizar(nome), nome)
+    return distritos
+
+
+def ler_lugares(origem: str, distritos: dict) -> list:
+    """Linhas do dump → [(nome, tipo, distrito, lat, lon, população)]."""
+    conteudo = _ler(origem)
+    if origem.endswith(".zip"):
+        with zipfile.ZipFile(io.BytesIO(conteudo)) as z:
+            conteudo = z.read("PT.txt")
+    lugares = []
+    for linha in conteudo.decode("utf-8").splitlines():
+        campos = linha.split("\t")
+        if len(campos) < 15:
+            continue
+        nome, lat, lon, classe, codigo = campos[1], campos[4], campos[5], campos[6], campos[7]
+        distrito = distritos.get(campos[10])
+        if not distrito:
+            continue
+        if classe == "A" and codigo in _TIPOS_ADM:
+            tipo = _TIPOS_ADM[codigo]
+        elif classe == "P" and codigo not in _LUGARES_EXCLUIDOS:
+            tipo = "localidade"
+        else:
+            continue
+        lugares.append((nome.strip(), tipo, distrito, float(lat), float(lon), int(campos[14] or 0)))
+    return lugares
+
+
+def ler_cidades(origem: str, distritos: dict) -> list:
+    """cities500.json do geonamescache → [(nome, "localidade", distrito, lat, lon, população)] de Portugal."""
+    lugares = []
+    for cidade in json.loads(_ler(origem).decode("utf-8")).values():
+        distrito = distritos.get(cidade.get("admin1code"))
+        if cidade.get("countrycode") != "PT" or not distrito:
+            continue
+        lugares.append((cidade["name"].strip(), "localidade", distrito,
+                        float(cidade["latitude"]), float(cidade["longitude"]),
+                        int(cidade.get("population") or 0)))
+    return lugares
+
+
+def deduplicar(lugares: list) -> list:
+    """Um lugar por (nome, tipo, distrito) e sítio — o de maior população."""
+    vistos = {}
+    unicos = []
+    for lugar in sorted(lugares, key=lambda l: -l[5]):
+        chave = (normalizar(lugar[0]), lugar[1], lugar[2])
+        if any(abs(lugar[3] - o[3]) <= _MESMO_SITIO and abs(lugar[4] - o[4]) <= _MESMO_SITIO
+               for o in vistos.get(chave, ())):
+            continue
+        vistos.setdefault(chave, []).append(lugar)
+        unicos.append(lugar)
+    return unicos
+
+
+def escrever(lugares: list, caminho: str, origem: str = ""):
+    lugares = sorted(lugares, key=lambda l: (normalizar(l[2]), _PRIORIDADE[l[1]], normalizar(l[0])))
+    os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+    with open(caminho, "w", encoding="utf-8") as f:
+        f.write("# Gazetteer offline de Portugal — Rota da Festa\n")
+        f.write("# nome<TAB>tipo<TAB>distrito<TAB>lat<TAB>lon (tipo: concelho, freguesia ou localidade)\n")
+        f.write("# Dados: GeoNames (https://www.geonames.org/), CC BY 4.0\n")
+        f.write(f"# Gerado por: python rota-da-festa/src/construir_gazetteer.py{origem}\n")
+        f.write("nome\ttipo\tdistrito\tlat\tlon\n")
+        for nome, tipo, distrito, lat, lon, _ in lugares:
+            f.write(f"{nome}\t{tipo}\t{distrito}\t{lat:.4f}\t{lon:.4f}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera o gazetteer offline a partir do GeoNames")
+    parser.add_argument("--dump", default=URL_DUMP, help="PT.zip ou PT.txt (ficheiro local ou URL)")
+    parser.add_argument("--cidades", help="cities500.json do geonamescache, em vez do dump (só localidades)")
+    parser.add_argument("--admin1", help="admin1CodesASCII.txt (ficheiro local ou URL); por omissão ADMIN1_PT")
+    parser.add_argument("--saida", default=GAZETTEER_PADRAO, help="TSV a gerar")
+    args = parser.parse_args()
+
+    distritos = carregar_distritos(args.admin1) if args.admin1 else ADMIN1_PT
+    if args.cidades:
+        lugares = ler_cidades(args.cidades, distritos)
+        origem = f" --cidades {os.path.basename(args.cidades)}"
+    else:
+        lugares = ler_lugares(args.dump, distritos)
+        origem = ""
+    unicos = deduplicar(lugares)
+    escrever(unicos, args.saida, origem)
+
+    por_tipo = {}
+    for lugar in unicos:
+        por_tipo[lugar[1]] = por_tipo.get(lugar[1], 0) + 1
+    print(f"✅ {len(unicos)} lugares ({len(lugares) - len(unicos)} repetidos descartados): "
+          + ", ".join(f"{n} {t}s" for t, n in sorted(por_tipo.items()))
+          + f" → {args.saida} ({os.path.getsize(args.saida) / 1024:.0f} KB)")
+
+
+if __name__ == "__main__":
+    main()
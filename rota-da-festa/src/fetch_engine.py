@@ -0,0 +1,272 @@
+"""
+Motor de fetch concorrente — Rota da Festa
+===========================================
+Pool de threads limitado para buscar várias páginas em paralelo, com:
+  - concorrência máxima por host (semáforo)
+  - limite de cortesia por host (token bucket: N pedidos/s com pequenas rajadas)
+    com taxa adaptativa (AIMD): sobe devagar enquanto as respostas vêm
+    limpas, corta para metade e faz uma pausa em 403/429/challenge, e
+    abranda quando a latência sobe
+  - `mapa_ordenado`: fan-out com fila limitada que preserva a ordem de saída
+  - `em_fundo`: corre um gerador numa thread e entrega-o por uma fila limitada
+
+A função de fetch propriamente dita (retries, detecção CF, FlareSolverr) é
+injectada pelo scraper — o motor só decide *quando* cada pedido pode sair.
+"""
+
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+
+
+class TokenBucket:
+    """Balde de tokens: `taxa` pedidos/s em média, rajadas até `capacidade`."""
+
+    def __init__(self, taxa: float, capacidade: float = 1.0):
+        self.taxa = taxa
+        self.capacidade = max(capacidade, 1.0)
+        self._tokens = self.capacidade
+        self._ultimo = time.monotonic()
+        self._lock = threading.Lock()
+
+    def adquirir(self):
+        """Bloqueia até haver um token disponível e consome-o."""
+        while True:
+            with self._lock:
+                agora = time.monotonic()
+                self._tokens = min(
+                    self.capacidade, self._tokens + (agora - self._ultimo) * self.taxa
+                )
+                self._ultimo = agora
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                espera = (1.0 - self._tokens) / self.taxa
+            time.sleep(espera)
+
+
+class TaxaAdaptativa:
+    """Controlo AIMD da taxa de pedidos a um host.
+
+    Cada resposta limpa soma `incremento / taxa` (≈ +incremento pedidos/s por
+    segundo de sucesso) até `taxa_max`; cada incidente (403, 429, challenge,
+    erro) multiplica a taxa por `fator` e pausa o host por 2^n segundos
+    (n = incidentes seguidos, até `pausa_max`) ou pelo Retry-After dado.
+    Uma latência média acima do dobro da de base conta como incidente leve
+    (corte de 20%, sem pausa).
+    """
+
+    def __init__(self, taxa: float, taxa_min: float = 0.2, taxa_max: float = None,
+                 rajada: float = 2.0, incremento: float = 0.1, fator: float = 0.5,
+                 pausa_max: float = 120.0):
+        self.balde = TokenBucket(taxa, rajada)
+        self.taxa_min = min(taxa_min, taxa)
+        self.taxa_max = max(taxa_max or taxa, taxa)
+        self.incremento = incremento
+        self.fator = fator
+        self.pausa_max = pausa_max
+        self.taxa_minima_vista = taxa
+        self.incidentes = {}
+        self._seguidos = 0
+        self._pausa_ate = 0.0
+        self._latencia = None       # média móvel exponencial
+        self._latencia_base = None  # menor média observada
+        self._lock = threading.Lock()
+
+    @property
+    def taxa(self) -> float:
+        return self.balde.taxa
+
+    def _ajustar(self, taxa: float):
+        self.balde.taxa = min(self.taxa_max, max(self.taxa_min, taxa))
+        self.taxa_minima_vista = min(self.taxa_minima_vista, self.balde.taxa)
+
+    def pausa_restante(self) -> float:
+        return max(0.0, self._pausa_ate - time.monotonic())
+
+    def adquirir(self):
+        """Espera pelo fim de uma pausa do host e por um token."""
+        while True:
+            espera = self.pausa_restante()
+            if espera <= 0:
+                break
+            time.sleep(espera)
+        self.balde.adquirir()
+
+    def sucesso(self, latencia: float = None):
+        with self._lock:
+            self._seguidos = 0
+            if latencia is not None:
+                self._latencia = latencia if self._latencia is None else 0.8 * self._latencia + 0.2 * latencia
+                if self._latencia_base is None or self._latencia < self._latencia_base:
+                    self._latencia_base = self._latencia
+                if self._latencia > 2 * self._latencia_base and self._latencia - self._latencia_base > 0.5:
+                    # Servidor a ficar lento: abrandar e recomeçar a medir daqui
+                    self.incidentes["latência"] = self.incidentes.get("latência", 0) + 1
+                    self._ajustar(self.taxa * 0.8)
+                    self._latencia_base = self._latencia
+                    return
+            self._ajustar(self.taxa + self.incremento / self.taxa)
+
+    def incidente(self, tipo: str, espera: float = None):
+        """Resposta de bloqueio/erro: corta a taxa e pausa o host."""
+        with self._lock:
+            self.incidentes[tipo] = self.incidentes.get(tipo, 0) + 1
+            self._seguidos += 1
+            self._ajustar(self.taxa * self.fator)
+            pausa = espera if espera is not None else min(self.pausa_max, 2.0 ** self._seguidos)
+            self._pausa_ate = max(self._pausa_ate, time.monotonic() + pausa)
+
+    def resumo(self) -> str:
+        incidentes = ", ".join(f"{n}× {tipo}" for tipo, n in sorted(self.incidentes.items()))
+        return (f"{self.taxa:.1f} pedidos/s (mínimo {self.taxa_minima_vista:.1f}), "
+                f"incidentes: {incidentes or 'nenhum'}")
+
+
+class FetchEngine:
+    """Executa `fetch_fn(url, **kwargs)` em paralelo respeitando limites por host.
+
+    `fetch(url)` é bloqueante e pode ser chamado de qualquer thread;
+    `map(urls)` distribui os pedidos pelo pool e devolve os resultados pela
+    mesma ordem dos URLs. `atalho(url)`, se dado, é consultado antes dos
+    limites: um resultado não-None (ex: hit de cache) não gasta tokens.
+
+    A taxa de cada host é uma TaxaAdaptativa (`taxa(url)`) que começa em
+    `taxa_por_host` e pode subir até `taxa_max`; quem conhece as respostas
+    (a fetch_fn) reporta-lhe sucessos e incidentes.
+    """
+
+    def __init__(self, fetch_fn, max_workers: int = 8, por_host: int = 4,
+                 taxa_por_host: float = 4.0, rajada: float = 2.0, atalho=None,
+                 taxa_max: float = None):
+        self.fetch_fn = fetch_fn
+        self.atalho = atalho
+        self.por_host = max(1, por_host)
+        self.taxa_por_host = taxa_por_host
+        self.taxa_max = taxa_max
+        self.rajada = rajada
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers),
+                                            thread_name_prefix="fetch")
+        self._hosts = {}
+        self._hosts_lock = threading.Lock()
+        self.pedidos = 0
+        self._inicio = time.monotonic()
+
+    def _limites(self, url: str):
+        host = urlsplit(url).netloc.lower()
+        with self._hosts_lock:
+            if host not in self._hosts:
+                self._hosts[host] = (
+                    threading.BoundedSemaphore(self.por_host),
+                    TaxaAdaptativa(self.taxa_por_host, taxa_max=self.taxa_max, rajada=self.rajada),
+                )
+            return self._hosts[host]
+
+    def taxa(self, url: str) -> TaxaAdaptativa:
+        """Controlo de taxa do host de `url`."""
+        return self._limites(url)[1]
+
+    def fetch(self, url: str, **kwargs):
+        if self.atalho:
+            resultado = self.atalho(url)
+            if resultado is not None:
+                return resultado
+        semaforo, taxa = self._limites(url)
+        with semaforo:
+            taxa.adquirir()
+            with self._hosts_lock:
+                self.pedidos += 1
+            return self.fetch_fn(url, **kwargs)
+
+    def submit(self, url: str, **kwargs):
+        return self._executor.submit(self.fetch, url, **kwargs)
+
+    def map(self, urls, **kwargs) -> list:
+        futures = [self.submit(u, **kwargs) for u in urls]
+        return [f.result() for f in futures]
+
+    def resumo(self) -> str:
+        elapsed = time.monotonic() - self._inicio
+        taxa = self.pedidos / elapsed if elapsed > 0 else 0.0
+        return f"{self.pedidos} pedidos em {elapsed:.1f}s ({taxa:.1f} pedidos/s)"
+
+    def resumo_hosts(self) -> list:
+        """Uma linha por host: taxa actual, mínima e incidentes."""
+        with self._hosts_lock:
+            hosts = sorted(self._hosts.items())
+        return [f"{host}: {taxa.resumo()}" for host, (_, taxa) in hosts]
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+
+def mapa_ordenado(fn, itens, workers: int = 4, max_pendentes: int = None):
+    """Aplica `fn` a cada item num pool de threads e gera os resultados pela ordem de entrada.
+
+    No máximo `max_pendentes` tarefas ficam em voo (fila limitada): o item
+    seguinte só é submetido quando o resultado mais antigo é consumido.
+    """
+    workers = max(1, workers)
+    max_pendentes = max(workers, max_pendentes or workers * 2)
+    pendentes = deque()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mapa") as pool:
+        for item in itens:
+            pendentes.append(pool.submit(fn, item))
+            if len(pendentes) >= max_pendentes:
+                yield pendentes.popleft().result()
+        while pendentes:
+            yield pendentes.popleft().result()
+
+
+_FIM = object()
+
+
+def em_fundo(itens, max_fila: int = 64):
+    """Consome o iterável `itens` numa thread à parte e gera os seus itens por ordem.
+
+    Entre as duas pontas há uma fila de no máximo `max_fila` itens: o produtor
+    (ex: scrape) só avança até esse ponto à frente do consumidor (ex: escrita
+    na base). Uma excepção do produtor é relançada no consumidor; se o
+    consumidor parar a meio, o produtor é fechado na sua thread.
+    """
+    fila = queue.Queue(maxsize=max(1, max_fila))
+    parar = threading.Event()
+
+    def _colocar(item) -> bool:
+        while not parar.is_set():
+            try:
+                fila.put(item, timeout=0.5)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _produzir():
+        try:
+            for item in itens:
+                if not _colocar((item, None)):
+                    return
+            _colocar((_FIM, None))
+        except BaseException as e:
+            _colocar((_FIM, e))
+        finally:
+            fechar = getattr(itens, "close", None)
+            if parar.is_set() and fechar:
+                fechar()
+
+    produtor = threading.Thread(target=_produzir, name="em-fundo", daemon=True)
+    produtor.start()
+    try:
+        while True:
+            item, erro = fila.get()
+            if item is _FIM:
+                if erro is not None:
+                    raise erro
+                return
+            yield item
+    finally:
+        parar.set()
+        produtor.join()
@@ -0,0 +1,172 @@
+"""
+Pool de sessões FlareSolverr — Rota da Festa
+=============================================
+Quando o curl_cffi é bloqueado (IPs de datacenter), cada página tem de ser
+aberta pelo Chrome do FlareSolverr, e cada pedido demora vários segundos.
+Com uma só sessão isso é um funil; aqui há N sessões (cada uma com o seu
+browser) e os pedidos são servidos em paralelo:
+  - despacho round-robin: uma sessão livre de cada vez, devolvida ao fim da
+    fila depois de usada (uma sessão nunca tem dois pedidos ao mesmo tempo)
+  - health check: um erro do FlareSolverr leva a confirmar com sessions.list
+    se a sessão ainda existe
+  - reciclagem: uma sessão que volta a receber o challenge, que desapareceu
+    ou que falha seguidamente é destruída e substituída por uma nova
+    (aquecida na página inicial antes de voltar ao pool)
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+
+class _Sessao:
+    def __init__(self, sid: str):
+        self.id = sid
+        self.pedidos = 0
+        self.falhas = 0  # falhas seguidas
+
+
+class PoolFlareSolverr:
+    """N sessões FlareSolverr partilhadas por várias threads."""
+
+    def __init__(self, url: str, e_challenge, tamanho: int = 3,
+                 aquecer: str = None, max_falhas: int = 2, max_timeout_ms: int = 60000):
+        self.url = url
+        self.tamanho = max(1, tamanho)
+        self.aquecer = aquecer
+        self.max_falhas = max_falhas
+        self.max_timeout_ms = max_timeout_ms
+        self._e_challenge = e_challenge
+        self._livres = queue.Queue()
+        self._lock = threading.Lock()
+        self.ativas = 0
+        self.pedidos = 0
+        self.falhas = 0
+        self.reciclagens = 0
+
+    # --- API do FlareSolverr ---
+
+    def _comando(self, payload: dict, timeout: float) -> dict:
+        return requests.post(self.url, json=payload, timeout=timeout).json()
+
+    def _resolver(self, sid: str, url: str) -> tuple:
+        """(html, erro): html vazio e mensagem de erro se o FlareSolverr falhou."""
+        payload = {"cmd": "request.get", "url": url, "session": sid,
+                   "maxTimeout": self.max_timeout_ms}
+        try:
+            data = self._comando(payload, timeout=self.max_timeout_ms / 1000 + 30)
+        except Exception as e:
+            return "", str(e)
+        if data.get("status") == "ok":
+            return data["solution"].get("response", ""), None
+        return "", data.get("message", "erro desconhecido")
+
+    def _existe(self, sid: str) -> bool:
+        """Health check: a sessão ainda está na lista do FlareSolverr?"""
+        try:
+            return sid in self._comando({"cmd": "sessions.list"}, timeout=10).get("sessions", [])
+        except Exception:
+            return False
+
+    def _destruir(self, sid: str):
+        try:
+            self._comando({"cmd": "sessions.destroy", "session": sid}, timeout=10)
+        except Exception:
+            pass
+
+    def _nova_sessao(self):
+        """Cria e aquece uma sessão; None se não conseguiu passar o challenge."""
+        try:
+            sid = self._comando({"cmd": "sessions.create"}, timeout=30).get("session", "")
+        except Exception as e:
+            print(f"  ⚠️ FlareSolverr: erro a criar sessão: {e}")
+            return None
+        if not sid:
+            return None
+        if self.aquecer:
+            html, erro = self._resolver(sid, self.aquecer)
+            if not html or self._e_challenge(html):
+                print(f"  ⚠️ FlareSolverr: sessão {sid[:12]}... não resolveu o challenge"
+                      + (f" ({erro})" if erro else ""))
+                self._destruir(sid)
+                return None
+        return _Sessao(sid)
+
+    # --- Pool ---
+
+    def iniciar(self) -> int:
+        """Cria as sessões em paralelo; devolve quantas ficaram prontas."""
+        with ThreadPoolExecutor(max_workers=self.tamanho, thread_name_prefix="fs") as pool:
+            sessoes = list(pool.map(lambda _: self._nova_sessao(), range(self.tamanho)))
+        for sessao in sessoes:
+            if sessao:
+                self._livres.put(sessao)
+                self.ativas += 1
+        return self.ativas
+
+    def _reciclar(self, sessao: _Sessao, motivo: str):
+        self._destruir(sessao.id)
+        nova = self._nova_sessao() or self._nova_sessao()
+        with self._lock:
+            self.reciclagens += 1
+            if nova is None:
+                self.ativas -= 1
+        if nova is None:
+            print(f"  ⚠️ FlareSolverr: sessão {sessao.id[:12]}... removida ({motivo}), "
+                  f"{self.ativas} activas")
+        else:
+            print(f"  ♻️ FlareSolverr: sessão {sessao.id[:12]}... reciclada ({motivo})")
+            self._livres.put(nova)
+
+    def _obter_livre(self):
+        """Próxima sessão livre (espera por uma), ou None se o pool ficou vazio."""
+        while True:
+            if self.ativas <= 0:
+                return None
+            try:
+                return self._livres.get(timeout=1)
+            except queue.Empty:
+                continue
+
+    def obter(self, url: str, tentativas: int = 2) -> str:
+        """HTML da página via uma sessão do pool ("" se todas as tentativas falharem)."""
+        for _ in range(tentativas):
+            sessao = self._obter_livre()
+            if sessao is None:
+                return ""
+            html, erro = self._resolver(sessao.id, url)
+            sessao.pedidos += 1
+            with self._lock:
+                self.pedidos += 1
+            if html and not self._e_challenge(html):
+                sessao.falhas = 0
+                self._livres.put(sessao)
+                return html
+
+            with self._lock:
+                self.falhas += 1
+            sessao.falhas += 1
+            if html:
+                self._reciclar(sessao, "challenge")
+            elif not self._existe(sessao.id):
+                self._reciclar(sessao, "sessão perdida")
+            elif sessao.falhas >= self.max_falhas:
+                self._reciclar(sessao, f"{sessao.falhas} falhas seguidas: {erro}")
+            else:
+                self._livres.put(sessao)
+        return ""
+
+    def resumo(self) -> str:
+        return (f"{self.ativas} sessões, {self.pedidos} pedidos, "
+                f"{self.falhas} falhas, {self.reciclagens} reciclagens")
+
+    def close(self):
+        while True:
+            try:
+                sessao = self._livres.get_nowait()
+            except queue.Empty:
+                break
+            self._destruir(sessao.id)
+        self.ativas = 0
@@ -0,0 +1,153 @@
+"""
+Gazetteer offline de Portugal — Rota da Festa
+==============================================
+Concelhos, freguesias e localidades com coordenadas, num TSV gerado a partir
+do GeoNames por construir_gazetteer.py (data/gazetteer_pt.tsv), para resolver
+nomes de lugares sem rede:
+  - pesquisa sem acentos nem maiúsculas (a mesma normalização do geo_store)
+  - pesquisa por prefixo (lista ordenada + bisect)
+  - homónimos: com o distrito (ex: da AF da competição) só contam os lugares
+    desse distrito; sem ele, um nome que existe em sítios diferentes é ambíguo e
+    não se devolve nada, em vez de arriscar o lugar errado
+  - quando o mesmo nome é concelho e localidade, ganha o concelho
+
+O ficheiro vem no repositório e é carregado na primeira pesquisa. Se faltar
+(ex: GAZETTEER a apontar para outro sítio), o gazetteer fica vazio, tudo
+segue para o Nominatim e o resumo diz que está em falta.
+"""
+
+import bisect
+import os
+import re
+import threading
+
+from geo_store import normalizar
+
+GAZETTEER_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "data", "gazetteer_pt.tsv")
+
+_PRIORIDADE = {"concelho": 0, "freguesia": 1, "localidade": 2}
+# Entradas com o mesmo nome a menos disto (graus, ~5 km) são o mesmo sítio
+_MESMO_SITIO = 0.05
+_RE_SEGMENTOS = re.compile(r"\s*(?:,|;|/|\||\s-\s|\s–\s)\s*")
+
+
+class Gazetteer:
+    """Lugares de Portugal por nome normalizado (thread-safe, carregado a pedido)."""
+
+    def __init__(self, caminho: str = None):
+        self.caminho = caminho or os.environ.get("GAZETTEER") or GAZETTEER_PADRAO
+        self.disponivel = False
+        self._consultados = set()  # textos distintos pesquisados
+        self._encontrados = set()
+        self._por_nome = {}
+        self._chaves = []
+        self._carregado = False
+        self._lock = threading.Lock()
+
+    def _carregar(self):
+        with self._lock:
+            if self._carregado:
+                return
+            try:
+                with open(self.caminho, "r", encoding="utf-8") as f:
+                    for linha in f:
+                        if linha.startswith("#") or linha.startswith("nome\t"):
+                            continue
+                        campos = linha.rstrip("\n").split("\t")
+                        if len(campos) < 5:
+                            continue
+                        nome, tipo, distrito, lat, lon = campos[:5]
+                        entrada = (nome, tipo, normalizar(distrito), float(lat), float(lon))
+                        self._por_nome.setdefault(normalizar(nome), []).append(entrada)
+                self.disponivel = bool(self._por_nome)
+            except FileNotFoundError:
+                print(f"⚠️ Gazetteer offline em falta ({self.caminho}) — só Nominatim; "
+                      "gerar com construir_gazetteer.py")
+            except (OSError, ValueError) as e:
+                print(f"⚠️ Erro ao carregar o gazetteer: {e}")
+            for entradas in self._por_nome.values():
+                entradas.sort(key=lambda e: _PRIORIDADE.get(e[1], len(_PRIORIDADE)))
+            self._chaves = sorted(self._por_nome)
+            self._carregado = True
+
+    def __len__(self) -> int:
+        if not self._carregado:
+            self._carregar()
+        return sum(len(v) for v in self._por_nome.values())
+
+    def _escolher(self, entradas: list, distrito: str = None):
+        if distrito:
+            entradas = [e for e in entradas if e[2] == normalizar(distrito)]
+            if not entradas:
+                return None
+        melhor = entradas[0]
+        for outra in entradas[1:]:
+            if (abs(outra[3] - melhor[3]) > _MESMO_SITIO
+                    or abs(outra[4] - melhor[4]) > _MESMO_SITIO):
+                return None  # homónimos em sítios diferentes
+        return melhor
+
+    def _lugar(self, nome: str, distrito: str = None):
+        if not self._carregado:
+            self._carregar()
+        entradas = self._por_nome.get(normalizar(nome))
+        entrada = self._escolher(entradas, distrito) if entradas else None
+        if entrada is None:
+            return None
+        nome, tipo, distrito, lat, lon = entrada
+        return {"lat": lat, "lon": lon, "local": nome, "tipo": tipo, "distrito": distrito}
+
+    def _contar(self, texto: str, lugar):
+        chave = normalizar(texto or "")
+        with self._lock:
+            self._consultados.add(chave)
+            if lugar is not None:
+                self._encontrados.add(chave)
+        return lugar
+
+    def procurar(self, nome: str, distrito: str = None):
+        """Lugar com este nome → {"lat", "lon", "local", "tipo", "distrito"}; None se desconhecido ou ambíguo."""
+        return self._contar(nome, self._lugar(nome, distrito))
+
+    def com_prefixo(self, prefixo: str, limite: int = 10) -> list:
+        """Nomes de lugares começados por `prefixo` (sem acentos), por ordem alfabética."""
+        if not self._carregado:
+            self._carregar()
+        p = normalizar(prefixo)
+        if not p:
+            return []
+        nomes = []
+        i = bisect.bisect_left(self._chaves, p)
+        while i < len(self._chaves) and self._chaves[i].startswith(p) and len(nomes) < limite:
+            nomes.append(self._por_nome[self._chaves[i]][0][0])
+            i += 1
+        return nomes
+
+    def no_texto(self, texto: str, distrito: str = None):
+        """Primeiro lugar conhecido num texto livre ("Teatro Municipal, Braga", "Alvite - Cabeceiras").
+
+        Vê cada segmento do texto, do último para o primeiro (a localidade
+        costuma vir no fim), primeiro inteiro e depois o prefixo de palavras
+        mais longo que seja concelho ou freguesia ("Ponte de Lima centro").
+        """
+        segmentos = [s for s in _RE_SEGMENTOS.split(texto or "") if s]
+        return self._contar(texto, self._no_texto(segmentos, distrito))
+
+    def _no_texto(self, segmentos: list, distrito: str = None):
+        for segmento in reversed(segmentos):
+            lugar = self._lugar(segmento, distrito)
+            if lugar:
+                return lugar
+        for segmento in reversed(segmentos):
+            palavras = segmento.split()
+            for n in range(len(palavras) - 1, 0, -1):
+                lugar = self._lugar(" ".join(palavras[:n]), distrito)
+                if lugar and lugar["tipo"] != "localidade":
+                    return lugar
+        return None
+
+    def resumo(self) -> str:
+        if self._carregado and not self.disponivel:
+            return "gazetteer offline em falta"
+        return f"{len(self._encontrados)}/{len(self._consultados)} locais resolvidos pelo gazetteer offline"
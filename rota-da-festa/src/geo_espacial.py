@@ -0,0 +1,78 @@
+"""
+Distâncias e índice espacial — Rota da Festa
+=============================================
+O dashboard calculava a distância de cada evento com
+`df.apply(lambda row: haversine(...), axis=1)`: uma chamada Python por linha
+em cada rerun do Streamlit. Aqui:
+  - `haversine_km` é a mesma fórmula em NumPy, sobre colunas inteiras
+    (escalares também funcionam, com broadcasting)
+  - `GrelhaEspacial` agrupa os eventos em células de `celula_graus` graus;
+    "eventos a menos de R km" só calcula distâncias para os eventos das
+    células que tocam no quadrado à volta do ponto, em vez de todos
+"""
+
+import numpy as np
+
+R_TERRA_KM = 6371.0
+# Km por grau de latitude (e de longitude no equador)
+_KM_POR_GRAU = np.pi * R_TERRA_KM / 180.0
+# Acima disto as células selecionadas deixam de ser poucas e compensa uma máscara
+_MAX_FATIAS = 64
+
+
+def haversine_km(lat1, lon1, lat2, lon2):
+    """Distância em km entre pontos (graus; escalares ou arrays). NaN → NaN."""
+    lat1, lon1, lat2, lon2 = (np.radians(np.asarray(v, dtype=float)) for v in (lat1, lon1, lat2, lon2))
+    a = (np.sin((lat2 - lat1) / 2) ** 2
+         + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2)
+    return 2 * R_TERRA_KM * np.arctan2(np.sqrt(a), np.sqrt(1 - a))
+
+
+class GrelhaEspacial:
+    """Pontos (lat, lon) agrupados em células de uma grelha regular.
+
+    `dentro_do_raio` devolve posições (0..n-1, pela ordem dos arrays dados),
+    para usar com `df.iloc`. Pontos sem coordenadas (NaN) ficam de fora.
+    """
+
+    def __init__(self, latitudes, longitudes, celula_graus: float = 0.1):
+        self.celula = float(celula_graus)
+        self.lat = np.asarray(latitudes, dtype=float)
+        self.lon = np.asarray(longitudes, dtype=float)
+        validos = np.flatnonzero(~(np.isnan(self.lat) | np.isnan(self.lon)))
+        ci = np.floor(self.lat[validos] / self.celula).astype(np.int64)
+        cj = np.floor(self.lon[validos] / self.celula).astype(np.int64)
+        # Ordenar por célula: cada célula fica numa fatia contígua de _ordem
+        ordem = np.lexsort((cj, ci))
+        self._ordem = validos[ordem]
+        ci, cj = ci[ordem], cj[ordem]
+        novas = np.ones(len(ordem), dtype=bool)
+        novas[1:] = (ci[1:] != ci[:-1]) | (cj[1:] != cj[:-1])
+        self._inicio = np.flatnonzero(novas)
+        self._fim = np.append(self._inicio[1:], len(ordem))
+        self._ci, self._cj = ci[self._inicio], cj[self._inicio]
+
+    def __len__(self) -> int:
+        return len(self._ordem)
+
+    def _candidatos(self, lat: float, lon: float, raio_km: float) -> np.ndarray:
+        dlat = raio_km / _KM_POR_GRAU
+        lat_max = min(abs(lat) + dlat, 89.9)
+        dlon = min(raio_km / (_KM_POR_GRAU * np.cos(np.radians(lat_max))), 180.0)
+        i0, i1 = np.floor((lat - dlat) / self.celula), np.floor((lat + dlat) / self.celula)
+        j0, j1 = np.floor((lon - dlon) / self.celula), np.floor((lon + dlon) / self.celula)
+        sel = np.flatnonzero((self._ci >= i0) & (self._ci <= i1) & (self._cj >= j0) & (self._cj <= j1))
+        if len(sel) == 0:
+            return np.empty(0, dtype=np.int64)
+        if len(sel) <= _MAX_FATIAS:
+            return np.concatenate([self._ordem[self._inicio[s]:self._fim[s]] for s in sel])
+        mascara = np.zeros(len(self._inicio), dtype=bool)
+        mascara[sel] = True
+        return self._ordem[np.repeat(mascara, self._fim - self._inicio)]
+
+    def dentro_do_raio(self, lat: float, lon: float, raio_km: float):
+        """(posições, distâncias em km) dos pontos a até `raio_km` de (lat, lon), por posição."""
+        posicoes = np.sort(self._candidatos(lat, lon, raio_km))
+        distancias = haversine_km(lat, lon, self.lat[posicoes], self.lon[posicoes])
+        perto = distancias <= raio_km
+        return posicoes[perto], distancias[perto]
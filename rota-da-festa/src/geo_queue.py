@@ -0,0 +1,125 @@
+"""
+Fila de geocoding em segundo plano — Rota da Festa
+===================================================
+As consultas ao Nominatim eram feitas no meio do crawl, com um
+`time.sleep(1.1)` antes de cada uma, e o scraper inteiro ficava à espera
+(uma equipa desconhecida chegava a custar três consultas seguidas).
+
+Aqui as consultas vão para uma fila servida por threads próprias:
+  - deduplicação: um local (ou equipa) pedido várias vezes durante a
+    execução só é consultado uma vez — todos os pedidos recebem o mesmo Future
+  - limite global: a política do Nominatim é de 1 pedido/s por aplicação, e
+    os três scrapers podem correr ao mesmo tempo na mesma máquina; o instante
+    do último pedido fica num ficheiro partilhado (GEO_LOCK) protegido por
+    flock, por isso o intervalo (GEO_INTERVALO) vale entre processos
+  - quem pede não espera: recebe o Future e segue com uma coordenada
+    provisória (centróide do distrito/região), corrigida quando a real chega
+"""
+
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import fcntl
+except ImportError:  # Windows: o limite fica só dentro do processo
+    fcntl = None
+
+
+class LimiteNominatim:
+    """Um pedido por `intervalo` segundos, partilhado por threads e processos."""
+
+    def __init__(self, caminho: str = None, intervalo: float = None):
+        self.caminho = caminho or os.environ.get("GEO_LOCK") or os.path.join(
+            tempfile.gettempdir(), "rota_da_festa_nominatim.lock")
+        if intervalo is None:
+            intervalo = float(os.environ.get("GEO_INTERVALO", "1.1"))
+        self.intervalo = intervalo
+        self.pedidos = 0
+        self.espera_total = 0.0
+        self._lock = threading.Lock()
+        self._ultimo = 0.0  # sem fcntl
+
+    def esperar(self):
+        """Bloqueia até ser a vez deste pedido e regista-o como o último."""
+        with self._lock:
+            if fcntl is None:
+                self._ultimo = self._aguardar(self._ultimo)
+            else:
+                with open(self.caminho, "a+", encoding="utf-8") as f:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                    try:
+                        f.seek(0)
+                        try:
+                            ultimo = float(f.read().strip() or 0)
+                        except ValueError:
+                            ultimo = 0.0
+                        agora = self._aguardar(ultimo)
+                        f.seek(0)
+                        f.truncate()
+                        f.write(repr(agora))
+                        f.flush()
+                    finally:
+                        fcntl.flock(f, fcntl.LOCK_UN)
+            self.pedidos += 1
+
+    def _aguardar(self, ultimo: float) -> float:
+        espera = ultimo + self.intervalo - time.time()
+        if espera > 0:
+            self.espera_total += espera
+            time.sleep(espera)
+        return time.time()
+
+
+class FilaGeocoding:
+    """Consultas de geocoding em threads próprias, deduplicadas por chave."""
+
+    def __init__(self, workers: int = None):
+        if workers is None:
+            workers = int(os.environ.get("GEO_WORKERS", "2"))
+        self._executor = ThreadPoolExecutor(max_workers=max(1, workers),
+                                            thread_name_prefix="geo")
+        self._futuros = {}
+        self._lock = threading.Lock()
+
+    def pedir(self, chave, fn, *args):
+        """Future com o resultado de `fn(*args)`; a mesma `chave` reaproveita o primeiro pedido."""
+        with self._lock:
+            futuro = self._futuros.get(chave)
+            if futuro is not None:
+                return futuro
+            futuro = self._executor.submit(self._executar, chave, fn, *args)
+            self._futuros[chave] = futuro
+            return futuro
+
+    def pedido(self, chave):
+        """Future de um pedido já feito para `chave`, ou None."""
+        with self._lock:
+            return self._futuros.get(chave)
+
+    @staticmethod
+    def _executar(chave, fn, *args):
+        try:
+            return fn(*args)
+        except Exception as e:
+            print(f"  ⚠️ Geocoding: erro em '{chave}': {e}")
+            return None
+
+    def pendentes(self) -> int:
+        with self._lock:
+            return sum(1 for f in self._futuros.values() if not f.done())
+
+    def esperar(self):
+        """Espera que todas as consultas pedidas até agora terminem."""
+        with self._lock:
+            futuros = list(self._futuros.values())
+        for futuro in futuros:
+            futuro.result()
+
+    def resumo(self) -> str:
+        return f"{len(self._futuros)} consultas em segundo plano"
+
+    def close(self):
+        self._executor.shutdown(wait=True)
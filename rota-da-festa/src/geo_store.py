@@ -0,0 +1,129 @@
+"""
+Cache de geocoding partilhada pelos scrapers — Rota da Festa
+=============================================================
+Uma base SQLite (em .cache/, guardada entre execuções pela cache da GitHub
+Action e fora do git) com o resultado de cada geocoding:
+  - chave normalizada (minúsculas, sem acentos nem pontuação) por tipo
+    ("local" para festas/câmaras, "estadio" para as equipas do ZeroZero)
+  - entradas negativas com validade: um local que falhou não volta ao
+    Nominatim até expirar (GEO_TTL_FALHA_DIAS)
+  - proveniência: fonte, query que resolveu, scraper que a gravou e quando
+
+Assim um local repetido não custa nenhum pedido de rede, em nenhum scraper.
+O ficheiro só é criado na primeira consulta: importar um scraper (num
+benchmark, por exemplo) não escreve nada.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+
+GEO_DB_PADRAO = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "geocoding.sqlite")
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS geocoding (
+    tipo        TEXT NOT NULL,
+    chave       TEXT NOT NULL,
+    consulta    TEXT NOT NULL,
+    lat         REAL,
+    lon         REAL,
+    local       TEXT,
+    fonte       TEXT,
+    query       TEXT,
+    origem      TEXT,
+    atualizado  REAL NOT NULL,
+    expira      REAL,
+    PRIMARY KEY (tipo, chave)
+)
+"""
+
+
+def normalizar(texto: str) -> str:
+    """Chave de cache: minúsculas, sem acentos, pontuação e espaços repetidos."""
+    texto = unicodedata.normalize("NFKD", texto or "")
+    texto = "".join(c for c in texto if not unicodedata.combining(c)).lower()
+    return " ".join(re.sub(r"[^\w]+", " ", texto).split())
+
+
+class GeoStore:
+    """Acesso à cache de geocoding (thread-safe, uma ligação partilhada)."""
+
+    def __init__(self, origem: str = "", caminho: str = None, ttl_falha: float = None):
+        # Lidos aqui (e não no import) para apanhar os .env carregados pelos scrapers
+        self.caminho = caminho or os.environ.get("GEO_DB") or GEO_DB_PADRAO
+        self.origem = origem
+        if ttl_falha is None:
+            ttl_falha = float(os.environ.get("GEO_TTL_FALHA_DIAS", "14")) * 86400
+        self.ttl_falha = ttl_falha
+        self.hits = 0
+        self.negativos = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+    def _ligacao(self) -> sqlite3.Connection:
+        """Ligação à base, aberta (e criada) na primeira utilização; chamar com o lock."""
+        if self._conn is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.caminho)), exist_ok=True)
+            self._conn = sqlite3.connect(self.caminho, check_same_thread=False)
+            with self._conn:
+                self._conn.execute(_ESQUEMA)
+        return self._conn
+
+    def obter(self, consulta: str, tipo: str = "local"):
+        """Devolve {"lat", "lon", "local"} se conhecido, False se falhou há pouco, None se desconhecido."""
+        chave = normalizar(consulta)
+        with self._lock:
+            row = self._ligacao().execute(
+                "SELECT lat, lon, local, expira FROM geocoding WHERE tipo = ? AND chave = ?",
+                (tipo, chave),
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            lat, lon, local, expira = row
+            if lat is not None and lon is not None:
+                self.hits += 1
+                return {"lat": lat, "lon": lon, "local": local}
+            if expira is not None and expira > time.time():
+                self.negativos += 1
+                return False
+            self.misses += 1
+            return None
+
+    def guardar(self, consulta: str, lat: float, lon: float, local: str = None,
+                tipo: str = "local", fonte: str = "nominatim", query: str = None):
+        self._gravar(tipo, consulta, lat, lon, local or consulta.strip(), fonte, query, None)
+
+    def falhou(self, consulta: str, tipo: str = "local", fonte: str = "nominatim"):
+        """Entrada negativa: não voltar a tentar até expirar."""
+        self._gravar(tipo, consulta, None, None, None, fonte, None, time.time() + self.ttl_falha)
+
+    def _gravar(self, tipo, consulta, lat, lon, local, fonte, query, expira):
+        try:
+            with self._lock:
+                with self._ligacao() as conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO geocoding "
+                        "(tipo, chave, consulta, lat, lon, local, fonte, query, origem, atualizado, expira) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (tipo, normalizar(consulta), consulta.strip(), lat, lon, local,
+                         fonte, query, self.origem, time.time(), expira),
+                    )
+        except sqlite3.Error as e:
+            print(f"  ⚠️ Cache de geocoding: erro a gravar '{consulta}': {e}")
+
+    def resumo(self) -> str:
+        total = self.hits + self.negativos + self.misses
+        pct = 100 * (self.hits + self.negativos) / total if total else 0.0
+        return (f"{self.hits} da cache, {self.negativos} falhas recentes, "
+                f"{self.misses} fora da cache — {pct:.0f}% resolvidos pela cache")
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
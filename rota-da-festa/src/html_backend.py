@@ -0,0 +1,30 @@
+"""
+Backend de parsing HTML partilhado pelos scrapers — Rota da Festa
+==================================================================
+Todos os scrapers criam a árvore BeautifulSoup através de `make_soup`, que usa
+o parser mais rápido disponível:
+  - lxml (C, ~5-10x mais rápido que html.parser) quando instalado
+  - html.parser (stdlib) como fallback
+
+A variável de ambiente PARSER_HTML força um backend ("lxml", "html.parser",
+"html5lib"). As funções de extracção aceitam HTML ou uma soup já construída,
+para que cada documento seja parseado uma única vez.
+"""
+
+import os
+from bs4 import BeautifulSoup
+
+try:
+    import lxml  # noqa: F401
+    _PARSER_PADRAO = "lxml"
+except ImportError:
+    _PARSER_PADRAO = "html.parser"
+
+PARSER_HTML = os.environ.get("PARSER_HTML") or _PARSER_PADRAO
+
+
+def make_soup(html, parser: str = None) -> BeautifulSoup:
+    """Devolve a soup do documento; se já for uma soup, reutiliza-a sem re-parsear."""
+    if isinstance(html, BeautifulSoup):
+        return html
+    return BeautifulSoup(html or "", parser or PARSER_HTML)
@@ -0,0 +1,112 @@
+"""
+Cache HTTP persistente em disco — Rota da Festa
+================================================
+Guarda o corpo das respostas, o ETag/Last-Modified e a hora do fetch, num
+ficheiro gzip por URL (nome = sha256 do URL). Cada classe de URL tem o seu TTL:
+  - dentro do TTL a resposta é servida do disco, sem rede
+  - depois do TTL o pedido sai com If-None-Match / If-Modified-Since e um 304
+    renova a entrada sem voltar a descarregar a página
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+
+
+class EntradaCache:
+    """Resposta guardada para um URL."""
+
+    def __init__(self, url: str, body: str, etag: str = None,
+                 last_modified: str = None, fetched_at: float = 0.0, ttl: float = 0.0):
+        self.url = url
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = fetched_at
+        self.ttl = ttl
+
+    @property
+    def fresca(self) -> bool:
+        return time.time() - self.fetched_at < self.ttl
+
+    def headers_condicionais(self) -> dict:
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class HttpCache:
+    """Cache em disco endereçada pelo sha256 do URL.
+
+    `ttls` é uma lista ordenada de (regex, segundos); o primeiro padrão que
+    coincidir com o URL define o TTL, senão usa-se `ttl_padrao`. O diretório
+    só é criado na primeira escrita.
+    """
+
+    def __init__(self, diretorio: str, ttls: list = None, ttl_padrao: float = 6 * 3600):
+        self.diretorio = diretorio
+        self.ttls = [(re.compile(p), ttl) for p, ttl in (ttls or [])]
+        self.ttl_padrao = ttl_padrao
+        self.hits = 0
+        self.revalidados = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def ttl_para(self, url: str) -> float:
+        for padrao, ttl in self.ttls:
+            if padrao.search(url):
+                return ttl
+        return self.ttl_padrao
+
+    def _caminho(self, url: str) -> str:
+        h = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        return os.path.join(self.diretorio, h[:2], h + ".json.gz")
+
+    def obter(self, url: str):
+        """Devolve a EntradaCache do URL (fresca ou não) ou None."""
+        caminho = self._caminho(url)
+        try:
+            with gzip.open(caminho, "rt", encoding="utf-8") as f:
+                d = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if d.get("url") != url:
+            return None
+        return EntradaCache(url, d.get("body", ""), d.get("etag"), d.get("last_modified"),
+                            d.get("fetched_at", 0.0), self.ttl_para(url))
+
+    def guardar(self, url: str, body: str, etag: str = None, last_modified: str = None):
+        caminho = self._caminho(url)
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        tmp = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with gzip.open(tmp, "wt", encoding="utf-8") as f:
+                json.dump({
+                    "url": url, "body": body, "etag": etag,
+                    "last_modified": last_modified, "fetched_at": time.time(),
+                }, f, ensure_ascii=False)
+            os.replace(tmp, caminho)
+        except OSError as e:
+            print(f"  ⚠️ Cache HTTP: erro a guardar {url}: {e}")
+
+    def renovar(self, entrada: EntradaCache):
+        """Resposta 304: a entrada continua válida, reinicia o relógio do TTL."""
+        self.guardar(entrada.url, entrada.body, entrada.etag, entrada.last_modified)
+
+    def registar(self, tipo: str):
+        with self._lock:
+            setattr(self, tipo, getattr(self, tipo) + 1)
+
+    def resumo(self) -> str:
+        total = self.hits + self.revalidados + self.misses
+        poupados = self.hits + self.revalidados
+        pct = 100 * poupados / total if total else 0.0
+        return (f"{self.hits} hits, {self.revalidados} revalidados (304), "
+                f"{self.misses} downloads — {pct:.0f}% sem descarregar")
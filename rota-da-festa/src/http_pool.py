@@ -0,0 +1,103 @@
+"""
+Sessão HTTP com pool de ligações — Rota da Festa
+=================================================
+`requests.get(...)` ao nível do módulo abre uma ligação TCP (e um handshake
+TLS) nova em cada pedido. Uma `requests.Session` com um HTTPAdapter guarda as
+ligações abertas (keep-alive) num pool por host e reutiliza-as:
+  - HTTP_POOL_HOSTS: quantos hosts mantêm ligações em pool (32 por omissão)
+  - HTTP_POOL_POR_HOST: ligações guardadas por host (4 por omissão)
+  - HTTP_TIMEOUT: timeout por omissão dos pedidos, em segundos (20)
+
+A sessão conta os pedidos e as ligações TCP abertas, por isso o relatório final
+pode mostrar quantos pedidos reutilizaram uma ligação já aberta.
+
+O requests só fala HTTP/1.1; o ganho vem do keep-alive, não do HTTP/2.
+"""
+
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+
+class EstatisticasLigacoes:
+    """Pedidos feitos e ligações abertas por uma sessão (thread-safe)."""
+
+    def __init__(self):
+        self.pedidos = 0
+        self.ligacoes = 0
+        self._lock = threading.Lock()
+
+    def registar(self, campo: str):
+        with self._lock:
+            setattr(self, campo, getattr(self, campo) + 1)
+
+    @property
+    def reutilizadas(self) -> int:
+        return max(0, self.pedidos - self.ligacoes)
+
+    def resumo(self) -> str:
+        pct = 100 * self.reutilizadas / self.pedidos if self.pedidos else 0.0
+        return (f"{self.pedidos} pedidos em {self.ligacoes} ligações "
+                f"({self.reutilizadas} reutilizadas, {pct:.0f}%)")
+
+
+def _pool_contado(base, estatisticas: EstatisticasLigacoes):
+    """Subclasse do pool do urllib3 que conta cada ligação TCP aberta.
+
+    Conta-se no `connect()` da ligação e não no `_new_conn()` do pool: o
+    urllib3 volta a ligar em silêncio um objeto de ligação reaproveitado do
+    pool cujo socket o servidor fechou (sem keep-alive), e aí não há objeto novo.
+    """
+
+    class _Ligacao(base.ConnectionCls):
+        def connect(self):
+            estatisticas.registar("ligacoes")
+            return super().connect()
+
+    class _Pool(base):
+        ConnectionCls = _Ligacao
+
+    return _Pool
+
+
+class _AdaptadorContado(HTTPAdapter):
+    def __init__(self, estatisticas: EstatisticasLigacoes, **kwargs):
+        self.estatisticas = estatisticas  # antes do super(): init_poolmanager precisa dele
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": _pool_contado(HTTPConnectionPool, self.estatisticas),
+            "https": _pool_contado(HTTPSConnectionPool, self.estatisticas),
+        }
+
+    def send(self, request, **kwargs):
+        self.estatisticas.registar("pedidos")
+        return super().send(request, **kwargs)
+
+
+class SessaoHTTP(requests.Session):
+    """requests.Session com pool de ligações contado e timeout por omissão."""
+
+    def __init__(self, headers: dict = None, timeout: float = None,
+                 pool_hosts: int = None, pool_por_host: int = None):
+        super().__init__()
+        self.timeout = timeout or float(os.environ.get("HTTP_TIMEOUT", "20"))
+        self.estatisticas = EstatisticasLigacoes()
+        adaptador = _AdaptadorContado(
+            self.estatisticas,
+            pool_connections=pool_hosts or int(os.environ.get("HTTP_POOL_HOSTS", "32")),
+            pool_maxsize=pool_por_host or int(os.environ.get("HTTP_POOL_POR_HOST", "4")),
+        )
+        self.mount("https://", adaptador)
+        self.mount("http://", adaptador)
+        if headers:
+            self.headers.update(headers)
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault("timeout", self.timeout)
+        return super().request(method, url, **kwargs)
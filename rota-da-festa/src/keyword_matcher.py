@@ -0,0 +1,36 @@
+"""
+Procura de várias palavras-chave numa única passagem — Rota da Festa
+=====================================================================
+Em vez de um `x in texto` (ou um `re.search`) por palavra-chave, todas as
+palavras são compiladas uma vez numa alternância dentro de um lookahead,
+ordenadas da mais longa para a mais curta. `finditer` pára em cada posição
+onde começa alguma palavra e devolve a mais longa; as mais curtas que também
+começam ali são prefixos dela e vêm do fecho de prefixos pré-calculado.
+
+Resultado: o mesmo conjunto de ocorrências que os `in` individuais, com uma
+só passagem pelo texto.
+"""
+
+import re
+
+
+class MatcherPalavras:
+    """Conjunto fixo de palavras-chave (já em minúsculas) compilado num só regex."""
+
+    def __init__(self, palavras):
+        unicas = sorted(set(palavras), key=len, reverse=True)
+        self._regex = re.compile("(?=(" + "|".join(re.escape(p) for p in unicas) + "))")
+        self._prefixos = {p: tuple(q for q in unicas if p.startswith(q)) for p in unicas}
+
+    def ocorrencias(self, texto: str):
+        """Gera (início, palavra) para cada ocorrência de cada palavra no texto."""
+        for m in self._regex.finditer(texto):
+            inicio = m.start()
+            for palavra in self._prefixos[m.group(1)]:
+                yield inicio, palavra
+
+    def presentes(self, texto: str, fim: int = None) -> set:
+        """Palavras que ocorrem no texto (opcionalmente só as que acabam até `fim`)."""
+        if fim is None:
+            return {p for _, p in self.ocorrencias(texto)}
+        return {p for i, p in self.ocorrencias(texto) if i + len(p) <= fim}
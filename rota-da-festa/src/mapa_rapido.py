@@ -0,0 +1,94 @@
+"""
+Mapa rápido para muitos eventos — Rota da Festa
+================================================
+O dashboard criava um `folium.Marker` com popup HTML por evento dentro de um
+`MarkerCluster`: cada marcador é um objeto Python renderizado pelo Jinja e um
+bloco de JavaScript próprio na página, o que deixa de ser usável a partir de
+alguns milhares de eventos. Aqui:
+  - `camada_rapida` envia os eventos como um único array compacto
+    (FastMarkerCluster) e os marcadores, ícones, tooltips e popups são
+    criados no browser por uma callback; o popup só é montado quando é aberto
+  - `desbastar` limita o que vai para a página: os eventos dentro da vista
+    inicial do mapa ficam todos, os de fora ficam um por célula da grelha
+    (quem faz zoom out vê onde há eventos, não cada um deles)
+"""
+
+import numpy as np
+from folium.plugins import FastMarkerCluster
+
+# Acima disto o dashboard deixa de criar um folium.Marker por evento
+LIMITE_MARCADORES = 500
+# Máximo de eventos enviados para a página no modo rápido
+MAX_PONTOS = 20000
+# Lado da célula (graus) para os eventos fora da vista inicial
+CELULA_FORA_DA_VISTA = 0.05
+
+# Linha do array: [lat, lon, futebol (0/1), nome, data, hora, preço, url_maps, distância]
+_CALLBACK = """function (row) {
+    var esc = function (s) {
+        return String(s == null ? "" : s).replace(/[&<>"']/g, function (c) {
+            return {"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;", "'": "&#39;"}[c];
+        });
+    };
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {
+        icon: L.AwesomeMarkers.icon({
+            markerColor: row[2] ? "green" : "red",
+            icon: row[2] ? "futbol-o" : "glass",
+            prefix: "fa"
+        })
+    });
+    marker.bindTooltip(esc(row[3]) + " (" + row[8].toFixed(1) + " km)");
+    marker.bindPopup(function () {
+        return "<div style='font-family: sans-serif; min-width: 180px'>"
+            + "<b>" + esc(row[3]) + "</b><br>"
+            + "<small>" + esc(row[4]) + " • " + esc(row[5]) + "</small><br>"
+            + "<span style='color: green'>" + esc(row[6]) + "</span><br>"
+            + "<a href='" + esc(row[7]) + "' target='_blank'>Navegar ➔</a>"
+            + "</div>";
+    });
+    return marker;
+}"""
+
+
+def vista_inicial(lat: float, lon: float, zoom: int, largura_px: int = 1200, altura_px: int = 450):
+    """(sul, oeste, norte, leste) visíveis num mapa Web Mercator centrado em (lat, lon)."""
+    graus_por_px = 360.0 / (256 * 2 ** zoom)
+    dlon = largura_px / 2 * graus_por_px
+    dlat = altura_px / 2 * graus_por_px * np.cos(np.radians(lat))
+    return lat - dlat, lon - dlon, lat + dlat, lon + dlon
+
+
+def desbastar(latitudes, longitudes, vista, max_pontos: int = MAX_PONTOS,
+              celula_graus: float = CELULA_FORA_DA_VISTA) -> np.ndarray:
+    """Posições (pela ordem dada, que é a prioridade) dos eventos a desenhar.
+
+    Dentro da `vista` ficam todos; fora, o primeiro de cada célula. No fim
+    corta-se em `max_pontos`, primeiro os de dentro da vista.
+    """
+    lat = np.asarray(latitudes, dtype=float)
+    lon = np.asarray(longitudes, dtype=float)
+    sul, oeste, norte, leste = vista
+    validos = ~(np.isnan(lat) | np.isnan(lon))
+    dentro = validos & (lat >= sul) & (lat <= norte) & (lon >= oeste) & (lon <= leste)
+    fora = np.flatnonzero(validos & ~dentro)
+    chaves = (np.floor(lat[fora] / celula_graus).astype(np.int64) * 100000
+              + np.floor(lon[fora] / celula_graus).astype(np.int64))
+    _, primeiros = np.unique(chaves, return_index=True)
+    posicoes = np.concatenate([np.flatnonzero(dentro), np.sort(fora[primeiros])])
+    return np.sort(posicoes[:max_pontos])
+
+
+def camada_rapida(df) -> FastMarkerCluster:
+    """FastMarkerCluster com os eventos de `df` (colunas do dashboard, incluindo `distancia`)."""
+    dados = np.column_stack([
+        df['latitude'].round(5).to_numpy(dtype=object),
+        df['longitude'].round(5).to_numpy(dtype=object),
+        (df['tipo'] == "Futebol").astype(int).to_numpy(dtype=object),
+        df['nome'].fillna("").to_numpy(dtype=object),
+        df['data'].fillna("").to_numpy(dtype=object),
+        df['hora'].fillna("").to_numpy(dtype=object),
+        df['preco'].fillna("").to_numpy(dtype=object),
+        df['url_maps'].fillna("").to_numpy(dtype=object),
+        df['distancia'].round(1).to_numpy(dtype=object),
+    ]).tolist()
+    return FastMarkerCluster(dados, callback=_CALLBACK)
@@ -22,7 +22,13 @@ from bs4 import BeautifulSoup
 from supabase import create_client, Client
 from dotenv import load_dotenv
 from geopy.geocoders import Nominatim
-import requests
+from html_backend import make_soup
+from http_pool import SessaoHTTP
+from fetch_engine import FetchEngine, mapa_ordenado
+from geo_store import GeoStore, normalizar
+from geo_queue import FilaGeocoding, LimiteNominatim
+from gazetteer import Gazetteer
+from sync_eventos import Sincronizador, hash_conteudo
 
 load_dotenv()
 load_dotenv("../.env.local")
@@ -38,12 +44,27 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 geolocator = Nominatim(user_agent="rota_da_festa_camaras_v1")
+geo_store = GeoStore(origem="camaras")
+nominatim = LimiteNominatim()
+fila_geo = FilaGeocoding()
+gazetteer = Gazetteer()
 
 HEADERS = {
     "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
     "Accept-Language": "pt-PT,pt;q=0.9,en;q=0.8",
 }
 
+# Sessão partilhada por todos os pedidos HTTP do módulo (páginas das câmaras e
+# Groq): ligações keep-alive reutilizadas em vez de uma ligação nova por pedido
+http = SessaoHTTP(HEADERS)
+
+# Câmaras raspadas em paralelo (hosts diferentes); a cortesia é por host:
+# no máximo um pedido de cada vez e CAMARAS_TAXA_HOST pedidos/s a cada servidor
+CAMARAS_CONCORRENCIA = int(os.environ.get("CAMARAS_CONCORRENCIA", "8"))
+CAMARAS_TAXA_HOST = float(os.environ.get("CAMARAS_TAXA_HOST", "0.5"))
+_motor = FetchEngine(lambda url: http.get(url, timeout=20), max_workers=1,
+                     por_host=1, taxa_por_host=CAMARAS_TAXA_HOST, rajada=1)
+
 # ========================================================================
 # Câmaras Municipais com agendas culturais conhecidas
 # Formato: (nome, url_agenda, seletores CSS, lat, lon)
@@ -90,34 +111,59 @@ CAMARAS = [
 ]
 
 
-# Cache de geocoding
-_GEO_CACHE: dict = {}
-_GEO_FAILED: set = set()
-
-
-def geocode_local(local: str, fallback_lat: float, fallback_lon: float):
-    """Geocode com cache e fallback."""
-    if not local:
-        return fallback_lat, fallback_lon
-
-    cache_key = local.strip().lower()
-    if cache_key in _GEO_CACHE:
-        return _GEO_CACHE[cache_key]
-    if cache_key in _GEO_FAILED:
-        return fallback_lat, fallback_lon
-
+def _nominatim_local(local: str):
+    """Consultas ao Nominatim para um local (corre na fila de geocoding) → (lat, lon) ou None."""
     for q in [f"{local.strip()}, Portugal", local.strip()]:
         try:
-            time.sleep(1.1)
+            nominatim.esperar()
             loc = geolocator.geocode(q, timeout=10)
             if loc:
-                _GEO_CACHE[cache_key] = (loc.latitude, loc.longitude)
+                geo_store.guardar(local, loc.latitude, loc.longitude, query=q)
                 return loc.latitude, loc.longitude
         except Exception as e:
             print(f"  ⚠️ Geocoding erro: {e}")
 
-    _GEO_FAILED.add(cache_key)
-    return fallback_lat, fallback_lon
+    geo_store.falhou(local)
+    return _no_gazetteer(local)
+
+
+def _no_gazetteer(local: str):
+    """Fallback depois de o Nominatim falhar: cidade/freguesia no texto do local → (lat, lon) ou None."""
+    lugar = gazetteer.no_texto(local)
+    return (lugar["lat"], lugar["lon"]) if lugar else None
+
+
+def pedir_geocoding(local: str):
+    """Põe um local desconhecido na fila de geocoding (sem esperar); None se já se sabe a resposta."""
+    if not local:
+        return None
+    pendente = fila_geo.pedido(normalizar(local))
+    if pendente is not None or geo_store.obter(local) is not None or gazetteer.procurar(local):
+        return pendente
+    return fila_geo.pedir(normalizar(local), _nominatim_local, local)
+
+
+def geocode_local(local: str, fallback_lat: float, fallback_lon: float):
+    """Geocode com cache partilhada (geo_store) e fallback."""
+    if not local:
+        return fallback_lat, fallback_lon
+
+    # Já pedido durante o scrape (pedir_geocoding): só espera pela fila
+    pendente = fila_geo.pedido(normalizar(local))
+    if pendente is None:
+        c = geo_store.obter(local)
+        if c:
+            return c["lat"], c["lon"]
+        # Gazetteer offline só quando o local é o nome de uma localidade; um
+        # local com morada ("Praça X, Évora") vai ao Nominatim, que o situa melhor
+        lugar = gazetteer.procurar(local)
+        if lugar:
+            return lugar["lat"], lugar["lon"]
+        if c is False:
+            return _no_gazetteer(local) or (fallback_lat, fallback_lon)
+        pendente = fila_geo.pedir(normalizar(local), _nominatim_local, local)
+
+    return pendente.result() or (fallback_lat, fallback_lon)
 
 
 def classify_event_groq(title: str, description: str = "") -> str:
@@ -141,7 +187,7 @@ Título: {title}
 Responde APENAS com o nome da categoria."""
 
     try:
-        resp = requests.post(
+        resp = http.post(
             "https://api.groq.com/openai/v1/chat/completions",
             headers={"Authorization": f"Bearer {GROQ_API_KEY}", "Content-Type": "application/json"},
             json={
@@ -170,16 +216,15 @@ def make_event_id(nome: str, data: str, local: str) -> str:
 
 
 def fetch_page(url: str) -> Optional[BeautifulSoup]:
-    """Fetch page with retries."""
+    """Fetch page with retries (cada tentativa espera pela vez do host)."""
     for attempt in range(3):
         try:
-            resp = requests.get(url, headers=HEADERS, timeout=20)
+            resp = _motor.fetch(url)
             if resp.status_code == 200:
-                return BeautifulSoup(resp.text, "html.parser")
+                return make_soup(resp.text)
             print(f"  ⚠️ HTTP {resp.status_code} para {url}")
         except Exception as e:
             print(f"  ⚠️ Erro fetch (tentativa {attempt+1}): {e}")
-            time.sleep(2)
     return None
 
 
@@ -583,11 +628,22 @@ def scrape_generic_agenda(camara: dict) -> list:
     return events
 
 
+def _e_evento_camara(linha: dict) -> bool:
+    """Linhas da base que vieram deste scraper (âmbito para os apagados do sync)."""
+    return (linha.get("descricao") or "").startswith("Evento publicado por")
+
+
 def upsert_eventos(events: list):
-    """Insere ou atualiza eventos no Supabase."""
-    inserted = 0
+    """Insere ou atualiza eventos no Supabase (em lotes, ver batch_writer).
+
+    Só os eventos novos ou alterados são classificados no Groq: um evento
+    igual ao que está na base fica com o tipo que já lá tem.
+    """
     skipped = 0
     errors = 0
+    records = []
+    classificados = 0
+    sync = Sincronizador(supabase, ambito=_e_evento_camara, rotulo="câmaras", max_erros_log=0)
 
     for ev in events:
         try:
@@ -596,16 +652,9 @@ def upsert_eventos(events: list):
             if ev["local"] and ev["local"] != ev.get("descricao_fonte", ""):
                 lat, lon = geocode_local(ev["local"], ev["lat"], ev["lon"])
 
-            # Classificar — usar hint de categoria se disponível
-            categoria_hint = ev.get("categoria_hint", "")
-            if categoria_hint:
-                tipo = categoria_hint
-            else:
-                tipo = classify_event_groq(ev["nome"])
-
             record = {
                 "nome": ev["nome"],
-                "tipo": tipo,
+                "tipo": ev.get("categoria_hint", ""),
                 "categoria": "Cultura",
                 "escalao": "",
                 "equipa_casa": "",
@@ -625,23 +674,40 @@ def upsert_eventos(events: list):
                 "url_maps": "",
             }
 
-            result = supabase.table("eventos").upsert(
-                record, on_conflict="nome,data"
-            ).execute()
-
-            if result.data:
-                inserted += 1
-            else:
-                skipped += 1
-
+            # Classificar — usar hint de categoria se disponível; sem hint, o
+            # tipo da base se o resto do evento não mudou, senão o Groq
+            if not record["tipo"]:
+                linha = sync.na_base((record["nome"], record["data"]))
+                campos = [c for c in record if c != "tipo"]
+                if linha and linha.get("tipo") and hash_conteudo(record, campos) == hash_conteudo(linha, campos):
+                    record["tipo"] = linha["tipo"]
+                else:
+                    record["tipo"] = classify_event_groq(ev["nome"])
+                    classificados += 1
+            records.append(record)
         except Exception as e:
             errors += 1
-            if "duplicate" in str(e).lower() or "unique" in str(e).lower():
-                skipped += 1
-            else:
-                print(f"  ❌ Erro a inserir '{ev['nome']}': {e}")
+            print(f"  ❌ Erro a preparar '{ev.get('nome', '?')}': {e}")
 
-    return inserted, skipped, errors
+    sync.enviar(records)
+    escrita = sync.fechar()
+    alteracoes = sync.alteracoes if sync.por_diferencas else None
+    print(f"  🏷️ {classificados} eventos classificados (os restantes com hint ou já na base)")
+    print(f"  📦 {escrita.resumo()}")
+
+    # Iguais ao que já está na base e repetidos (nome+data) no próprio lote contam como duplicados
+    if alteracoes:
+        skipped += alteracoes.fundidos + alteracoes.iguais
+    else:
+        skipped += escrita.fundidos
+    for record, e in escrita.falhados:
+        errors += 1
+        if "duplicate" in str(e).lower() or "unique" in str(e).lower():
+            skipped += 1
+        else:
+            print(f"  ❌ Erro a inserir '{record['nome']}': {e}")
+
+    return escrita.guardados, skipped, errors
 
 
 def main():
@@ -652,28 +718,40 @@ def main():
 
     all_events = []
 
-    for camara in CAMARAS:
+    def _scrape_camara(camara: dict) -> list:
         try:
             if camara["tipo"] == "agendalx":
-                events = scrape_agendalx()
+                return scrape_agendalx()
             elif camara["tipo"] == "faro":
-                events = scrape_faro()
+                return scrape_faro()
             elif camara["tipo"] == "evora":
-                events = scrape_evora()
-            else:
-                events = scrape_generic_agenda(camara)
-            all_events.extend(events)
-            time.sleep(2)  # Ser gentil com os servidores
+                return scrape_evora()
+            return scrape_generic_agenda(camara)
         except Exception as e:
             print(f"  ❌ Erro fatal {camara['nome']}: {e}")
+            return []
+
+    # Todas as câmaras em paralelo; os eventos juntam-se pela ordem de CAMARAS.
+    # Os locais novos seguem logo para a fila de geocoding, que trabalha ao
+    # ritmo do Nominatim enquanto as outras câmaras ainda estão a ser raspadas
+    for events in mapa_ordenado(_scrape_camara, CAMARAS, workers=CAMARAS_CONCORRENCIA):
+        all_events.extend(events)
+        for ev in events:
+            if ev["local"] and ev["local"] != ev.get("descricao_fonte", ""):
+                pedir_geocoding(ev["local"])
+    _motor.close()
 
-    print(f"\n📊 Total eventos encontrados: {len(all_events)}")
+    print(f"\n📊 Total eventos encontrados: {len(all_events)} ({_motor.resumo()})")
 
     if all_events:
         inserted, skipped, errors = upsert_eventos(all_events)
         print(f"  ✅ Inseridos: {inserted}")
         print(f"  ⏭️ Duplicados: {skipped}")
         print(f"  ❌ Erros: {errors}")
+        print(f"  🗺️ Geocoding: {geo_store.resumo()}; {gazetteer.resumo()}; "
+              f"{fila_geo.resumo()}, {nominatim.pedidos} pedidos ao Nominatim")
+    fila_geo.close()
+    print(f"  🔌 Ligações HTTP: {http.estatisticas.resumo()}")
 
     elapsed = time.time() - start
     print(f"\n⏱️ Tempo total: {elapsed:.1f}s")
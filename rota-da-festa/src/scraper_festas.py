@@ -10,14 +10,18 @@ Corre diariamente na GitHub Action após o scraper_mestre.py.
 
 import os
 import re
-import time
 import json
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
 from supabase import create_client, Client
 from dotenv import load_dotenv
 from geopy.geocoders import Nominatim
 from curl_cffi import requests as cf_requests
+from html_backend import make_soup
+from fetch_engine import FetchEngine, mapa_ordenado
+from geo_store import GeoStore, normalizar
+from geo_queue import FilaGeocoding, LimiteNominatim
+from gazetteer import Gazetteer
+from sync_eventos import sincronizar
 
 # Carregar envs
 load_dotenv()
@@ -35,6 +39,16 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 geolocator = Nominatim(user_agent="rota_da_festa_festas_v1")
+geo_store = GeoStore(origem="festas")
+nominatim = LimiteNominatim()
+fila_geo = FilaGeocoding()
+gazetteer = Gazetteer()
+
+# Regiões do Eventbrite em paralelo (todas no mesmo host: o limite real é
+# EVENTBRITE_TAXA pedidos/s) e páginas de resultados seguidas por região
+EVENTBRITE_CONCORRENCIA = int(os.environ.get("EVENTBRITE_CONCORRENCIA", "4"))
+EVENTBRITE_TAXA = float(os.environ.get("EVENTBRITE_TAXA", "2"))
+EVENTBRITE_PAGINAS = int(os.environ.get("EVENTBRITE_PAGINAS", "3"))
 
 # ========================================================================
 # Cidades/regiões para pesquisar no Eventbrite
@@ -76,27 +90,8 @@ CATEGORIAS_FESTAS = {
     "business": "Cultura",
 }
 
-# Cache de geocoding para locais de festas
-_GEO_CACHE: dict = {}
-_GEO_FAILED: set = set()
-
-
-def geocode_local(local: str, fallback_lat: float = None, fallback_lon: float = None):
-    """Geocode um local com cache e fallback."""
-    if not local:
-        return fallback_lat, fallback_lon, local or "Local TBD"
-
-    local_clean = local.strip()
-    cache_key = local_clean.lower()
-
-    if cache_key in _GEO_CACHE:
-        c = _GEO_CACHE[cache_key]
-        return c["lat"], c["lon"], c["local"]
-
-    if cache_key in _GEO_FAILED:
-        return fallback_lat, fallback_lon, local_clean
-
-    # Tentar geocoding
+def _nominatim_local(local_clean: str):
+    """Consultas ao Nominatim para um local (corre na fila de geocoding) → (lat, lon) ou None."""
     queries = [
         f"{local_clean}, Portugal",
         local_clean,
@@ -104,20 +99,72 @@ def geocode_local(local: str, fallback_lat: float = None, fallback_lon: float =
 
     for q in queries:
         try:
-            time.sleep(1.1)
+            nominatim.esperar()
             location = geolocator.geocode(q, timeout=10)
             if location:
-                _GEO_CACHE[cache_key] = {
-                    "lat": location.latitude,
-                    "lon": location.longitude,
-                    "local": local_clean,
-                }
-                return location.latitude, location.longitude, local_clean
+                geo_store.guardar(local_clean, location.latitude, location.longitude,
+                                  local_clean, query=q)
+                return location.latitude, location.longitude
         except Exception as e:
             print(f"  ⚠️ Geocoding erro para '{q}': {e}")
 
-    _GEO_FAILED.add(cache_key)
-    return fallback_lat, fallback_lon, local_clean
+    geo_store.falhou(local_clean)
+    return _no_gazetteer(local_clean)
+
+
+def _no_gazetteer(local_clean: str):
+    """Fallback depois de o Nominatim falhar: cidade/freguesia no texto do local → (lat, lon) ou None."""
+    lugar = gazetteer.no_texto(local_clean)
+    return (lugar["lat"], lugar["lon"]) if lugar else None
+
+
+def geocode_local(local: str, fallback_lat: float = None, fallback_lon: float = None):
+    """Geocode um local com cache partilhada (geo_store) e fallback.
+
+    Devolve (lat, lon, local, pendente). Um local desconhecido vai para a fila
+    de geocoding e sai já com o fallback (centro da região); `pendente` é o
+    Future dessa consulta, para corrigir o evento quando a coordenada chegar.
+    """
+    if not local:
+        return fallback_lat, fallback_lon, local or "Local TBD", None
+
+    local_clean = local.strip()
+    chave = normalizar(local_clean)
+
+    pendente = fila_geo.pedido(chave)
+    if pendente is None:
+        c = geo_store.obter(local_clean)
+        if c:
+            return c["lat"], c["lon"], c["local"], None
+        # Gazetteer offline só quando o local é o nome de uma localidade; um
+        # local com morada ("Praça X, Évora") vai ao Nominatim, que o situa melhor
+        lugar = gazetteer.procurar(local_clean)
+        if lugar:
+            return lugar["lat"], lugar["lon"], local_clean, None
+        if c is False:
+            lat, lon = _no_gazetteer(local_clean) or (fallback_lat, fallback_lon)
+            return lat, lon, local_clean, None
+        pendente = fila_geo.pedir(chave, _nominatim_local, local_clean)
+
+    resultado = pendente.result() if pendente.done() else None
+    if resultado:
+        return resultado[0], resultado[1], local_clean, None
+    return fallback_lat, fallback_lon, local_clean, pendente
+
+
+def corrigir_provisorios(eventos: list) -> int:
+    """Substitui as coordenadas provisórias pelas da fila de geocoding; devolve quantos mudaram."""
+    fila_geo.esperar()
+    corrigidos = 0
+    for ev in eventos:
+        pendente = ev.pop("_geo_pendente", None)
+        resultado = pendente.result() if pendente else None
+        if resultado:
+            lat, lon = resultado
+            ev["latitude"], ev["longitude"] = lat, lon
+            ev["url_maps"] = f"https://www.google.com/maps/search/?api=1&query={lat},{lon}"
+            corrigidos += 1
+    return corrigidos
 
 
 def classify_event_groq(nome: str, descricao: str = "") -> str:
@@ -207,213 +254,244 @@ def parse_eventbrite_date(date_str: str) -> tuple:
     return None, None
 
 
-def scrape_eventbrite(session: cf_requests.Session, region_slug: str, region_name: str, fallback_lat: float, fallback_lon: float) -> list:
-    """Scrape eventos do Eventbrite para uma região."""
-    url = f"https://www.eventbrite.pt/d/{region_slug}/events/"
+def _eventos_da_pagina(soup, region_name: str, fallback_lat: float, fallback_lon: float) -> list:
+    """Eventos de uma página de resultados do Eventbrite (JSON-LD, ou cards HTML como fallback)."""
     eventos = []
 
-    try:
-        print(f"\n🌐 Eventbrite: {region_name} ({url})")
-        resp = session.get(url, timeout=30)
-        if resp.status_code != 200:
-            print(f"  ⚠️ HTTP {resp.status_code} para {url}")
-            return eventos
-
-        html = resp.text
-        soup = BeautifulSoup(html, "html.parser")
+    # Eventbrite usa JSON-LD structured data
+    scripts = soup.find_all("script", type="application/ld+json")
+    for script in scripts:
+        try:
+            data = json.loads(script.string)
+
+            # Normalizar: extrair eventos de diferentes estruturas JSON-LD
+            events_raw = []
+            if isinstance(data, list):
+                events_raw = data
+            elif isinstance(data, dict):
+                if data.get("@type") == "Event":
+                    events_raw = [data]
+                elif "itemListElement" in data:
+                    # Eventbrite usa ItemList → ListItem → item (Event)
+                    for list_item in data["itemListElement"]:
+                        inner = list_item.get("item", list_item)
+                        events_raw.append(inner)
+                else:
+                    events_raw = [data]
 
-        # Eventbrite usa JSON-LD structured data
-        scripts = soup.find_all("script", type="application/ld+json")
-        for script in scripts:
-            try:
-                data = json.loads(script.string)
-
-                # Normalizar: extrair eventos de diferentes estruturas JSON-LD
-                events_raw = []
-                if isinstance(data, list):
-                    events_raw = data
-                elif isinstance(data, dict):
-                    if data.get("@type") == "Event":
-                        events_raw = [data]
-                    elif "itemListElement" in data:
-                        # Eventbrite usa ItemList → ListItem → item (Event)
-                        for list_item in data["itemListElement"]:
-                            inner = list_item.get("item", list_item)
-                            events_raw.append(inner)
-                    else:
-                        events_raw = [data]
+            for item in events_raw:
+                if item.get("@type") != "Event":
+                    continue
 
-                for item in events_raw:
-                    if item.get("@type") != "Event":
-                        continue
+                nome = item.get("name", "").strip()
+                if not nome:
+                    continue
 
-                    nome = item.get("name", "").strip()
-                    if not nome:
-                        continue
+                # Data
+                start_date = item.get("startDate", "")
+                data_str = start_date[:10] if start_date else None
+                hora = start_date[11:16] if len(start_date) > 16 else None
 
-                    # Data
-                    start_date = item.get("startDate", "")
-                    data_str = start_date[:10] if start_date else None
-                    hora = start_date[11:16] if len(start_date) > 16 else None
+                if not data_str:
+                    continue
 
-                    if not data_str:
+                # Filtrar: só eventos nos próximos 30 dias
+                try:
+                    event_date = datetime.strptime(data_str, "%Y-%m-%d")
+                    if event_date < datetime.now() - timedelta(days=1):
                         continue
-
-                    # Filtrar: só eventos nos próximos 30 dias
-                    try:
-                        event_date = datetime.strptime(data_str, "%Y-%m-%d")
-                        if event_date < datetime.now() - timedelta(days=1):
-                            continue
-                        if event_date > datetime.now() + timedelta(days=30):
-                            continue
-                    except ValueError:
+                    if event_date > datetime.now() + timedelta(days=30):
                         continue
+                except ValueError:
+                    continue
 
-                    # Local
-                    location = item.get("location", {})
-                    local_name = location.get("name", "")
-                    address = location.get("address", {})
-                    if isinstance(address, dict):
-                        street = address.get("streetAddress", "")
-                        city = address.get("addressLocality", region_name)
-                        local_full = f"{local_name}, {city}" if local_name else city
-                    else:
-                        local_full = local_name or region_name
-                        city = region_name
-
-                    # Coordenadas do JSON-LD
-                    geo = location.get("geo", {})
-                    lat = geo.get("latitude")
-                    lon = geo.get("longitude")
-
-                    if not lat or not lon:
-                        lat, lon, _ = geocode_local(local_full, fallback_lat, fallback_lon)
-
-                    # Preço
-                    offers = item.get("offers", {})
-                    if isinstance(offers, list) and offers:
-                        price = offers[0].get("price", "")
-                        currency = offers[0].get("priceCurrency", "EUR")
-                    elif isinstance(offers, dict):
-                        price = offers.get("price", "")
-                        currency = offers.get("priceCurrency", "EUR")
+                # Local
+                location = item.get("location", {})
+                local_name = location.get("name", "")
+                address = location.get("address", {})
+                if isinstance(address, dict):
+                    street = address.get("streetAddress", "")
+                    city = address.get("addressLocality", region_name)
+                    local_full = f"{local_name}, {city}" if local_name else city
+                else:
+                    local_full = local_name or region_name
+                    city = region_name
+
+                # Coordenadas do JSON-LD
+                geo = location.get("geo", {})
+                lat = geo.get("latitude")
+                lon = geo.get("longitude")
+
+                pendente = None
+                if not lat or not lon:
+                    lat, lon, _, pendente = geocode_local(local_full, fallback_lat, fallback_lon)
+
+                # Preço
+                offers = item.get("offers", {})
+                if isinstance(offers, list) and offers:
+                    price = offers[0].get("price", "")
+                    currency = offers[0].get("priceCurrency", "EUR")
+                elif isinstance(offers, dict):
+                    price = offers.get("price", "")
+                    currency = offers.get("priceCurrency", "EUR")
+                else:
+                    price = ""
+                    currency = "EUR"
+
+                try:
+                    price_val = float(price) if price else None
+                    if price_val is not None and price_val == 0:
+                        preco = "Grátis"
+                    elif price_val is not None:
+                        preco = f"{price_val}€"
                     else:
-                        price = ""
-                        currency = "EUR"
-
-                    try:
-                        price_val = float(price) if price else None
-                        if price_val is not None and price_val == 0:
-                            preco = "Grátis"
-                        elif price_val is not None:
-                            preco = f"{price_val}€"
-                        else:
-                            preco = "Variável"
-                    except (ValueError, TypeError):
                         preco = "Variável"
+                except (ValueError, TypeError):
+                    preco = "Variável"
+
+                # URL
+                url_evento = item.get("url", "")
+
+                # Descrição
+                descricao = item.get("description", "")[:200] if item.get("description") else ""
+
+                # Classificação
+                tipo = classify_event_groq(nome, descricao)
+
+                evento = {
+                    "nome": nome,
+                    "tipo": tipo,
+                    "categoria": tipo,
+                    "escalao": "",
+                    "equipa_casa": "",
+                    "equipa_fora": "",
+                    "data": data_str,
+                    "hora": hora or None,
+                    "local": local_full,
+                    "latitude": float(lat) if lat else None,
+                    "longitude": float(lon) if lon else None,
+                    "preco": preco,
+                    "descricao": f"📍 {local_full} | {descricao}" if descricao else f"📍 {local_full}",
+                    "url_jogo": url_evento,
+                    "url_equipa_casa": "",
+                    "url_equipa_fora": "",
+                    "url_classificacao": "",
+                    "url_maps": f"https://www.google.com/maps/search/?api=1&query={lat},{lon}" if lat and lon else "",
+                    "status": "aprovado",
+                }
+                if pendente:
+                    evento["_geo_pendente"] = pendente
 
-                    # URL
-                    url_evento = item.get("url", "")
-
-                    # Descrição
-                    descricao = item.get("description", "")[:200] if item.get("description") else ""
-
-                    # Classificação
-                    tipo = classify_event_groq(nome, descricao)
-
-                    evento = {
-                        "nome": nome,
-                        "tipo": tipo,
-                        "categoria": tipo,
-                        "escalao": "",
-                        "equipa_casa": "",
-                        "equipa_fora": "",
-                        "data": data_str,
-                        "hora": hora or None,
-                        "local": local_full,
-                        "latitude": float(lat) if lat else None,
-                        "longitude": float(lon) if lon else None,
-                        "preco": preco,
-                        "descricao": f"📍 {local_full} | {descricao}" if descricao else f"📍 {local_full}",
-                        "url_jogo": url_evento,
-                        "url_equipa_casa": "",
-                        "url_equipa_fora": "",
-                        "url_classificacao": "",
-                        "url_maps": f"https://www.google.com/maps/search/?api=1&query={lat},{lon}" if lat and lon else "",
-                        "status": "aprovado",
-                    }
-
-                    eventos.append(evento)
-
-            except (json.JSONDecodeError, KeyError, TypeError):
-                continue
+                eventos.append(evento)
 
-        # Fallback: parse HTML cards if no JSON-LD found
-        if not eventos:
-            cards = soup.select("a[data-testid='event-card-link'], section.discover-search-desktop-card a")
-            for card in cards[:20]:
+        except (json.JSONDecodeError, KeyError, TypeError):
+            continue
+
+    # Fallback: parse HTML cards if no JSON-LD found
+    if not eventos:
+        cards = soup.select("a[data-testid='event-card-link'], section.discover-search-desktop-card a")
+        for card in cards[:20]:
+            try:
+                title_el = card.select_one("h3, [data-testid='event-card-title']")
+                if not title_el:
+                    continue
+                nome = title_el.get_text(strip=True)
+                if not nome:
+                    continue
+
+                # Data do card
+                date_el = card.select_one("p[data-testid='event-card-date'], time")
+                date_text = date_el.get_text(strip=True) if date_el else ""
+                data_str, hora = parse_eventbrite_date(date_text)
+
+                if not data_str:
+                    continue
+
+                # Filtrar: só eventos nos próximos 30 dias
                 try:
-                    title_el = card.select_one("h3, [data-testid='event-card-title']")
-                    if not title_el:
+                    event_date = datetime.strptime(data_str, "%Y-%m-%d")
+                    if event_date < datetime.now() - timedelta(days=1):
                         continue
-                    nome = title_el.get_text(strip=True)
-                    if not nome:
+                    if event_date > datetime.now() + timedelta(days=30):
                         continue
+                except ValueError:
+                    continue
 
-                    # Data do card
-                    date_el = card.select_one("p[data-testid='event-card-date'], time")
-                    date_text = date_el.get_text(strip=True) if date_el else ""
-                    data_str, hora = parse_eventbrite_date(date_text)
+                # Local do card
+                venue_el = card.select_one("p[data-testid='event-card-venue'], .event-card__clamp-line--one")
+                local_text = venue_el.get_text(strip=True) if venue_el else region_name
+
+                lat, lon, local_clean, pendente = geocode_local(local_text, fallback_lat, fallback_lon)
+                tipo = classify_event_groq(nome)
+                url_evento = card.get("href", "")
+                if url_evento and not url_evento.startswith("http"):
+                    url_evento = f"https://www.eventbrite.pt{url_evento}"
+
+                evento = {
+                    "nome": nome,
+                    "tipo": tipo,
+                    "categoria": tipo,
+                    "escalao": "",
+                    "equipa_casa": "",
+                    "equipa_fora": "",
+                    "data": data_str,
+                    "hora": hora or None,
+                    "local": local_clean,
+                    "latitude": float(lat) if lat else None,
+                    "longitude": float(lon) if lon else None,
+                    "preco": "Variável",
+                    "descricao": f"📍 {local_clean}",
+                    "url_jogo": url_evento,
+                    "url_equipa_casa": "",
+                    "url_equipa_fora": "",
+                    "url_classificacao": "",
+                    "url_maps": f"https://www.google.com/maps/search/?api=1&query={lat},{lon}" if lat and lon else "",
+                    "status": "aprovado",
+                }
+                if pendente:
+                    evento["_geo_pendente"] = pendente
+                eventos.append(evento)
+            except Exception:
+                continue
 
-                    if not data_str:
-                        continue
+    return eventos
 
-                    # Filtrar: só eventos nos próximos 30 dias
-                    try:
-                        event_date = datetime.strptime(data_str, "%Y-%m-%d")
-                        if event_date < datetime.now() - timedelta(days=1):
-                            continue
-                        if event_date > datetime.now() + timedelta(days=30):
-                            continue
-                    except ValueError:
-                        continue
 
-                    # Local do card
-                    venue_el = card.select_one("p[data-testid='event-card-venue'], .event-card__clamp-line--one")
-                    local_text = venue_el.get_text(strip=True) if venue_el else region_name
-
-                    lat, lon, local_clean = geocode_local(local_text, fallback_lat, fallback_lon)
-                    tipo = classify_event_groq(nome)
-                    url_evento = card.get("href", "")
-                    if url_evento and not url_evento.startswith("http"):
-                        url_evento = f"https://www.eventbrite.pt{url_evento}"
-
-                    evento = {
-                        "nome": nome,
-                        "tipo": tipo,
-                        "categoria": tipo,
-                        "escalao": "",
-                        "equipa_casa": "",
-                        "equipa_fora": "",
-                        "data": data_str,
-                        "hora": hora or None,
-                        "local": local_clean,
-                        "latitude": float(lat) if lat else None,
-                        "longitude": float(lon) if lon else None,
-                        "preco": "Variável",
-                        "descricao": f"📍 {local_clean}",
-                        "url_jogo": url_evento,
-                        "url_equipa_casa": "",
-                        "url_equipa_fora": "",
-                        "url_classificacao": "",
-                        "url_maps": f"https://www.google.com/maps/search/?api=1&query={lat},{lon}" if lat and lon else "",
-                        "status": "aprovado",
-                    }
-                    eventos.append(evento)
-                except Exception:
-                    continue
+def scrape_eventbrite(session: cf_requests.Session, region_slug: str, region_name: str, fallback_lat: float, fallback_lon: float,
+                      engine: FetchEngine = None, max_paginas: int = None) -> list:
+    """Scrape eventos do Eventbrite para uma região, seguindo a paginação (?page=N).
+
+    Pára em `max_paginas` (EVENTBRITE_PAGINAS), numa página sem eventos novos
+    ou num erro HTTP. Com `engine`, os pedidos passam pelos limites por host
+    do motor de fetch (várias regiões em paralelo na mesma sessão).
+    """
+    url = f"https://www.eventbrite.pt/d/{region_slug}/events/"
+    max_paginas = max_paginas or EVENTBRITE_PAGINAS
+    eventos = []
+    vistos = set()
+    paginas = 0
 
-        print(f"  ✅ {region_name}: {len(eventos)} eventos encontrados")
+    try:
+        print(f"\n🌐 Eventbrite: {region_name} ({url})")
+        for pagina in range(1, max_paginas + 1):
+            url_pagina = url if pagina == 1 else f"{url}?page={pagina}"
+            resp = engine.fetch(url_pagina) if engine else session.get(url_pagina, timeout=30)
+            if resp.status_code != 200:
+                print(f"  ⚠️ HTTP {resp.status_code} para {url_pagina}")
+                break
+            paginas += 1
+
+            novos = []
+            for ev in _eventos_da_pagina(make_soup(resp.text), region_name, fallback_lat, fallback_lon):
+                chave = (ev["nome"], ev["data"], ev["url_jogo"])
+                if chave not in vistos:
+                    vistos.add(chave)
+                    novos.append(ev)
+            if not novos:
+                break
+            eventos.extend(novos)
+
+        print(f"  ✅ {region_name}: {len(eventos)} eventos encontrados ({paginas} páginas)")
 
     except Exception as e:
         print(f"  ❌ Erro em {region_name}: {e}")
@@ -421,6 +499,11 @@ def scrape_eventbrite(session: cf_requests.Session, region_slug: str, region_nam
     return eventos
 
 
+def _e_evento_eventbrite(linha: dict) -> bool:
+    """Linhas da base que vieram deste scraper (âmbito para os apagados do sync)."""
+    return "eventbrite." in (linha.get("url_jogo") or "")
+
+
 def deduplicate_events(eventos: list) -> list:
     """Remove duplicados por (nome normalizado, data)."""
     seen = set()
@@ -454,16 +537,32 @@ def main():
     })
 
     # === FONTE 1: Eventbrite Portugal ===
-    print("\n🎫 FONTE: Eventbrite Portugal")
-    for slug, name, lat, lon in EVENTBRITE_SEARCHES:
+    # Regiões em paralelo na mesma sessão; os pedidos respeitam os limites por host do motor
+    print(f"\n🎫 FONTE: Eventbrite Portugal ({EVENTBRITE_CONCORRENCIA} regiões em paralelo, "
+          f"até {EVENTBRITE_PAGINAS} páginas por região)")
+    engine = FetchEngine(lambda url: session.get(url, timeout=30), max_workers=1,
+                         por_host=EVENTBRITE_CONCORRENCIA, taxa_por_host=EVENTBRITE_TAXA)
+
+    def _regiao(pesquisa) -> list:
+        slug, name, lat, lon = pesquisa
         try:
-            eventos = scrape_eventbrite(session, slug, name, lat, lon)
-            todos_eventos.extend(eventos)
-            time.sleep(1)
+            return scrape_eventbrite(session, slug, name, lat, lon, engine=engine)
         except Exception as e:
             print(f"  ❌ Falha total em {name}: {e}")
+            return []
 
+    for eventos in mapa_ordenado(_regiao, EVENTBRITE_SEARCHES, workers=EVENTBRITE_CONCORRENCIA):
+        todos_eventos.extend(eventos)
+
+    engine.close()
     session.close()
+    print(f"⚡ Eventbrite: {engine.resumo()}")
+
+    # Coordenadas provisórias (centro da região) → as do Nominatim
+    corrigidos = corrigir_provisorios(todos_eventos)
+    if corrigidos:
+        print(f"📍 {corrigidos} eventos com coordenadas corrigidas pela fila de geocoding")
+    fila_geo.close()
 
     # Deduplicar
     todos_eventos = deduplicate_events(todos_eventos)
@@ -475,6 +574,8 @@ def main():
         print(f"\n⚠️ {sem_geo} eventos descartados (sem geolocalização)")
 
     todos_eventos = com_geo
+    print(f"🗺️ Geocoding: {geo_store.resumo()}; {gazetteer.resumo()}; "
+          f"{fila_geo.resumo()}, {nominatim.pedidos} pedidos ao Nominatim")
 
     if not todos_eventos:
         print("\n⚠️ Nenhum evento de cultura/festas encontrado.")
@@ -482,18 +583,9 @@ def main():
 
     # Guardar no Supabase (upsert por nome+data)
     print(f"\n📦 A guardar {len(todos_eventos)} eventos culturais no Supabase...")
-    guardados = 0
-    erros = 0
-    for ev in todos_eventos:
-        try:
-            supabase.table("eventos").upsert(ev, on_conflict="nome,data").execute()
-            guardados += 1
-        except Exception as e:
-            erros += 1
-            if erros <= 5:
-                print(f"  Erro DB: {e}")
+    _, escrita = sincronizar(supabase, todos_eventos, ambito=_e_evento_eventbrite, rotulo="festas")
 
-    print(f"\n🏁 Festas scraper feito. {guardados}/{len(todos_eventos)} eventos guardados ({erros} erros).")
+    print(f"\n🏁 Festas scraper feito. {escrita.resumo()}")
 
 
 if __name__ == "__main__":
@@ -2,13 +2,30 @@ import os
 import re
 import time
 import json
+import hashlib
+import threading
+import argparse
 from datetime import datetime, timedelta
-from bs4 import BeautifulSoup
+from functools import lru_cache
+from bs4 import BeautifulSoup, Tag
 from supabase import create_client, Client
 from dotenv import load_dotenv
 from geopy.geocoders import Nominatim
 import requests as std_requests
 from curl_cffi import requests as cf_requests
+from fetch_engine import FetchEngine, TaxaAdaptativa, mapa_ordenado, em_fundo
+from http_cache import HttpCache
+from html_backend import make_soup
+from team_index import IndiceEquipas
+from keyword_matcher import MatcherPalavras
+from geo_store import GeoStore, normalizar
+from geo_queue import FilaGeocoding, LimiteNominatim
+from gazetteer import Gazetteer
+from flaresolverr_pool import PoolFlareSolverr
+from cf_clearance import GestorClearance
+from checkpoint import Checkpoint
+from sync_eventos import Sincronizador, carregar_futuros
+from batch_writer import upsert_em_lotes, atualizar_por_ids, em_lotes
 
 # Carregar envs
 load_dotenv()
@@ -25,11 +42,57 @@ if not SUPABASE_URL or not SUPABASE_KEY:
 
 supabase: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
 geolocator = Nominatim(user_agent="rota_da_festa_bot_v5")
+geo_store = GeoStore(origem="mestre")
+nominatim = LimiteNominatim()
+fila_geo = FilaGeocoding()
+gazetteer = Gazetteer()
 
 # FlareSolverr — bypass CF em IPs datacenter (GitHub Actions)
 FLARESOLVERR_URL = os.environ.get("FLARESOLVERR_URL", "http://localhost:8191/v1")
 _fs_mode = False
-_fs_session_id = None
+_fs_pool = None  # PoolFlareSolverr da Estratégia 3
+# Sessões FlareSolverr em paralelo na Estratégia 3 (cada uma é um Chrome)
+ZZ_FS_SESSOES = int(os.environ.get("ZZ_FS_SESSOES", "3"))
+_clearance = None  # GestorClearance da Estratégia 2
+# Minutos até renovar os cookies Cloudflare por antecipação (Estratégia 2)
+ZZ_CF_RENOVAR_MIN = float(os.environ.get("ZZ_CF_RENOVAR_MIN", "25"))
+
+# Concorrência do crawl ZeroZero: pedidos simultâneos, pedidos/s e competições em paralelo
+ZZ_CONCORRENCIA = int(os.environ.get("ZZ_CONCORRENCIA", "4"))
+ZZ_TAXA = float(os.environ.get("ZZ_TAXA", "3"))
+# Tecto da taxa adaptativa: sobe a partir de ZZ_TAXA enquanto as respostas vêm limpas
+ZZ_TAXA_MAX = float(os.environ.get("ZZ_TAXA_MAX", "8"))
+ZZ_COMPETICOES = int(os.environ.get("ZZ_COMPETICOES", "4"))
+
+# Pipeline em streaming: eventos por lote escrito na DB e eventos em espera entre scrape e escrita
+ZZ_LOTE = int(os.environ.get("ZZ_LOTE", "50"))
+ZZ_FILA = int(os.environ.get("ZZ_FILA", "200"))
+
+# Cache HTTP em disco (ZZ_CACHE=0 desliga) — TTL por classe de URL, o primeiro padrão ganha
+ZZ_CACHE_DIR = os.environ.get(
+    "ZZ_CACHE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", ".cache", "zerozero"),
+)
+ZZ_CACHE_TTLS = [
+    (r"/agenda", 2 * 3600),
+    (r"/proximos-jogos", 6 * 3600),
+    (r"/edicao/", 12 * 3600),
+    (r"/jogo/|/live-ao-minuto/", 3 * 24 * 3600),
+    (r"/competi", 24 * 3600),
+]
+http_cache = HttpCache(ZZ_CACHE_DIR, ZZ_CACHE_TTLS) if os.environ.get("ZZ_CACHE", "1") != "0" else None
+
+# Modo incremental: fingerprints por edição (edições inalteradas são saltadas até N dias)
+_EDICOES_FILE = os.path.join(os.path.dirname(os.path.abspath(ZZ_CACHE_DIR)), "edicoes_incremental.json")
+ZZ_INCREMENTAL_DIAS = int(os.environ.get("ZZ_INCREMENTAL_DIAS", "3"))
+
+# Checkpoint do crawl (--resume): agendas, edições e competições concluídas, com os jogos
+ZZ_CHECKPOINT = os.environ.get(
+    "ZZ_CHECKPOINT",
+    os.path.join(os.path.dirname(os.path.abspath(ZZ_CACHE_DIR)), "zerozero_checkpoint.jsonl"),
+)
+# Um checkpoint mais velho do que isto é ignorado (cobre a execução diária seguinte)
+ZZ_CHECKPOINT_HORAS = float(os.environ.get("ZZ_CHECKPOINT_HORAS", "30"))
 
 # ========================================================================
 # Cache de estádios — profissionais + semi-profissionais + distritais
@@ -201,13 +264,42 @@ def _load_cache():
 def _save_cache():
     """Guarda o cache completo num ficheiro JSON."""
     try:
+        with _estadios_lock:
+            dados = dict(CACHE_ESTADIOS)
         with open(_CACHE_FILE, "w", encoding="utf-8") as f:
-            json.dump(CACHE_ESTADIOS, f, ensure_ascii=False, indent=2)
+            json.dump(dados, f, ensure_ascii=False, indent=2)
         print(f"💾 Cache guardado: {len(CACHE_ESTADIOS)} estádios em {_CACHE_FILE}")
     except Exception as e:
         print(f"⚠️ Erro ao guardar cache: {e}")
 
 _load_cache()
+_INDICE_ESTADIOS = IndiceEquipas(CACHE_ESTADIOS)
+# A fila de geocoding acrescenta estádios de outra thread
+_estadios_lock = threading.Lock()
+
+
+def _load_edicoes() -> dict:
+    """Carrega os fingerprints das edições da última execução (modo incremental)."""
+    if os.path.exists(_EDICOES_FILE):
+        try:
+            with open(_EDICOES_FILE, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"⚠️ Erro ao carregar fingerprints de edições: {e}")
+    return {}
+
+
+def _save_edicoes(estado: dict):
+    """Guarda os fingerprints das edições para a próxima execução."""
+    try:
+        os.makedirs(os.path.dirname(_EDICOES_FILE), exist_ok=True)
+        with open(_EDICOES_FILE, "w", encoding="utf-8") as f:
+            json.dump(estado, f, ensure_ascii=False)
+        print(f"💾 Fingerprints guardados: {len(estado)} edições em {_EDICOES_FILE}")
+    except Exception as e:
+        print(f"⚠️ Erro ao guardar fingerprints de edições: {e}")
+
+
 DISTRICT_CENTROIDS = {
     "braga": {"lat": 41.5503, "lon": -8.4270, "local": "Braga (aproximado)"},
     "porto": {"lat": 41.1496, "lon": -8.6109, "local": "Porto (aproximado)"},
@@ -250,8 +342,23 @@ PORTUGUESE_COMP_KEYWORDS = [
     "liga regional", "campeonato regional",
 ]
 
+# Uma só alternância compilada; o backtracking do regex experimenta todas as
+# palavras em cada posição, como os re.search individuais por palavra-chave
+_RE_COMP_PT = re.compile(
+    r'(?:^|\b)(?:'
+    + "|".join(re.escape(kw) for kw in sorted(PORTUGUESE_COMP_KEYWORDS, key=len, reverse=True))
+    + r')(?:\b|$)'
+)
+
+
+@lru_cache(maxsize=4096)
+def _competicao_portuguesa(comp_text: str) -> bool:
+    return _RE_COMP_PT.search(comp_text.lower()) is not None
+
+
 # Nomes de equipas portuguesas (para detectar em competições internacionais)
 PORTUGUESE_TEAMS = list(CACHE_ESTADIOS.keys())
+_INDICE_PT = IndiceEquipas(PORTUGUESE_TEAMS)
 
 
 def _team_match(pt_name: str, team_name: str) -> bool:
@@ -272,60 +379,179 @@ def _extract_district(comp_text: str):
     return None
 
 
-# Equipas que já falharam todas as tentativas de geocoding
-_GEO_FAILED = set()
+# AFs cujo nome não é o do distrito no gazetteer
+_DISTRITO_DA_AF = {
+    "viana": "Viana do Castelo",
+    "funchal": "Madeira",
+    "ponta delgada": "Açores",
+    "angra do heroísmo": "Açores",
+    "horta": "Açores",
+}
+_RE_LOCALIDADE = re.compile(r'\b(?:de|da|do|dos|das)\s+(.+)', re.IGNORECASE)
 
 
-def geolocalizar_estadio(nome_equipa: str, comp_text: str = ""):
-    """Localiza o estádio de uma equipa com múltiplos fallbacks."""
-    # 1. Cache
-    for k, v in CACHE_ESTADIOS.items():
-        if _team_match(k, nome_equipa):
-            return v
-
-    # 2. Já falhou antes? Ir direto ao fallback distrito
-    if nome_equipa in _GEO_FAILED:
-        district_geo = _extract_district(comp_text)
-        return district_geo
-
-    # 3. Nominatim: melhor query única
+def _distrito_da_competicao(comp_text: str):
+    """Distrito da AF da competição (para desempatar homónimos no gazetteer), ou None."""
+    cl = comp_text.lower()
+    # O nome mais comprido primeiro: "af braga" também está em "af bragança"
+    for district in sorted(DISTRICT_CENTROIDS, key=len, reverse=True):
+        if f"af {district}" in cl:
+            return _DISTRITO_DA_AF.get(district, district)
+    return None
+
+
+def _estadio_no_gazetteer(nome_equipa: str, comp_text: str = ""):
+    """Gazetteer offline: a localidade do nome ("Águias de Alvite" → Alvite) ou o próprio nome."""
+    distrito = _distrito_da_competicao(comp_text)
+    m = _RE_LOCALIDADE.search(nome_equipa)
+    for nome in ([m.group(1).strip()] if m else []) + [nome_equipa]:
+        lugar = gazetteer.procurar(nome, distrito)
+        if lugar:
+            return {"lat": lugar["lat"], "lon": lugar["lon"], "local": f"Campo em {lugar['local']}"}
+    return None
+
+
+def _estadio_conhecido(nome_equipa: str, comp_text: str = ""):
+    """Passos sem rede: (geo, True) se a resposta já se sabe, (None, False) se é preciso o Nominatim."""
+    # 1. Cache (índice equivalente a _team_match sobre todas as chaves)
+    with _estadios_lock:
+        _INDICE_ESTADIOS.sincronizar(CACHE_ESTADIOS)
+        chave = _INDICE_ESTADIOS.procurar(nome_equipa)
+        if chave is not None:
+            return CACHE_ESTADIOS[chave], True
+
+    # Já na fila de geocoding: ou ainda a correr, ou terminou sem resultado
+    # (com resultado, o passo 1 já o tinha encontrado)
+    pendente = fila_geo.pedido(normalizar(nome_equipa))
+    if pendente is not None:
+        return (_extract_district(comp_text), True) if pendente.done() else (None, False)
+
+    # 2. Cache partilhada de geocoding: resultado de uma noite anterior, ou
+    #    falha recente (entrada negativa) → direto ao fallback distrito
+    guardado = geo_store.obter(nome_equipa, tipo="estadio")
+    if guardado:
+        with _estadios_lock:
+            CACHE_ESTADIOS[nome_equipa] = guardado
+        return guardado, True
+
+    if guardado is False:
+        # O Nominatim já falhou: localidade do gazetteer antes do distrito
+        return _estadio_no_gazetteer(nome_equipa, comp_text) or _extract_district(comp_text), True
+
+    # 3. Localidade do nome no gazetteer offline (ex: "Águias de Alvite" →
+    #    Alvite), antes de qualquer pedido ao Nominatim
+    if _RE_LOCALIDADE.search(nome_equipa):
+        lugar = _estadio_no_gazetteer(nome_equipa, comp_text)
+        if lugar:
+            return _guardar_estadio(nome_equipa, lugar, None, fonte="gazetteer"), True
+    return None, False
+
+
+def _guardar_estadio(nome_equipa: str, result: dict, query: str, fonte: str = "nominatim") -> dict:
+    with _estadios_lock:
+        CACHE_ESTADIOS[nome_equipa] = result
+    geo_store.guardar(nome_equipa, result["lat"], result["lon"], result["local"],
+                      tipo="estadio", fonte=fonte, query=query)
+    return result
+
+
+def _nominatim_estadio(nome_equipa: str, comp_text: str = ""):
+    """Passos 4 e 5 (Nominatim, corre na fila de geocoding): geo do estádio ou None."""
+    # 4. Nominatim: melhor query única
     for query in [
         f"Estádio {nome_equipa}, Portugal",
         f"{nome_equipa} futebol, Portugal",
     ]:
         try:
+            nominatim.esperar()
             loc = geolocator.geocode(query, timeout=5)
             if loc:
                 result = {"lat": loc.latitude, "lon": loc.longitude, "local": loc.address.split(",")[0]}
-                CACHE_ESTADIOS[nome_equipa] = result
-                return result
+                return _guardar_estadio(nome_equipa, result, query)
         except Exception:
             pass
-        time.sleep(1.1)
 
-    # 4. Extrair localidade do nome (ex: "Águias de Alvite" → "Alvite, Portugal")
-    m = re.search(r'\b(?:de|da|do|dos|das)\s+(.+)', nome_equipa, re.IGNORECASE)
+    # 5. O próprio nome no gazetteer offline (a localidade do nome já foi vista
+    #    no passo 3) e a localidade no Nominatim
+    lugar = _estadio_no_gazetteer(nome_equipa, comp_text)
+    if lugar:
+        return _guardar_estadio(nome_equipa, lugar, None, fonte="gazetteer")
+    m = _RE_LOCALIDADE.search(nome_equipa)
     if m:
         localidade = m.group(1).strip()
         try:
+            nominatim.esperar()
             loc = geolocator.geocode(f"{localidade}, Portugal", timeout=5)
             if loc:
                 result = {"lat": loc.latitude, "lon": loc.longitude, "local": f"Campo em {localidade}"}
-                CACHE_ESTADIOS[nome_equipa] = result
-                return result
+                return _guardar_estadio(nome_equipa, result, f"{localidade}, Portugal")
         except Exception:
             pass
-        time.sleep(1.1)
 
-    # 5. Fallback: centróide do distrito extraído da competição
+    geo_store.falhou(nome_equipa, tipo="estadio")
+    return None
+
+
+def _pedir_estadio(nome_equipa: str, comp_text: str = ""):
+    """Future da consulta ao Nominatim de uma equipa (uma só por equipa e execução)."""
+    return fila_geo.pedir(normalizar(nome_equipa), _nominatim_estadio, nome_equipa, comp_text)
+
+
+def geolocalizar_estadio(nome_equipa: str, comp_text: str = ""):
+    """Localiza o estádio de uma equipa com múltiplos fallbacks (espera pela fila de geocoding)."""
+    geo, conhecido = _estadio_conhecido(nome_equipa, comp_text)
+    if conhecido:
+        return geo
+    geo = _pedir_estadio(nome_equipa, comp_text).result()
+    if geo:
+        return geo
+
+    # 6. Fallback: centróide do distrito extraído da competição
     district_geo = _extract_district(comp_text)
     if district_geo:
         print(f"    📍 Fallback distrito para {nome_equipa}: {district_geo['local']}")
-        _GEO_FAILED.add(nome_equipa)
-        return district_geo
+    return district_geo
 
-    _GEO_FAILED.add(nome_equipa)
-    return None
+
+def _geo_equipas(equipas, comp_text: str):
+    """Geolocalização de um jogo sem esperar pela rede (casa primeiro, depois fora).
+
+    Devolve (geo, pendente, restantes): o geo final se já se sabe; senão o
+    Future da consulta de uma equipa desconhecida e as equipas a tentar se
+    essa consulta falhar.
+    """
+    for i, nome in enumerate(equipas):
+        geo, conhecido = _estadio_conhecido(nome, comp_text)
+        if not conhecido:
+            return None, _pedir_estadio(nome, comp_text), tuple(equipas[i + 1:])
+        if geo:
+            return geo, None, ()
+    return None, None, ()
+
+
+def _avancar_adiados(adiados: list, esperar: bool = False):
+    """Jogos à espera da fila de geocoding: gera (jogo, geo) dos que já se resolveram.
+
+    Cada entrada é [jogo, pendente, restantes]; uma consulta falhada passa à
+    equipa seguinte (que pode voltar a ficar à espera). Com `esperar`, bloqueia
+    até todas terminarem.
+    """
+    i = 0
+    while i < len(adiados):
+        jogo, pendente, restantes = adiados[i]
+        geo = None
+        while pendente is not None and (esperar or pendente.done()):
+            geo = pendente.result()
+            if geo:
+                pendente = None
+            else:
+                geo, pendente, restantes = _geo_equipas(restantes, jogo["competicao"])
+        if pendente is None:
+            adiados.pop(i)
+            yield jogo, geo
+        else:
+            adiados[i] = [jogo, pendente, restantes]
+            i += 1
 
 
 def is_portuguese_game(casa: str, fora: str, comp_text: str = "",
@@ -333,13 +559,9 @@ def is_portuguese_game(casa: str, fora: str, comp_text: str = "",
     """Verifica se o jogo é português (bandeira PT, competição, ou equipas)."""
     if has_pt_flag:
         return True
-    cl = comp_text.lower()
-    if any(re.search(r'(?:^|\b)' + re.escape(kw) + r'(?:\b|$)', cl)
-           for kw in PORTUGUESE_COMP_KEYWORDS):
+    if _competicao_portuguesa(comp_text):
         return True
-    return any(
-        _team_match(t, casa) or _team_match(t, fora) for t in PORTUGUESE_TEAMS
-    )
+    return _INDICE_PT.contem(casa) or _INDICE_PT.contem(fora)
 
 
 def _extract_game_id(url: str) -> str:
@@ -348,122 +570,253 @@ def _extract_game_id(url: str) -> str:
     return m.group(1) if m else url
 
 
-def parse_games_from_html(html: str) -> list:
-    """Extrai jogos do HTML usando BeautifulSoup (li.game + tabela, sempre ambos)."""
-    soup = BeautifulSoup(html, "html.parser")
-    ids_vistos = set()
-    resultados = []
+_RE_HORA = re.compile(r'\d{2}:\d{2}$')
+_RE_HORA_TEXTO = re.compile(r'(\d{2}:\d{2})')
+_RE_VS = re.compile(r'(.+?)\s+(?:vs|x|\d+\s*-\s*\d+|-)\s+(.+)', re.IGNORECASE)
+_RE_DATA_URL = re.compile(r'/(?:jogo|live-ao-minuto)/(\d{4}-\d{2}-\d{2})')
+_RE_DATA = re.compile(r'(\d{4}-\d{2}-\d{2})')
+_FLAG_PT = re.compile(r'flag:PT')
 
-    # --- 1. Tabela principal agenda_list ---
-    for row in soup.select("table.agenda_list tr"):
-        try:
-            time_td = row.select_one("td.time")
-            info_td = row.select_one("td.info")
-            if not time_td or not info_td:
-                continue
 
-            hora = time_td.get_text(strip=True)
-            if not re.match(r'\d{2}:\d{2}$', hora):
-                continue
+def _classes(tag) -> list:
+    return tag.get("class") or []
 
-            game_link = info_td.select_one(
-                "a[href*='/jogo/'], a[href*='/live-ao-minuto/']"
-            )
-            if not game_link:
-                continue
-            game_url = game_link.get("href", "")
-            gid = _extract_game_id(game_url)
-            if gid in ids_vistos:
-                continue
-            ids_vistos.add(gid)
 
-            game_text = game_link.get_text(strip=True)
-            vs_match = re.match(r'(.+?)\s+(?:vs|x|\d+\s*-\s*\d+|-)\s+(.+)', game_text, re.IGNORECASE)
-            if not vs_match:
-                # Tentar extrair equipas de outra forma se regex falhar
-                continue
-            casa = vs_match.group(1).strip()
-            fora = vs_match.group(2).strip()
+def _e_link_jogo(tag) -> bool:
+    """Equivalente a a[href*='/jogo/'], a[href*='/live-ao-minuto/']."""
+    if tag.name != "a":
+        return False
+    href = tag.get("href")
+    return bool(href) and ("/jogo/" in href or "/live-ao-minuto/" in href)
 
-            url_date = re.search(
-                r'/(?:jogo|live-ao-minuto)/(\d{4}-\d{2}-\d{2})', game_url
-            )
-            data = url_date.group(1) if url_date else datetime.now().strftime("%Y-%m-%d")
 
-            comp_el = info_td.select_one("div.match_info")
-            comp_text = comp_el.get_text(strip=True) if comp_el else ""
+def _ancestral(tag, nomes=None, classe: str = None):
+    """Como find_parent, mas sem o custo de construir um SoupStrainer por chamada."""
+    for p in tag.parents:
+        if (nomes is None or p.name in nomes) and (classe is None or classe in _classes(p)):
+            return p
+    return None
 
-            comp_img = info_td.select_one("div.main_info div.image")
-            has_pt_flag = bool(comp_img and "flag:PT" in str(comp_img))
 
-            resultados.append({
-                "casa": casa, "fora": fora,
-                "data": data, "hora": hora,
-                "competicao": comp_text, "url": game_url,
-                "has_pt_flag": has_pt_flag,
-            })
-        except Exception:
+def _tem_ancestral(tag, nome: str, classe: str) -> bool:
+    return _ancestral(tag, (nome,), classe) is not None
+
+
+def _links_com(raiz, trecho: str):
+    """Tags <a> descendentes de raiz cujo href contém `trecho` (a[href*='...'])."""
+    for tag in raiz.descendants:
+        if isinstance(tag, Tag) and tag.name == "a":
+            href = tag.get("href")
+            if href and trecho in href:
+                yield tag
+
+
+def _procurar_na_subarvore(tag, padrao):
+    """Equivalente a padrao.search(str(tag)), sem serializar a sub-árvore.
+
+    Percorre atributos e textos pela ordem em que aparecem no HTML e devolve o
+    primeiro match (os padrões usados não atravessam fronteiras de tags).
+    """
+    for no in (tag, *tag.descendants):
+        if isinstance(no, Tag):
+            for valor in no.attrs.values():
+                if isinstance(valor, list):
+                    valor = " ".join(valor)
+                m = padrao.search(valor)
+                if m:
+                    return m
+        else:
+            m = padrao.search(no)
+            if m:
+                return m
+    return None
+
+
+def _jogo_de_linha_agenda(row, ids_vistos: set):
+    """Linha de table.agenda_list → dict do jogo (ou None). Uma passagem por td e outra pela td.info."""
+    time_td = info_td = None
+    for td in row.find_all("td"):
+        cls = _classes(td)
+        if time_td is None and "time" in cls:
+            time_td = td
+        if info_td is None and "info" in cls:
+            info_td = td
+    if not time_td or not info_td:
+        return None
+
+    hora = time_td.get_text(strip=True)
+    if not _RE_HORA.match(hora):
+        return None
+
+    game_link = comp_el = comp_img = None
+    for tag in info_td.find_all(True):
+        if game_link is None and _e_link_jogo(tag):
+            game_link = tag
+        elif tag.name == "div":
+            cls = _classes(tag)
+            if comp_el is None and "match_info" in cls:
+                comp_el = tag
+            if comp_img is None and "image" in cls and _tem_ancestral(tag, "div", "main_info"):
+                comp_img = tag
+    if not game_link:
+        return None
+    game_url = game_link.get("href", "")
+    gid = _extract_game_id(game_url)
+    if gid in ids_vistos:
+        return None
+    ids_vistos.add(gid)
+
+    vs_match = _RE_VS.match(game_link.get_text(strip=True))
+    if not vs_match:
+        return None
+    url_date = _RE_DATA_URL.search(game_url)
+    return {
+        "casa": vs_match.group(1).strip(), "fora": vs_match.group(2).strip(),
+        "data": url_date.group(1) if url_date else datetime.now().strftime("%Y-%m-%d"),
+        "hora": hora,
+        "competicao": comp_el.get_text(strip=True) if comp_el else "",
+        "url": game_url,
+        "has_pt_flag": bool(comp_img and _procurar_na_subarvore(comp_img, _FLAG_PT)),
+    }
+
+
+def _jogo_de_matchbox(li, ids_vistos: set):
+    """Elemento li.game → dict do jogo (ou None), com uma única passagem pelos descendentes."""
+    link = comp_el = comp_img = date_el = time_tag = None
+    teams = []
+    for tag in li.find_all(True):
+        if link is None and _e_link_jogo(tag):
+            link = tag
             continue
+        cls = _classes(tag)
+        if tag.name == "span":
+            # "div.date span" — o primeiro span com um div.date acima (pode não ter classe)
+            if date_el is None and _tem_ancestral(tag, "div", "date"):
+                date_el = tag
+            if "title" in cls and _tem_ancestral(tag, "div", "team"):
+                teams.append(tag)
+            if time_tag is None and "tag" in cls and "time" in cls:
+                time_tag = tag
+        elif tag.name == "div":
+            if comp_el is None and "comp" in cls:
+                comp_el = tag
+            if comp_img is None and "image" in cls and _tem_ancestral(tag, "div", "comp"):
+                comp_img = tag
+    if not link:
+        return None
+    game_url = link.get("href", "")
+    gid = _extract_game_id(game_url)
+    if gid in ids_vistos:
+        return None
+    ids_vistos.add(gid)
+
+    if len(teams) < 2:
+        return None
+    url_date = _RE_DATA_URL.search(game_url)
+    data = url_date.group(1) if url_date else None
+
+    hora = None
+    if date_el:
+        tm = _RE_HORA_TEXTO.search(date_el.get_text())
+        hora = tm.group(1) if tm else None
+    if not hora and time_tag:
+        t = time_tag.get_text(strip=True)
+        if _RE_HORA.match(t):
+            hora = t
+    if not data or not hora:
+        return None
+
+    return {
+        "casa": teams[0].get_text(strip=True), "fora": teams[1].get_text(strip=True),
+        "data": data, "hora": hora,
+        "competicao": re.sub(r'\s+', ' ', comp_el.get_text(strip=True)) if comp_el else "",
+        "url": game_url,
+        "has_pt_flag": bool(comp_img and _procurar_na_subarvore(comp_img, _FLAG_PT)),
+    }
 
-    # --- 2. Elementos li.game (matchbox) ---
-    for li in soup.select("li.game"):
-        try:
-            link = li.select_one(
-                "a[href*='/jogo/'], a[href*='/live-ao-minuto/']"
-            )
-            if not link:
-                continue
-            game_url = link.get("href", "")
-            gid = _extract_game_id(game_url)
-            if gid in ids_vistos:
-                continue
-            ids_vistos.add(gid)
 
-            teams = li.select("div.team span.title")
-            if len(teams) < 2:
-                continue
-            casa = teams[0].get_text(strip=True)
-            fora = teams[1].get_text(strip=True)
-
-            url_date = re.search(
-                r'/(?:jogo|live-ao-minuto)/(\d{4}-\d{2}-\d{2})', game_url
-            )
-            data = url_date.group(1) if url_date else None
-
-            hora = None
-            date_el = li.select_one("div.date span")
-            if date_el:
-                tm = re.search(r'(\d{2}:\d{2})', date_el.get_text())
-                hora = tm.group(1) if tm else None
-            
-            if not hora:
-                time_tag = li.select_one("span.tag.time")
-                if time_tag:
-                    t = time_tag.get_text(strip=True)
-                    if re.match(r'\d{2}:\d{2}$', t):
-                        hora = t
-
-            if not data or not hora:
-                continue
+def parse_games_from_html(html) -> list:
+    """Extrai jogos do HTML (ou soup já parseada) — tabela agenda_list + li.game, sempre ambos.
 
-            comp_el = li.select_one("div.comp")
-            comp_text = re.sub(r'\s+', ' ', comp_el.get_text(strip=True)) if comp_el else ""
+    Uma única passagem pela árvore: as linhas da tabela são convertidas à medida
+    que aparecem; os li.game ficam para o fim, porque a tabela tem prioridade
+    na deduplicação por ID de jogo.
+    """
+    soup = make_soup(html)
+    ids_vistos = set()
+    resultados = []
+    matchboxes = []
 
-            comp_img = li.select_one("div.comp div.image")
-            has_pt_flag = bool(comp_img and "flag:PT" in str(comp_img))
+    for el in soup.find_all(("tr", "li")):
+        if el.name == "li":
+            if "game" in _classes(el):
+                matchboxes.append(el)
+            continue
+        if not _tem_ancestral(el, "table", "agenda_list"):
+            continue
+        try:
+            jogo = _jogo_de_linha_agenda(el, ids_vistos)
+        except Exception:
+            continue
+        if jogo:
+            resultados.append(jogo)
 
-            resultados.append({
-                "casa": casa, "fora": fora,
-                "data": data, "hora": hora,
-                "competicao": comp_text, "url": game_url,
-                "has_pt_flag": has_pt_flag,
-            })
+    for li in matchboxes:
+        try:
+            jogo = _jogo_de_matchbox(li, ids_vistos)
         except Exception:
             continue
+        if jogo:
+            resultados.append(jogo)
 
     return resultados
 
 
+def parse_game_details(html) -> dict:
+    """Extrai URLs de equipas e classificação do HTML (ou soup) de uma página de jogo."""
+    result = {"url_equipa_casa": "", "url_equipa_fora": "", "url_classificacao": ""}
+    base = "https://www.zerozero.pt"
+    soup = make_soup(html)
+
+    # Extrair URLs das equipas a partir do cabeçalho do jogo
+    team_urls = []
+    header = soup.select_one("#match-header, .match-header, [class*='matchHeader'], [class*='match_header']")
+    team_links = (header or soup).select("a[href*='/equipa/']")
+    seen_urls = set()
+    for tl in team_links:
+        href = tl.get("href", "")
+        if "/equipa/" in href:
+            full = href if href.startswith("http") else base + href
+            if full not in seen_urls:
+                seen_urls.add(full)
+                team_urls.append(full)
+
+    if len(team_urls) >= 2:
+        result["url_equipa_casa"] = team_urls[0]
+        result["url_equipa_fora"] = team_urls[1]
+    elif len(team_urls) == 1:
+        result["url_equipa_casa"] = team_urls[0]
+
+    # Extrair URL da classificação (link com /edition/ ou classificacao)
+    edition_links = soup.select("a[href*='/edition/'], a[href*='classificacao']")
+    for el in edition_links:
+        href = el.get("href", "")
+        if "/edition/" in href or "classificacao" in href:
+            result["url_classificacao"] = href if href.startswith("http") else base + href
+            break
+
+    # Fallback: procurar link da competição
+    if not result["url_classificacao"]:
+        comp_links = soup.select("a[href*='/edicao/'], a[href*='/competicao/']")
+        for cl in comp_links:
+            href = cl.get("href", "")
+            if href:
+                result["url_classificacao"] = href if href.startswith("http") else base + href
+                break
+
+    return result
+
+
 def scrape_game_details(session: cf_requests.Session, game_url: str) -> dict:
     """Visita a página de um jogo no ZeroZero para extrair URLs de equipas e classificação."""
     result = {"url_equipa_casa": "", "url_equipa_fora": "", "url_classificacao": ""}
@@ -474,69 +827,129 @@ def scrape_game_details(session: cf_requests.Session, game_url: str) -> dict:
         resp = session.get(full_url, timeout=30)
         if resp.status_code != 200:
             return result
-        html = resp.text
-        soup = BeautifulSoup(html, "html.parser")
-
-        # Extrair URLs das equipas a partir do cabeçalho do jogo
-        team_urls = []
-        header = soup.select_one("#match-header, .match-header, [class*='matchHeader'], [class*='match_header']")
-        team_links = (header or soup).select("a[href*='/equipa/']")
-        seen_urls = set()
-        for tl in team_links:
-            href = tl.get("href", "")
-            if "/equipa/" in href:
-                full = href if href.startswith("http") else base + href
-                if full not in seen_urls:
-                    seen_urls.add(full)
-                    team_urls.append(full)
-
-        if len(team_urls) >= 2:
-            result["url_equipa_casa"] = team_urls[0]
-            result["url_equipa_fora"] = team_urls[1]
-        elif len(team_urls) == 1:
-            result["url_equipa_casa"] = team_urls[0]
-
-        # Extrair URL da classificação (link com /edition/ ou classificacao)
-        edition_links = soup.select("a[href*='/edition/'], a[href*='classificacao']")
-        for el in edition_links:
-            href = el.get("href", "")
-            if "/edition/" in href or "classificacao" in href:
-                result["url_classificacao"] = href if href.startswith("http") else base + href
-                break
-
-        # Fallback: procurar link da competição
-        if not result["url_classificacao"]:
-            comp_links = soup.select("a[href*='/edicao/'], a[href*='/competicao/']")
-            for cl in comp_links:
-                href = cl.get("href", "")
-                if href:
-                    result["url_classificacao"] = href if href.startswith("http") else base + href
-                    break
-
+        result = parse_game_details(resp.text)
     except Exception as e:
         print(f"    ⚠️ Erro ao extrair detalhes de {game_url}: {e}")
 
     return result
 
 
+def _enriquecer(engine: FetchEngine, eventos, workers: int = None):
+    """Fase de enriquecimento em streaming: gera cada evento com as URLs de equipas/classificação.
+
+    As páginas de jogo são buscadas em paralelo pelo motor de fetch (limites
+    por host incluídos) através de uma fila limitada; os eventos saem pela
+    ordem de chegada, à medida que os detalhes ficam prontos.
+    """
+    base = "https://www.zerozero.pt"
+    workers = workers or _concorrencia()
+    inicio = time.monotonic()
+    alvo = 0
+    paginas = 0
+    com_equipas = 0
+
+    def _detalhes(ev):
+        url = ev.get("url_jogo")
+        if not url:
+            return ev, None
+        full_url = url if url.startswith("http") else base + url
+        try:
+            html = engine.fetch(full_url, retries=1)
+            return ev, (parse_game_details(html) if html else None)
+        except Exception as e:
+            print(f"    ⚠️ Erro ao extrair detalhes de {url}: {e}")
+            return ev, None
+
+    for ev, details in mapa_ordenado(_detalhes, eventos, workers):
+        if ev.get("url_jogo"):
+            alvo += 1
+            if details is None:
+                print(f"    ⚠️ Sem detalhes para {ev['nome']}")
+            else:
+                paginas += 1
+                ev["url_equipa_casa"] = details.get("url_equipa_casa", "")
+                ev["url_equipa_fora"] = details.get("url_equipa_fora", "")
+                ev["url_classificacao"] = details.get("url_classificacao", "")
+
+            # Progresso
+            if alvo % 20 == 0:
+                print(f"  📋 Detalhes: {alvo} jogos processados")
+        if ev.get("url_equipa_casa"):
+            com_equipas += 1
+        yield ev
+
+    elapsed = time.monotonic() - inicio
+    taxa = paginas / elapsed if elapsed > 0 else 0.0
+    print(f"\n🔗 Detalhes extraídos para {com_equipas} jogos "
+          f"({paginas}/{alvo} páginas em {elapsed:.1f}s, {taxa:.1f} páginas/s)")
+
+
+def enriquecer_detalhes(engine: FetchEngine, eventos: list, workers: int = None) -> list:
+    """Fase de enriquecimento sobre uma lista: actualiza os eventos e devolve-os pela ordem original."""
+    for _ in _enriquecer(engine, eventos, workers):
+        pass
+    return eventos
+
+
+# Escalões e categorias por ordem de prioridade (a primeira que coincidir ganha)
+_ESCALOES = [
+    ("Sub-19", ["sub-19", "juniores a", "juniores"]),
+    ("Sub-17", ["sub-17", "juvenis"]),
+    ("Sub-15", ["sub-15", "iniciados"]),
+    ("Sub-13", ["sub-13", "infantis"]),
+    ("Benjamins", ["sub-11", "benjamins", "benjamim"]),
+    ("Traquinas", ["sub-9", "sub-7", "traquinas", "petizes"]),
+    ("Sub-23", ["revelação", "sub-23"]),
+]
+
+_CATEGORIAS = [
+    ("Competição Europeia", "~25€ (estimado)", ["champions", "europa league", "conference", "uefa"]),
+    ("Liga Portugal", "~15€ (estimado)", ["liga portugal", "primeira liga", "betclic"]),
+    ("Liga Portugal 2", "~10€ (estimado)", ["liga 2", "segunda liga", "meu super"]),
+    ("Liga 3", "~5€ (estimado)", ["liga 3"]),
+    ("Taça de Portugal", "~8€ (estimado)", ["taça de portugal", "taca de portugal"]),
+    ("Taça da Liga", "~8€ (estimado)", ["taça da liga"]),
+    ("Supertaça", "~15€ (estimado)", ["supertaça"]),
+    ("Liga Revelação", "Grátis", ["revelação", "sub-23"]),
+    ("Futebol Feminino", "~3€ (estimado)", ["liga feminina", "liga bpi", "futebol feminino"]),
+    ("Campeonato de Portugal", "~5€ (estimado)", ["pro-nacional", "pró-nacional", "campeonato de portugal"]),
+    ("Divisão de Honra", "~3€ (estimado)", ["divisão de honra", "divisao de honra"]),
+    ("Futebol Distrital", "~3€ (estimado)", [
+        "af ", "a.f.", "distrital", "1ª divisão", "2ª divisão", "3ª divisão",
+        "divisão elite", "liga regional", "campeonato regional",
+        "afp ", "afl ", "afb ",
+    ]),
+    ("Amigável", "Grátis", ["amigável", "amistoso", "particular", "friendly"]),
+]
+
+# Todas as palavras de escalão e categoria num só matcher (uma passagem por jogo)
+_MATCHER_EVENTO = MatcherPalavras(
+    [p for _, palavras in _ESCALOES for p in palavras]
+    + [p for _, _, palavras in _CATEGORIAS for p in palavras]
+)
+
+
+def _palavras_evento(comp_text: str, nome_jogo: str = "") -> tuple:
+    """Uma passagem por "competição nome_jogo": (palavras no texto todo, palavras só na competição)."""
+    corte = len(comp_text.lower())
+    em_texto, em_comp = set(), set()
+    for inicio, palavra in _MATCHER_EVENTO.ocorrencias((comp_text + " " + nome_jogo).lower()):
+        em_texto.add(palavra)
+        if inicio + len(palavra) <= corte:
+            em_comp.add(palavra)
+    return em_texto, em_comp
+
+
+def _escalao_de(palavras: set) -> str:
+    for escalao, chaves in _ESCALOES:
+        if not palavras.isdisjoint(chaves):
+            return escalao
+    return "Seniores"
+
+
 def extrair_escalao(comp_text: str, nome_jogo: str = "") -> str:
     """Extrai o escalão do texto da competição ou nome do jogo."""
-    texto = (comp_text + " " + nome_jogo).lower()
-    if any(x in texto for x in ["sub-19", "juniores a", "juniores"]):
-        return "Sub-19"
-    if any(x in texto for x in ["sub-17", "juvenis"]):
-        return "Sub-17"
-    if any(x in texto for x in ["sub-15", "iniciados"]):
-        return "Sub-15"
-    if any(x in texto for x in ["sub-13", "infantis"]):
-        return "Sub-13"
-    if any(x in texto for x in ["sub-11", "benjamins", "benjamim"]):
-        return "Benjamins"
-    if any(x in texto for x in ["sub-9", "sub-7", "traquinas", "petizes"]):
-        return "Traquinas"
-    if any(x in texto for x in ["revelação", "sub-23"]):
-        return "Sub-23"
-    return "Seniores"
+    return _escalao_de(_palavras_evento(comp_text, nome_jogo)[0])
 
 
 def classificar_evento(comp_text: str, nome_jogo: str = ""):
@@ -551,45 +964,18 @@ def classificar_evento(comp_text: str, nome_jogo: str = ""):
     - Competições Europeias: €15-60, média ~25€
     - Formação (todos os escalões): Grátis
     """
-    cl = comp_text.lower()
-    escalao = extrair_escalao(comp_text, nome_jogo)
+    em_texto, em_comp = _palavras_evento(comp_text, nome_jogo)
+    escalao = _escalao_de(em_texto)
 
     # Formação é sempre grátis
     if escalao not in ("Seniores", "Sub-23"):
         return f"Formação - {escalao}", "Grátis", escalao
 
-    if any(x in cl for x in ["champions", "europa league", "conference", "uefa"]):
-        return "Competição Europeia", "~25€ (estimado)", escalao
-    if any(x in cl for x in ["liga portugal", "primeira liga", "betclic"]):
-        return "Liga Portugal", "~15€ (estimado)", escalao
-    if any(x in cl for x in ["liga 2", "segunda liga", "meu super"]):
-        return "Liga Portugal 2", "~10€ (estimado)", escalao
-    if any(x in cl for x in ["liga 3"]):
-        return "Liga 3", "~5€ (estimado)", escalao
-    if any(x in cl for x in ["taça de portugal", "taca de portugal"]):
-        return "Taça de Portugal", "~8€ (estimado)", escalao
-    if any(x in cl for x in ["taça da liga"]):
-        return "Taça da Liga", "~8€ (estimado)", escalao
-    if any(x in cl for x in ["supertaça"]):
-        return "Supertaça", "~15€ (estimado)", escalao
-    if any(x in cl for x in ["revelação", "sub-23"]):
-        return "Liga Revelação", "Grátis", "Sub-23"
-    if any(x in cl for x in ["liga feminina", "liga bpi", "futebol feminino"]):
-        return "Futebol Feminino", "~3€ (estimado)", escalao
-    if any(x in cl for x in ["pro-nacional", "pró-nacional", "campeonato de portugal"]):
-        return "Campeonato de Portugal", "~5€ (estimado)", escalao
-    if any(x in cl for x in ["divisão de honra", "divisao de honra"]):
-        return "Divisão de Honra", "~3€ (estimado)", escalao
-    if any(x in cl for x in [
-        "af ", "a.f.", "distrital", "1ª divisão", "2ª divisão", "3ª divisão",
-        "divisão elite", "liga regional", "campeonato regional",
-        "afp ", "afl ", "afb ",
-    ]):
-        return "Futebol Distrital", "~3€ (estimado)", escalao
-    if any(x in cl for x in [
-        "amigável", "amistoso", "particular", "friendly",
-    ]):
-        return "Amigável", "Grátis", escalao
+    for categoria, preco, chaves in _CATEGORIAS:
+        if not em_comp.isdisjoint(chaves):
+            if categoria == "Liga Revelação":
+                return categoria, preco, "Sub-23"
+            return categoria, preco, escalao
     return "Futebol", "Variável", escalao
 
 
@@ -638,17 +1024,21 @@ def _fs_solve(url: str, session_id: str = None) -> tuple:
 
 
 def _fs_cleanup():
-    """Destroi sessão FlareSolverr."""
-    global _fs_session_id, _fs_mode
-    if _fs_session_id:
-        try:
-            std_requests.post(FLARESOLVERR_URL, json={
-                "cmd": "sessions.destroy", "session": _fs_session_id
-            }, timeout=5)
-        except Exception:
-            pass
-    _fs_session_id = None
+    """Destroi as sessões FlareSolverr do pool e esquece o clearance da Estratégia 2."""
+    global _fs_pool, _fs_mode, _clearance
+    if _fs_pool:
+        print(f"🌐 FlareSolverr: {_fs_pool.resumo()}")
+        _fs_pool.close()
+    if _clearance:
+        print(f"🍪 Clearance: {_clearance.resumo()}")
+    _fs_pool = None
     _fs_mode = False
+    _clearance = None
+
+
+def _concorrencia() -> int:
+    """Pedidos simultâneos ao ZeroZero: um por sessão FlareSolverr no modo browser."""
+    return _fs_pool.ativas if _fs_mode else ZZ_CONCORRENCIA
 
 
 # ========================================================================
@@ -672,9 +1062,9 @@ def create_cf_session() -> cf_requests.Session:
 
     Estratégia 1: curl_cffi direto (funciona localmente / IPs limpos)
     Estratégia 2: cookies FlareSolverr + curl_cffi (rápido em datacenter)
-    Estratégia 3: FlareSolverr sessão (mais lento, mas fiável)
+    Estratégia 3: pool de sessões FlareSolverr (mais lento, mas fiável)
     """
-    global _fs_mode, _fs_session_id
+    global _fs_mode, _fs_pool, _clearance
 
     # Diagnóstico
     try:
@@ -711,13 +1101,15 @@ def create_cf_session() -> cf_requests.Session:
     if cookies and html and not _is_cf_challenge(html):
         session = cf_requests.Session(impersonate="chrome")
         session.headers.update(_CF_HEADERS)
-        if ua:
-            session.headers["User-Agent"] = ua
-        for name, value in cookies.items():
-            session.cookies.set(name, value, domain=".zerozero.pt")
+        # O gestor renova os cookies quando expiram (ou quando volta o challenge)
+        clearance = GestorClearance(session, _fs_solve, _is_cf_challenge,
+                                    "https://www.zerozero.pt/", ".zerozero.pt",
+                                    max_idade=ZZ_CF_RENOVAR_MIN * 60)
+        clearance.injetar(cookies, ua)
         try:
             resp = session.get("https://www.zerozero.pt/agenda", timeout=15)
             if resp.status_code == 200 and not _is_cf_challenge(resp.text):
+                _clearance = clearance
                 print(f"✅ Estratégia 2 OK: curl_cffi + {len(cookies)} cookies FlareSolverr")
                 return session
         except Exception:
@@ -725,27 +1117,19 @@ def create_cf_session() -> cf_requests.Session:
         print("⚠️ Cookies não funcionaram com curl_cffi, a tentar modo direto...")
         session.close()
 
-    # --- Estratégia 3: FlareSolverr sessão (cada pedido pelo browser) ---
-    print("🔓 Estratégia 3: FlareSolverr modo sessão...")
-    try:
-        r = std_requests.post(FLARESOLVERR_URL,
-                              json={"cmd": "sessions.create"}, timeout=15)
-        data = r.json()
-        sid = data.get("session", "")
-        if sid:
-            _fs_session_id = sid
-            warmup, _, _ = _fs_solve("https://www.zerozero.pt/", session_id=sid)
-            if warmup and not _is_cf_challenge(warmup):
-                _fs_mode = True
-                print(f"✅ Estratégia 3 OK: FlareSolverr sessão ({sid[:12]}...)")
-                session = cf_requests.Session(impersonate="chrome")
-                session.headers.update(_CF_HEADERS)
-                return session
-            print("⚠️ FlareSolverr sessão não resolveu CF")
-            _fs_cleanup()
-    except Exception as e:
-        print(f"⚠️ FlareSolverr sessão erro: {e}")
-        _fs_cleanup()
+    # --- Estratégia 3: pool de sessões FlareSolverr (cada pedido pelo browser) ---
+    print(f"🔓 Estratégia 3: pool de {ZZ_FS_SESSOES} sessões FlareSolverr...")
+    pool = PoolFlareSolverr(FLARESOLVERR_URL, _is_cf_challenge, ZZ_FS_SESSOES,
+                            aquecer="https://www.zerozero.pt/")
+    if pool.iniciar():
+        _fs_pool = pool
+        _fs_mode = True
+        print(f"✅ Estratégia 3 OK: {pool.ativas} sessões FlareSolverr em paralelo")
+        session = cf_requests.Session(impersonate="chrome")
+        session.headers.update(_CF_HEADERS)
+        return session
+    print("⚠️ FlareSolverr sessão não resolveu CF")
+    pool.close()
 
     # --- Tudo falhou ---
     print("❌ Nenhuma estratégia CF funcionou — ZeroZero provavelmente indisponível")
@@ -754,46 +1138,108 @@ def create_cf_session() -> cf_requests.Session:
     return session
 
 
-def fetch_html(session: cf_requests.Session, url: str, retries: int = 3) -> str:
-    """Busca HTML com retry, detecção CF e fallback FlareSolverr."""
-    # Modo FlareSolverr: bypass curl_cffi, usar browser direto
+def _html_fresco(entrada):
+    """Body de uma entrada da cache em disco ainda dentro do TTL (conta o hit), ou None."""
+    if entrada and entrada.fresca:
+        http_cache.registar("hits")
+        return entrada.body
+    return None
+
+
+def _html_em_cache(url: str):
+    """HTML guardado em disco ainda dentro do TTL, ou None."""
+    return _html_fresco(http_cache.obter(url) if http_cache else None)
+
+
+def _get_com_clearance(session: cf_requests.Session, url: str, headers: dict):
+    """GET pela sessão curl_cffi; na Estratégia 2, renova os cookies CF e repete se vier o challenge."""
+    clearance = _clearance
+    if not clearance:
+        return session.get(url, timeout=30, headers=headers or None)
+    geracao = clearance.antes_do_pedido()
+    resp = session.get(url, timeout=30, headers=headers or None)
+    bloqueado = resp.status_code == 403 or (resp.status_code == 200 and _is_cf_challenge(resp.text))
+    if bloqueado and clearance.renovar(geracao):
+        resp = session.get(url, timeout=30, headers=headers or None)
+    return resp
+
+
+def _retry_after(resp):
+    """Segundos do cabeçalho Retry-After (só a forma numérica), ou None."""
+    valor = (resp.headers.get("Retry-After") or "").strip()
+    return float(valor) if valor.isdigit() else None
+
+
+def fetch_html(session: cf_requests.Session, url: str, retries: int = 3,
+               taxa: TaxaAdaptativa = None) -> str:
+    """Busca HTML com cache em disco, retry, detecção CF e fallback FlareSolverr.
+
+    `taxa` é o controlo adaptativo do host (do FetchEngine): cada resposta
+    limpa faz subir a taxa, cada 403/429/challenge/erro corta-a e pausa o
+    host, e os retries esperam por essa pausa em vez de um sleep fixo.
+    """
+    # A entrada (mesmo expirada) serve depois para o pedido condicional
+    entrada = http_cache.obter(url) if http_cache else None
+    html = _html_fresco(entrada)
+    if html is not None:
+        return html
+
+    # Modo FlareSolverr: bypass curl_cffi, usar o browser (uma sessão livre do pool;
+    # o pool tenta outra sessão e recicla a que falhou)
     if _fs_mode:
-        for attempt in range(2):
-            html, _, _ = _fs_solve(url, session_id=_fs_session_id)
-            if html and not _is_cf_challenge(html):
-                return html
-            if attempt == 0:
-                time.sleep(3)
+        html = _fs_pool.obter(url)
+        if html:
+            if http_cache:
+                http_cache.registar("misses")
+                http_cache.guardar(url, html)
+            return html
         print(f"  ❌ FlareSolverr falhou para {url}")
         return ""
 
-    # Modo normal: curl_cffi (com ou sem cookies)
+    # Sem motor (chamada avulsa): controlo só para este URL, dá o backoff exponencial
+    taxa = taxa or TaxaAdaptativa(ZZ_TAXA)
+
+    # Modo normal: curl_cffi (com ou sem cookies); entrada expirada → pedido condicional
+    headers = entrada.headers_condicionais() if entrada else {}
     for attempt in range(retries):
+        if attempt:
+            taxa.adquirir()  # espera pela pausa do host e por um token
         try:
-            resp = session.get(url, timeout=30)
+            inicio = time.monotonic()
+            resp = _get_com_clearance(session, url, headers)
+            latencia = time.monotonic() - inicio
+            if resp.status_code == 304 and entrada:
+                taxa.sucesso(latencia)
+                http_cache.registar("revalidados")
+                http_cache.renovar(entrada)
+                return entrada.body
             if resp.status_code == 200:
                 html = resp.text
                 if _is_cf_challenge(html):
+                    taxa.incidente("challenge")
                     if attempt < retries - 1:
-                        wait = 3 * (attempt + 1)
-                        print(f"  ⚠️ CF challenge detectado, retry em {wait}s...")
-                        time.sleep(wait)
+                        print(f"  ⚠️ CF challenge detectado, retry em {taxa.pausa_restante():.0f}s...")
                         continue
                     print(f"  ❌ CF challenge não resolvido para {url}")
                     return ""
+                taxa.sucesso(latencia)
+                if http_cache:
+                    http_cache.registar("misses")
+                    http_cache.guardar(url, html, resp.headers.get("ETag"),
+                                       resp.headers.get("Last-Modified"))
                 return html
-            elif resp.status_code == 403:
+            elif resp.status_code in (403, 429):
+                taxa.incidente(str(resp.status_code), _retry_after(resp))
                 if attempt < retries - 1:
-                    time.sleep(3 * (attempt + 1))
                     continue
-                print(f"  ❌ HTTP 403 para {url}")
+                print(f"  ❌ HTTP {resp.status_code} para {url}")
                 return ""
             else:
                 print(f"  ⚠️ HTTP {resp.status_code} para {url}")
                 return ""
         except Exception as e:
+            taxa.incidente("erro")
             if attempt < retries - 1:
-                time.sleep(2 * (attempt + 1))
                 continue
             print(f"  ❌ Erro ao buscar {url}: {e}")
             return ""
@@ -816,27 +1262,37 @@ def limpar_eventos_concluidos():
         print(f"⚠️ Erro ao limpar eventos: {e}")
 
 
-def extract_games_from_page(html: str, comp_name: str = "") -> list:
+_RE_DATA_JOGO = re.compile(r'/jogo/(\d{4}-\d{2}-\d{2})')
+
+
+def _e_titulo_competicao(tag) -> bool:
+    """Equivalente a "h1, .header h2, .comp_title" (o primeiro pela ordem do documento)."""
+    if tag.name == "h1" or "comp_title" in _classes(tag):
+        return True
+    return tag.name == "h2" and _ancestral(tag, classe="header") is not None
+
+
+def extract_games_from_page(html, comp_name: str = "") -> list:
     """Extrai jogos de qualquer página ZeroZero (edição, calendário, competição).
-    Prioriza linhas dentro de table.zztable (conteúdo real) para evitar sidebar."""
-    soup = BeautifulSoup(html, "html.parser")
+    Prioriza linhas dentro de table.zztable (conteúdo real) para evitar sidebar.
+    Aceita HTML ou a soup já parseada."""
+    soup = make_soup(html)
     games = []
     hoje = datetime.now()
     limite = hoje + timedelta(days=14)
     seen = set()
 
     if not comp_name:
-        h1 = soup.select_one("h1, .header h2, .comp_title")
+        h1 = soup.find(_e_titulo_competicao)
         comp_name = h1.get_text(strip=True) if h1 else ""
 
-    # Priorizar jogos dentro de tabelas (conteúdo principal, não sidebar)
-    tables = soup.select("table.zztable")
-    if tables:
-        game_links = []
-        for table in tables:
-            game_links.extend(table.select("a[href*='/jogo/']"))
-    else:
-        game_links = soup.select("a[href*='/jogo/']")
+    # Priorizar jogos dentro de tabelas (conteúdo principal, não sidebar).
+    # Uma só passagem pelos links: os que estão numa table.zztable ficam à parte.
+    tem_tabelas = soup.find("table", class_="zztable") is not None
+    game_links = [
+        a for a in _links_com(soup, "/jogo/")
+        if not tem_tabelas or _tem_ancestral(a, "table", "zztable")
+    ]
 
     for match_link in game_links:
         href = match_link.get("href", "")
@@ -844,16 +1300,13 @@ def extract_games_from_page(html: str, comp_name: str = "") -> list:
             continue
         seen.add(href)
 
-        url_date = re.search(r'/jogo/(\d{4}-\d{2}-\d{2})', href)
-        if not url_date:
-            parent = match_link.find_parent(["tr", "li", "div"])
-            if parent:
-                dm = re.search(r'(\d{4}-\d{2}-\d{2})', str(parent))
-                if dm:
-                    url_date = dm
+        ancestral = _ancestral(match_link, ("tr", "li", "div"))
+        url_date = _RE_DATA_JOGO.search(href)
+        if not url_date and ancestral:
+            url_date = _procurar_na_subarvore(ancestral, _RE_DATA)
         if not url_date:
             continue
-        data = url_date.group(1) if hasattr(url_date, 'group') else url_date
+        data = url_date.group(1)
 
         try:
             game_date = datetime.strptime(data, "%Y-%m-%d")
@@ -862,13 +1315,15 @@ def extract_games_from_page(html: str, comp_name: str = "") -> list:
         except Exception:
             continue
 
-        parent = match_link.find_parent(["tr", "li", "div"])
-        if not parent:
-            parent = match_link.parent
+        parent = ancestral or match_link.parent
 
         # Equipas: links /equipa/ com texto não-vazio (ignorar links de logos)
-        team_links = parent.select("a[href*='/equipa/']") if parent else []
-        named_teams = [t.get_text(strip=True) for t in team_links if t.get_text(strip=True)]
+        named_teams = []
+        if parent:
+            for t in _links_com(parent, "/equipa/"):
+                nome = t.get_text(strip=True)
+                if nome:
+                    named_teams.append(nome)
         unique_teams = list(dict.fromkeys(named_teams))
 
         casa, fora = None, None
@@ -879,7 +1334,7 @@ def extract_games_from_page(html: str, comp_name: str = "") -> list:
         # Fallback 1: texto do link do jogo (vs, traço, resultado)
         if not casa or not fora:
             text = match_link.get_text(strip=True)
-            vs = re.match(r'(.+?)\s+(?:vs|x|\d+\s*-\s*\d+|-)\s+(.+)', text, re.IGNORECASE)
+            vs = _RE_VS.match(text)
             if vs:
                 c, f = vs.group(1).strip(), vs.group(2).strip()
                 # Ignorar resultados numéricos (ex: "2 - 1")
@@ -888,12 +1343,12 @@ def extract_games_from_page(html: str, comp_name: str = "") -> list:
 
         # Fallback 2: extrair de <td> adjacentes em tabelas (formação distrital)
         if not casa or not fora:
-            tr = match_link.find_parent("tr")
+            tr = _ancestral(match_link, ("tr",))
             if tr:
                 tds = tr.find_all("td")
                 link_td_idx = None
                 for i, td in enumerate(tds):
-                    if td.find("a", href=re.compile(r'/jogo/')):
+                    if next(_links_com(td, "/jogo/"), None):
                         link_td_idx = i
                         break
                 if link_td_idx is not None:
@@ -937,10 +1392,222 @@ def extract_games_from_page(html: str, comp_name: str = "") -> list:
     return games
 
 
-def scrape_zerozero():
-    base_url = "https://www.zerozero.pt/agenda"
+_RE_HREF_JOGO = re.compile(r"""href=["']([^"']*/jogo/[^"']*)["']""")
+
+
+def _fingerprint_edicao(html: str) -> str:
+    """Hash do conjunto de jogos (id + data) dentro da janela de 14 dias.
+
+    Calculado com regex sobre o HTML cru, sem BeautifulSoup, para que uma
+    edição inalterada não custe parsing nenhum.
+    """
+    hoje = datetime.now().date()
+    limite = hoje + timedelta(days=14)
+    jogos = set()
+    for href in _RE_HREF_JOGO.findall(html):
+        m = re.search(r'/jogo/(\d{4}-\d{2}-\d{2})', href)
+        data = m.group(1) if m else ""
+        if data:
+            try:
+                d = datetime.strptime(data, "%Y-%m-%d").date()
+            except ValueError:
+                continue
+            if d < hoje or d > limite:
+                continue
+        jogos.add(f"{_extract_game_id(href)}@{data}")
+    return hashlib.sha1("\n".join(sorted(jogos)).encode()).hexdigest()
+
+
+def _recolher_edicoes(soup: BeautifulSoup, season_tags: list, edition_urls: list):
+    """Acrescenta a edition_urls os links /edicao/ da época actual encontrados na página."""
     base = "https://www.zerozero.pt"
-    print("🌍 A iniciar scraping do ZeroZero...")
+    for link in soup.select("a[href*='/edicao/']"):
+        href = link.get("href", "")
+        if href and any(tag in href for tag in season_tags):
+            full = href if href.startswith("http") else base + href
+            if full not in edition_urls:
+                edition_urls.append(full)
+
+
+def _retomada_valida(item, edicoes_anteriores: dict) -> bool:
+    """Se um item retomado do checkpoint ainda pode ser usado.
+
+    Uma edição inalterada cujo fingerprint já não está em
+    edicoes_incremental.json (apagado ou reescrito entretanto) não tem chaves
+    para reaproveitar: conta como alterada e tem de ser buscada de novo.
+    """
+    if not isinstance(item, dict) or not item.get("inalterada"):
+        return True
+    anterior = (edicoes_anteriores or {}).get(item.get("edicao"))
+    return bool(anterior) and anterior.get("fp") == item.get("fp")
+
+
+def _scrape_competicao(engine: FetchEngine, comp_name: str, comp_url: str,
+                       season_tags: list, edicoes_anteriores: dict = None,
+                       checkpoint: Checkpoint = None) -> list:
+    """Fase 2 para uma AF/competição: descobre edições e extrai os jogos.
+
+    Corre numa thread do pool de competições, por isso não imprime nada:
+    devolve uma lista ordenada em que cada item é uma linha de log (str) ou
+    um bloco dict com "jogos" e "etiqueta" (None para jogos directos da
+    página); os blocos de edições trazem também "edicao" e "fp".
+
+    Com `edicoes_anteriores` (modo incremental), uma edição cujo fingerprint
+    coincide com o guardado há menos de ZZ_INCREMENTAL_DIAS dias não é
+    parseada: devolve-se só {"edicao", "fp", "inalterada": True}.
+
+    Com `checkpoint`, cada edição processada e a competição (se todas as
+    páginas vieram) ficam registadas; as já registadas não são buscadas.
+    """
+    base = "https://www.zerozero.pt"
+    if checkpoint:
+        guardada = checkpoint.obter("competicao", comp_url)
+        if guardada is not None and all(_retomada_valida(item, edicoes_anteriores) for item in guardada):
+            return ["     ♻️ Retomada do checkpoint"] + guardada
+    saida = []
+    completa = True
+    try:
+        # 1. Visitar página da competição/AF
+        html = engine.fetch(comp_url)
+        if not html:
+            return saida
+
+        comp_soup = make_soup(html)
+
+        # 2. Recolher links de edições directamente (só época atual)
+        edition_urls = []
+        _recolher_edicoes(comp_soup, season_tags, edition_urls)
+
+        # 3. Se não há edições, esta é uma página "umbrella" (AF)
+        #    — descobrir sub-competições primeiro
+        if not edition_urls:
+            sub_comp_urls = []
+            for link in comp_soup.select("a[href*='/competicao/']"):
+                href = link.get("href", "")
+                if href and "/competicao/" in href:
+                    full = href if href.startswith("http") else base + href
+                    if full != comp_url and full not in sub_comp_urls:
+                        sub_comp_urls.append(full)
+
+            sub_comp_urls = sub_comp_urls[:20]
+            if sub_comp_urls:
+                saida.append(f"     📂 {len(sub_comp_urls)} sub-competições encontradas")
+
+            for sc_html in engine.map(sub_comp_urls, retries=1):
+                if not sc_html:
+                    completa = False
+                    continue
+                try:
+                    _recolher_edicoes(make_soup(sc_html),
+                                      season_tags, edition_urls)
+                except Exception:
+                    continue
+
+        # Limitar edições por AF (muitas séries/escalões)
+        edition_urls = edition_urls[:30]
+        saida.append(f"     📖 {len(edition_urls)} edições encontradas")
+
+        # 4. Tentar extrair jogos directamente da página (alguns mostram próximos jogos)
+        if not edition_urls:
+            saida.append({"etiqueta": None, "jogos": extract_games_from_page(comp_soup, comp_name)})
+            if checkpoint and completa:
+                checkpoint.marcar("competicao", comp_url, saida)
+            return saida
+
+        # 5. Para cada edição, visitar próximos jogos e extrair
+        #    Prioridade: "próximos jogos" (só mostra jogos futuros); se não
+        #    funcionou, segunda ronda com a página principal da edição
+        #    (as edições já no checkpoint não são buscadas)
+        retomadas = {u: checkpoint.obter("edicao", u) for u in edition_urls} if checkpoint else {}
+        for u, item in retomadas.items():
+            if item is not None and not _retomada_valida(item, edicoes_anteriores):
+                retomadas[u] = None  # conta como alterada: volta a ser buscada
+        por_buscar = [u for u in edition_urls if retomadas.get(u) is None]
+        paginas = engine.map(
+            [ed_url.rstrip("/") + "/proximos-jogos" for ed_url in por_buscar], retries=1
+        )
+        falhadas = [i for i, h in enumerate(paginas) if not h or len(h) < 5000]
+        for i, html_ed in zip(falhadas, engine.map([por_buscar[i] for i in falhadas], retries=1)):
+            paginas[i] = html_ed
+        paginas = dict(zip(por_buscar, paginas))
+
+        limite_str = (datetime.now() - timedelta(days=ZZ_INCREMENTAL_DIAS)).strftime("%Y-%m-%d")
+        for ed_idx, ed_url in enumerate(edition_urls):
+            if retomadas.get(ed_url) is not None:
+                saida.append(retomadas[ed_url])
+                continue
+            html_ed = paginas[ed_url]
+            try:
+                if not html_ed:
+                    completa = False
+                    continue
+
+                fp = _fingerprint_edicao(html_ed)
+                anterior = (edicoes_anteriores or {}).get(ed_url)
+                if anterior and anterior.get("fp") == fp and anterior.get("em", "") > limite_str:
+                    item = {"edicao": ed_url, "fp": fp, "inalterada": True}
+                    saida.append(item)
+                    if checkpoint:
+                        checkpoint.marcar("edicao", ed_url, item)
+                    continue
+
+                ed_soup = make_soup(html_ed)
+                ed_h1 = ed_soup.select_one("h1, h2.header_title")
+                ed_comp = ed_h1.get_text(strip=True) if ed_h1 else comp_name
+
+                # Debug: primeira edição de cada AF — mostrar o que foi encontrado
+                if ed_idx == 0:
+                    n_game_links = len(ed_soup.select("a[href*='/jogo/']"))
+                    n_team_links = len(ed_soup.select("a[href*='/equipa/']"))
+                    page_title = ed_soup.title.string if ed_soup.title else "sem título"
+                    saida.append(f"     🔍 Debug {ed_comp}: {n_game_links} links /jogo/, {n_team_links} links /equipa/, título: {page_title[:60]}")
+
+                # Tentar os dois parsers: genérico + o da Fase 1 (mesma soup)
+                jogos = extract_games_from_page(ed_soup, ed_comp)
+                if not jogos:
+                    jogos = parse_games_from_html(ed_soup)
+                    for j in jogos:
+                        j["competicao"] = ed_comp
+                        j["has_pt_flag"] = True
+
+                item = {"etiqueta": ed_comp, "jogos": jogos, "edicao": ed_url, "fp": fp}
+                saida.append(item)
+                if checkpoint:
+                    checkpoint.marcar("edicao", ed_url, item)
+            except Exception as e:
+                completa = False
+                saida.append(f"     ⚠️ Erro edição {ed_url}: {e}")
+        if checkpoint and completa:
+            checkpoint.marcar("competicao", comp_url, saida)
+    except Exception as e:
+        saida.append(f"  ⚠️ Erro {comp_name}: {e}")
+    return saida
+
+
+class EstadoScrape:
+    """O que um scrape em streaming deixa para trás além dos eventos.
+
+    Só chaves e estado — o necessário para verificar adiamentos e para o modo
+    incremental — nunca os jogos em si, para que a memória não cresça com o
+    tamanho do crawl.
+    """
+
+    def __init__(self):
+        self.datas_ok = set()
+        self.chaves = set()              # (nome, data) de cada evento emitido
+        self.chaves_inalteradas = set()  # jogos de edições saltadas (modo incremental)
+        self.estado_edicoes = {}
+        self.completo = False
+
+
+def _jogos_zerozero(engine: FetchEngine, incremental: bool, estado: EstadoScrape,
+                    checkpoint: Checkpoint = None):
+    """Fases 1 (agenda) e 2 (AFs/competições): gera os jogos à medida que as páginas são parseadas.
+
+    Os jogos saem sem repetidos (por ID do ZeroZero), pela mesma ordem de
+    antes: agendas por data, depois competições pela ordem da lista.
+    """
+    base_url = "https://www.zerozero.pt/agenda"
 
     # URLs das 20 AFs + competições nacionais (do sitemap zerozero.pt)
     PT_COMPETITION_URLS = {
@@ -971,315 +1638,378 @@ def scrape_zerozero():
         "feminina": "https://www.zerozero.pt/competition/liga-portuguesa-feminina",
     }
 
-    session = create_cf_session()
+    ids_vistos = set()
+    total = 0
+
+    def _novos(jogos: list) -> list:
+        """Jogos ainda não vistos (marca-os como vistos)."""
+        novos = []
+        for jogo in jogos:
+            gid = _extract_game_id(jogo["url"])
+            if gid not in ids_vistos:
+                ids_vistos.add(gid)
+                novos.append(jogo)
+        return novos
+
+    # Scrape hoje + próximos 6 dias (cobre o fim-de-semana)
+    hoje = datetime.now()
+    datas = [
+        (hoje + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)
+    ]
+
+    # Agendas já no checkpoint não são buscadas
+    retomadas = {d: checkpoint.obter("agenda", d) for d in datas} if checkpoint else {}
+    por_buscar = [d for d in datas if retomadas.get(d) is None]
+
+    # Buscar as agendas em paralelo; processar pela ordem das datas
+    agendas = dict(zip(por_buscar, engine.map([f"{base_url}?date={d}" for d in por_buscar])))
+
+    for data_str in datas:
+        print(f"📅 A processar {data_str}...")
+
+        if retomadas.get(data_str) is not None:
+            # Fora de datas_ok: a agenda do checkpoint pode ter até 30h e
+            # verificar_adiamentos só deve comparar com agendas desta execução
+            jogos = retomadas[data_str]
+            novos = _novos(jogos)
+            print(f"   ♻️ {len(jogos)} jogos do checkpoint, {len(novos)} novos")
+            total += len(novos)
+            yield from novos
+            continue
 
-    try:
-        all_games = []
-        ids_vistos = set()
-        datas_ok = set()
-
-        # Scrape hoje + próximos 6 dias (cobre o fim-de-semana)
-        hoje = datetime.now()
-        datas = [
-            (hoje + timedelta(days=i)).strftime("%Y-%m-%d") for i in range(7)
-        ]
-
-        for data_str in datas:
-            url = f"{base_url}?date={data_str}"
-            print(f"📅 A processar {data_str}...")
-
-            html = fetch_html(session, url)
-            if not html:
-                print(f"   ⚠️ Página vazia (sem HTML)")
+        html = agendas[data_str]
+        if not html:
+            print(f"   ⚠️ Página vazia (sem HTML)")
+            continue
+        estado.datas_ok.add(data_str)
+
+        _soup = make_soup(html)
+        jogos = parse_games_from_html(_soup)
+        novos = _novos(jogos)
+        if checkpoint:
+            checkpoint.marcar("agenda", data_str, jogos)
+
+        # Diagnóstico: se 0 jogos, mostrar o que está na página (mesma soup)
+        if not jogos:
+            _title = _soup.title.string if _soup.title else "sem título"
+            _tables = len(_soup.select("table.agenda_list"))
+            _trs = len(_soup.select("table.agenda_list tr"))
+            _jlinks = len(_soup.select("a[href*='/jogo/']"))
+            print(f"   ⚠️ 0 jogos — título: '{_title[:50]}', "
+                  f"agenda_list tables: {_tables}, trs: {_trs}, "
+                  f"/jogo/ links: {_jlinks}, HTML: {len(html)} chars")
+        else:
+            print(f"   🔍 {len(jogos)} jogos na página, {len(novos)} novos")
+        del _soup
+        total += len(novos)
+        yield from novos
+
+    print(f"\n📊 Fase 1 (Agenda): {total} jogos encontrados")
+
+    # ================================================================
+    # FASE 2: Scraping por AF/competição — distritais e formação
+    # ================================================================
+    print("\n🏟️  Fase 2: A descobrir jogos distritais e de formação...")
+    af_total = 0
+
+    # Calcular época atual para filtrar edições relevantes
+    _now = datetime.now()
+    _season_start = _now.year if _now.month >= 8 else _now.year - 1
+    _season_end = _season_start + 1
+    season_tags = [
+        f"{_season_start}-{str(_season_end)[-2:]}",
+        f"{_season_start}-{_season_end}",
+        str(_season_end),
+    ]
+
+    # Modo incremental: fingerprints da execução anterior
+    edicoes_anteriores = _load_edicoes() if incremental else {}
+    if incremental:
+        print(f"♻️  Modo incremental: {len(edicoes_anteriores)} edições com fingerprint")
+    hoje_str = hoje.strftime("%Y-%m-%d")
+    total_inalteradas = 0
+
+    # Competições processadas em paralelo (fila limitada); os resultados são
+    # integrados pela ordem original para que a deduplicação e os logs sejam
+    # determinísticos
+    saidas = mapa_ordenado(
+        lambda item: _scrape_competicao(engine, item[0], item[1], season_tags,
+                                        edicoes_anteriores, checkpoint),
+        PT_COMPETITION_URLS.items(),
+        workers=max(1, ZZ_COMPETICOES),
+    )
+    for comp_name, saida in zip(PT_COMPETITION_URLS, saidas):
+        print(f"  📋 {comp_name}...")
+        inalteradas = 0
+        for item in saida:
+            if isinstance(item, str):
+                print(item)
                 continue
-            datas_ok.add(data_str)
-
-            jogos = parse_games_from_html(html)
-            novos = 0
-            for jogo in jogos:
-                gid = _extract_game_id(jogo["url"])
-                if gid not in ids_vistos:
-                    ids_vistos.add(gid)
-                    all_games.append(jogo)
-                    novos += 1
-
-            # Diagnóstico: se 0 jogos, mostrar o que está na página
-            if not jogos:
-                _soup = BeautifulSoup(html, "html.parser")
-                _title = _soup.title.string if _soup.title else "sem título"
-                _tables = len(_soup.select("table.agenda_list"))
-                _trs = len(_soup.select("table.agenda_list tr"))
-                _jlinks = len(_soup.select("a[href*='/jogo/']"))
-                print(f"   ⚠️ 0 jogos — título: '{_title[:50]}', "
-                      f"agenda_list tables: {_tables}, trs: {_trs}, "
-                      f"/jogo/ links: {_jlinks}, HTML: {len(html)} chars")
-            else:
-                print(f"   🔍 {len(jogos)} jogos na página, {novos} novos")
-
-            time.sleep(0.5)
-
-        print(f"\n📊 Fase 1 (Agenda): {len(all_games)} jogos encontrados")
+            if item.get("inalterada"):
+                # Edição sem alterações: os jogos já estão na DB
+                inalteradas += 1
+                anterior = edicoes_anteriores[item["edicao"]]
+                estado.chaves_inalteradas.update(tuple(k) for k in anterior.get("chaves", []))
+                estado.estado_edicoes[item["edicao"]] = anterior
+                continue
+            jogos = item["jogos"]
+            novos = _novos(jogos)
+            af_total += len(novos)
+            if item.get("edicao"):
+                estado.estado_edicoes[item["edicao"]] = {
+                    "fp": item["fp"], "em": hoje_str,
+                    "chaves": [[f"{j['casa']} vs {j['fora']}", j["data"]] for j in jogos],
+                }
+            if item["etiqueta"] is None:
+                if jogos:
+                    print(f"     ✅ Directos: +{len(jogos)} jogos")
+            elif novos:
+                print(f"     ✅ {item['etiqueta']}: +{len(novos)} jogos")
+            yield from novos
+        if inalteradas:
+            print(f"     ⏭️ {inalteradas} edições inalteradas (modo incremental)")
+        total_inalteradas += inalteradas
+
+    print(f"\n📊 Fase 2 (AFs): +{af_total} jogos distritais/formação")
+    if total_inalteradas:
+        print(f"♻️  {total_inalteradas} edições inalteradas saltadas "
+              f"({len(estado.chaves_inalteradas)} jogos já na DB)")
+    print(f"📊 Total: {total + af_total} jogos encontrados")
+    print(f"⚡ Fetch: {engine.resumo()}")
+
+
+def _jogos_portugueses(jogos):
+    """Filtro + geolocalização: gera só os jogos portugueses com estádio localizado.
+
+    Uma equipa desconhecida vai para a fila de geocoding e o pipeline não
+    pára: o jogo sai já com o centróide do distrito da competição (que é
+    também o fallback se o Nominatim falhar) e `jogo["_geo_pendente"]` guarda
+    a consulta, para o evento ser corrigido quando o estádio chegar. Sem
+    distrito, o jogo fica de lado até a consulta terminar.
+    """
+    aceites = 0
+    skipped_geo = 0
+    adiados = []
 
-        # ================================================================
-        # FASE 2: Scraping por AF/competição — distritais e formação
-        # ================================================================
-        print("\n🏟️  Fase 2: A descobrir jogos distritais e de formação...")
-        af_total = 0
+    def _aceites(resolvidos):
+        nonlocal aceites, skipped_geo
+        for jogo, geo in resolvidos:
+            if not geo:
+                skipped_geo += 1
+                print(f"    ⚠️ Sem geolocalização: {jogo['casa']} vs {jogo['fora']} ({jogo['competicao']})")
+                continue
+            jogo["_geo"] = geo
+            aceites += 1
+            yield jogo
 
-        # Calcular época atual para filtrar edições relevantes
-        _now = datetime.now()
-        _season_start = _now.year if _now.month >= 8 else _now.year - 1
-        _season_end = _season_start + 1
-        season_tags = [
-            f"{_season_start}-{str(_season_end)[-2:]}",
-            f"{_season_start}-{_season_end}",
-            str(_season_end),
-        ]
+    for jogo in jogos:
+        if adiados:
+            yield from _aceites(_avancar_adiados(adiados))
 
-        for comp_name, comp_url in PT_COMPETITION_URLS.items():
-            try:
-                print(f"  📋 {comp_name}...")
+        casa, fora = jogo["casa"], jogo["fora"]
+        comp = jogo["competicao"]
 
-                # 1. Visitar página da competição/AF
-                html = fetch_html(session, comp_url)
-                if not html:
-                    continue
-
-                comp_soup = BeautifulSoup(html, "html.parser")
-
-                # 2. Recolher links de edições directamente (só época atual)
-                edition_urls = []
-                for link in comp_soup.select("a[href*='/edicao/']"):
-                    href = link.get("href", "")
-                    if href and any(tag in href for tag in season_tags):
-                        full = href if href.startswith("http") else base + href
-                        if full not in edition_urls:
-                            edition_urls.append(full)
-
-                # 3. Se não há edições, esta é uma página "umbrella" (AF)
-                #    — descobrir sub-competições primeiro
-                if not edition_urls:
-                    sub_comp_urls = []
-                    for link in comp_soup.select("a[href*='/competicao/']"):
-                        href = link.get("href", "")
-                        if href and "/competicao/" in href:
-                            full = href if href.startswith("http") else base + href
-                            if full != comp_url and full not in sub_comp_urls:
-                                sub_comp_urls.append(full)
-
-                    sub_comp_urls = sub_comp_urls[:5 if _fs_mode else 20]
-                    if sub_comp_urls:
-                        print(f"     📂 {len(sub_comp_urls)} sub-competições encontradas")
-
-                    for sc_url in sub_comp_urls:
-                        try:
-                            sc_html = fetch_html(session, sc_url, retries=1)
-                            if not sc_html:
-                                continue
-                            sc_soup = BeautifulSoup(sc_html, "html.parser")
-                            for link in sc_soup.select("a[href*='/edicao/']"):
-                                href = link.get("href", "")
-                                if href and any(tag in href for tag in season_tags):
-                                    full = href if href.startswith("http") else base + href
-                                    if full not in edition_urls:
-                                        edition_urls.append(full)
-                            time.sleep(0.2)
-                        except Exception:
-                            continue
+        if not is_portuguese_game(
+            casa, fora, comp, jogo.get("has_pt_flag", False)
+        ):
+            continue
 
-                # Limitar edições por AF (muitas séries/escalões)
-                edition_urls = edition_urls[:10 if _fs_mode else 30]
-                print(f"     📖 {len(edition_urls)} edições encontradas")
+        geo, pendente, restantes = _geo_equipas((casa, fora), comp)
+        if pendente is not None:
+            geo = _extract_district(comp)
+            if geo is None:
+                adiados.append([jogo, pendente, restantes])
+                continue
+            jogo["_geo_pendente"] = pendente
+        yield from _aceites([(jogo, geo)])
 
-                # 4. Tentar extrair jogos directamente da página (alguns mostram próximos jogos)
-                if not edition_urls:
-                    jogos = extract_games_from_page(html, comp_name)
-                    for j in jogos:
-                        gid = _extract_game_id(j["url"])
-                        if gid not in ids_vistos:
-                            ids_vistos.add(gid)
-                            all_games.append(j)
-                            af_total += 1
-                    if jogos:
-                        print(f"     ✅ Directos: +{len(jogos)} jogos")
-                    continue
+    if adiados:
+        print(f"  🗺️ A aguardar a geolocalização de {len(adiados)} jogos...")
+    yield from _aceites(_avancar_adiados(adiados, esperar=True))
 
-                # 5. Para cada edição, visitar próximos jogos e extrair
-                for ed_idx, ed_url in enumerate(edition_urls):
-                    try:
-                        # Prioridade: "próximos jogos" (só mostra jogos futuros)
-                        prox_url = ed_url.rstrip("/") + "/proximos-jogos"
-                        html_ed = fetch_html(session, prox_url, retries=1)
+    print(f"\n⚽ {aceites} jogos portugueses ({skipped_geo} sem geolocalização)")
 
-                        # Se não funcionou, tentar página principal da edição
-                        if not html_ed or len(html_ed) < 5000:
-                            html_ed = fetch_html(session, ed_url, retries=1)
 
-                        if not html_ed:
-                            continue
+def _eventos_de_jogos(jogos, pendentes: dict = None):
+    """Classificação: gera o evento (linha da tabela `eventos`) de cada jogo.
 
-                        ed_soup = BeautifulSoup(html_ed, "html.parser")
-                        ed_h1 = ed_soup.select_one("h1, h2.header_title")
-                        ed_comp = ed_h1.get_text(strip=True) if ed_h1 else comp_name
-
-                        # Debug: primeira edição de cada AF — mostrar o que foi encontrado
-                        if ed_idx == 0:
-                            n_game_links = len(ed_soup.select("a[href*='/jogo/']"))
-                            n_team_links = len(ed_soup.select("a[href*='/equipa/']"))
-                            page_title = ed_soup.title.string if ed_soup.title else "sem título"
-                            print(f"     🔍 Debug {ed_comp}: {n_game_links} links /jogo/, {n_team_links} links /equipa/, título: {page_title[:60]}")
-
-                        # Tentar os dois parsers: genérico + o da Fase 1
-                        jogos = extract_games_from_page(html_ed, ed_comp)
-                        if not jogos:
-                            jogos = parse_games_from_html(html_ed)
-                            for j in jogos:
-                                j["competicao"] = ed_comp
-                                j["has_pt_flag"] = True
-
-                        novos_ed = 0
-                        for j in jogos:
-                            gid = _extract_game_id(j["url"])
-                            if gid not in ids_vistos:
-                                ids_vistos.add(gid)
-                                all_games.append(j)
-                                novos_ed += 1
-                                af_total += 1
-
-                        if novos_ed:
-                            print(f"     ✅ {ed_comp}: +{novos_ed} jogos")
-
-                        time.sleep(0.3)
-                    except Exception as e:
-                        print(f"     ⚠️ Erro edição {ed_url}: {e}")
-                        continue
+    Os eventos com o centróide provisório ficam em `pendentes` (por
+    (nome, data)), com o Future da consulta ao Nominatim.
+    """
+    for jogo in jogos:
+        casa, fora = jogo["casa"], jogo["fora"]
+        geo = jogo["_geo"]
+
+        cat, preco, escalao = classificar_evento(jogo["competicao"], f"{casa} vs {fora}")
+
+        evento = {
+            "nome": f"{casa} vs {fora}",
+            "tipo": "Futebol",
+            "categoria": cat,
+            "escalao": escalao,
+            "equipa_casa": casa,
+            "equipa_fora": fora,
+            "url_jogo": jogo.get("url", ""),
+            "url_equipa_casa": "",
+            "url_equipa_fora": "",
+            "url_classificacao": "",
+            "data": jogo["data"],
+            "hora": jogo["hora"],
+            "local": geo["local"],
+            "latitude": geo["lat"],
+            "longitude": geo["lon"],
+            "preco": preco,
+            "descricao": f"Jogo de {cat}. {jogo['competicao']}",
+            "url_maps": (
+                f"https://www.google.com/maps/search/"
+                f"?api=1&query={geo['lat']},{geo['lon']}"
+            ),
+            "status": "aprovado",
+        }
+
+        if pendentes is not None and jogo.get("_geo_pendente"):
+            pendentes[(evento["nome"], evento["data"])] = jogo["_geo_pendente"]
+
+        print(f"  ✅ {evento['nome']} ({jogo['data']} {jogo['hora']})")
+        yield evento
+
+
+class CorrecaoLocal(dict):
+    """Colunas de localização a actualizar num evento já emitido (chave nome, data).
+
+    Sai no mesmo stream que os eventos, mas não é um evento: vai para
+    `Sincronizador.corrigir` (update da linha já escrita), nunca para o upsert.
+    """
 
-                time.sleep(0.2)
-            except Exception as e:
-                print(f"  ⚠️ Erro {comp_name}: {e}")
-                continue
 
-        print(f"\n📊 Fase 2 (AFs): +{af_total} jogos distritais/formação")
-        print(f"📊 Total: {len(all_games)} jogos encontrados")
-
-        # Filtrar: manter apenas jogos portugueses relevantes
-        jogos_pt = []
-        skipped_geo = 0
-        for jogo in all_games:
-            casa, fora = jogo["casa"], jogo["fora"]
-            comp = jogo["competicao"]
-            
-            if not is_portuguese_game(
-                casa, fora, comp, jogo.get("has_pt_flag", False)
-            ):
-                continue
-
-            geo = (
-                geolocalizar_estadio(casa, comp)
-                or geolocalizar_estadio(fora, comp)
-            )
-            if not geo:
-                skipped_geo += 1
-                print(f"    ⚠️ Sem geolocalização: {casa} vs {fora} ({comp})")
-                continue
+def _eventos_corrigidos(provisorios: list, esperar: bool = False):
+    """Eventos que saíram com o centróide do distrito e cujo estádio o Nominatim já encontrou.
 
-            jogo["_geo"] = geo
-            jogos_pt.append(jogo)
-
-        print(f"\n⚽ {len(jogos_pt)} jogos portugueses ({skipped_geo} sem geolocalização)")
-
-        # Construir resultados + extrair detalhes (equipas/classificação) dos jogos
-        resultados = []
-
-        for idx, jogo in enumerate(jogos_pt):
-            casa, fora = jogo["casa"], jogo["fora"]
-            geo = jogo["_geo"]
-
-            cat, preco, escalao = classificar_evento(jogo["competicao"], f"{casa} vs {fora}")
-
-            evento = {
-                "nome": f"{casa} vs {fora}",
-                "tipo": "Futebol",
-                "categoria": cat,
-                "escalao": escalao,
-                "equipa_casa": casa,
-                "equipa_fora": fora,
-                "url_jogo": jogo.get("url", ""),
-                "url_equipa_casa": "",
-                "url_equipa_fora": "",
-                "url_classificacao": "",
-                "data": jogo["data"],
-                "hora": jogo["hora"],
+    Sai só a parte da localização (CorrecaoLocal), com a chave (nome, data):
+    o sync actualiza essas colunas da linha já escrita (ou do repetido que a
+    substituiu) sem tocar no resto. Sem estádio, o centróide fica como
+    coordenada final.
+    """
+    i = 0
+    while i < len(provisorios):
+        evento, pendente = provisorios[i]
+        if not (esperar or pendente.done()):
+            i += 1
+            continue
+        provisorios.pop(i)
+        geo = pendente.result()
+        if geo:
+            yield CorrecaoLocal({
+                "nome": evento["nome"],
+                "data": evento["data"],
                 "local": geo["local"],
                 "latitude": geo["lat"],
                 "longitude": geo["lon"],
-                "preco": preco,
-                "descricao": f"Jogo de {cat}. {jogo['competicao']}",
                 "url_maps": (
                     f"https://www.google.com/maps/search/"
                     f"?api=1&query={geo['lat']},{geo['lon']}"
                 ),
-                "status": "aprovado",
-            }
+            })
 
-            # Extrair URLs de equipas e classificação a partir da página do jogo
-            if jogo.get("url"):
-                try:
-                    details = scrape_game_details(session, jogo["url"])
-                    evento["url_equipa_casa"] = details.get("url_equipa_casa", "")
-                    evento["url_equipa_fora"] = details.get("url_equipa_fora", "")
-                    evento["url_classificacao"] = details.get("url_classificacao", "")
-                    time.sleep(0.3)
-                except Exception as e:
-                    print(f"    ⚠️ Sem detalhes para {casa} vs {fora}: {e}")
 
-                # Progresso
-                if (idx + 1) % 20 == 0:
-                    print(f"  📋 Detalhes: {idx + 1}/{len(jogos_pt)} jogos processados")
+def scrape_zerozero(incremental: bool = True, estado: EstadoScrape = None,
+                    checkpoint: Checkpoint = None):
+    """Scrape completo do ZeroZero como pipeline de geradores.
 
-            resultados.append(evento)
-            print(f"  ✅ {evento['nome']} ({jogo['data']} {jogo['hora']})")
+    fetch → parse (fases 1 e 2) → filtro PT → geolocalização → classificação
+    → detalhes: cada evento sai assim que está pronto, para ser escrito na DB
+    enquanto o crawl continua. `estado` recebe as datas scrapeadas, as chaves
+    (nome, data) emitidas e as das edições saltadas pelo modo incremental, e o
+    novo estado de fingerprints; `estado.completo` só fica True se o crawl
+    chegou ao fim sem erros.
 
-        print(f"\n🔗 Detalhes extraídos para {sum(1 for r in resultados if r['url_equipa_casa'])} jogos")
+    Com `checkpoint`, agendas, edições e competições concluídas ficam
+    registadas à medida que terminam, e as já registadas (--resume) são
+    reaproveitadas em vez de buscadas: os seus jogos voltam a passar pelo
+    pipeline, onde o sync por diferenças os encontra já escritos.
+    """
+    estado = estado if estado is not None else EstadoScrape()
+    print("🌍 A iniciar scraping do ZeroZero...")
 
-        return resultados, datas_ok
+    session = create_cf_session()
+    engine = FetchEngine(
+        lambda url, retries=3: fetch_html(session, url, retries, engine.taxa(url)),
+        max_workers=_concorrencia() * 2,
+        por_host=_concorrencia(),
+        taxa_por_host=ZZ_TAXA,
+        taxa_max=ZZ_TAXA_MAX,
+        atalho=_html_em_cache,
+    )
+    print(f"⚡ Fetch concorrente: {_concorrencia()} pedidos simultâneos, "
+          f"{ZZ_TAXA:g} pedidos/s por host (adaptativa até {ZZ_TAXA_MAX:g})")
+
+    try:
+        jogos = _jogos_zerozero(engine, incremental, estado, checkpoint)
+        pendentes = {}
+        eventos = _eventos_de_jogos(_jogos_portugueses(jogos), pendentes)
+        # Extrair URLs de equipas e classificação a partir da página de cada jogo.
+        # Um evento provisório só é corrigido depois de ter saído: enquanto
+        # está em voo no enriquecimento, a correcção chegaria antes dele
+        provisorios = []
+        corrigidos = 0
+        for evento in _enriquecer(engine, eventos):
+            estado.chaves.add((evento["nome"], evento["data"]))
+            yield evento
+            pendente = pendentes.pop((evento["nome"], evento["data"]), None)
+            if pendente is not None:
+                provisorios.append((evento, pendente))
+            for corrigido in _eventos_corrigidos(provisorios):
+                corrigidos += 1
+                yield corrigido
+        for corrigido in _eventos_corrigidos(provisorios, esperar=True):
+            corrigidos += 1
+            yield corrigido
+        print(f"🗺️ Geocoding em segundo plano: {fila_geo.resumo()}, {nominatim.pedidos} pedidos "
+              f"ao Nominatim, {corrigidos} eventos corrigidos do centróide para o estádio")
+        if http_cache:
+            print(f"💽 Cache HTTP: {http_cache.resumo()}")
+        estado.completo = True
 
     except Exception as e:
         print(f"❌ Erro Scraping: {e}")
-        return [], set()
     finally:
+        engine.close()
+        for linha in engine.resumo_hosts():
+            print(f"🚦 Taxa {linha}")
         session.close()
         _fs_cleanup()
 
 
-def verificar_adiamentos(eventos_novos: list, datas_ok: set):
-    """Compara eventos futuros na DB com scrape fresco para detectar adiamentos."""
-    hoje = datetime.now().strftime("%Y-%m-%d")
+def verificar_adiamentos(chaves_scrape: set, datas_ok: set, chaves_extra: set = frozenset()):
+    """Compara eventos futuros na DB com scrape fresco para detectar adiamentos.
 
+    `chaves_scrape` são os (nome, data) dos jogos do scrape; `chaves_extra`
+    são (nome, data) de jogos não re-scrapeados mas confirmados (edições
+    inalteradas no modo incremental). As transições são calculadas em memória
+    e aplicadas em bloco: um update por lote de ids para os adiados e um
+    upsert por (nome, data) para os remarcados (cada um com a sua descrição;
+    o id é gerado pela DB e não pode ir no payload).
+    """
+    t0 = time.perf_counter()
     try:
-        result = (
-            supabase.table("eventos")
-            .select("*")
-            .gte("data", hoje)
-            .eq("status", "aprovado")
-            .eq("tipo", "Futebol")
-            .execute()
+        eventos_db = carregar_futuros(
+            supabase, colunas="id, nome, data, descricao", status="aprovado", tipo="Futebol"
         )
-        eventos_db = result.data or []
     except Exception as e:
         print(f"⚠️ Erro ao verificar adiamentos: {e}")
         return
+    t_leitura = time.perf_counter() - t0
 
     # Jogos encontrados no scrape: (nome, data)
-    scrape_set = {(ev["nome"], ev["data"]) for ev in eventos_novos}
+    scrape_set = set(chaves_scrape) | set(chaves_extra)
 
     # Nomes → datas no scrape (para detectar remarcações)
     nomes_datas = {}
-    for ev in eventos_novos:
-        nomes_datas.setdefault(ev["nome"], []).append(ev["data"])
+    for nome, data in scrape_set:
+        nomes_datas.setdefault(nome, []).append(data)
 
-    adiados = 0
-    remarcados = 0
+    adiados = []      # ids
+    remarcados = []   # linhas para upsert por (nome, data)
 
     for ev_db in eventos_db:
         nome, data = ev_db["nome"], ev_db["data"]
@@ -1292,63 +2022,100 @@ def verificar_adiamentos(eventos_novos: list, datas_ok: set):
             continue
 
         # Jogo não aparece no scrape para esta data
-        if nome in nomes_datas:
-            novas = [d for d in nomes_datas[nome] if d != data]
-            if novas:
-                supabase.table("eventos").update({
-                    "status": "adiado",
-                    "descricao": f"⚠️ Remarcado para {novas[0]}. " + (ev_db.get("descricao") or ""),
-                }).eq("id", ev_db["id"]).execute()
-                remarcados += 1
-                print(f"  🔄 Remarcado: {nome} ({data} → {novas[0]})")
-                continue
-
-        supabase.table("eventos").update({
-            "status": "adiado",
-        }).eq("id", ev_db["id"]).execute()
-        adiados += 1
-        print(f"  ⚠️ Adiado: {nome} ({data})")
+        novas = [d for d in nomes_datas.get(nome, []) if d != data]
+        if novas:
+            remarcados.append({
+                "nome": nome, "data": data, "status": "adiado",
+                "descricao": f"⚠️ Remarcado para {novas[0]}. " + (ev_db.get("descricao") or ""),
+            })
+            print(f"  🔄 Remarcado: {nome} ({data} → {novas[0]})")
+        else:
+            adiados.append(ev_db["id"])
+            print(f"  ⚠️ Adiado: {nome} ({data})")
+    t_calculo = time.perf_counter() - t0 - t_leitura
+
+    pedidos = 0
+    if adiados:
+        pedidos += atualizar_por_ids(supabase, "eventos", {"status": "adiado"}, adiados).pedidos
+    if remarcados:
+        pedidos += upsert_em_lotes(supabase, "eventos", remarcados).pedidos
+    t_escrita = time.perf_counter() - t0 - t_leitura - t_calculo
 
     if adiados or remarcados:
-        print(f"📋 Adiamentos: {adiados} adiados, {remarcados} remarcados")
+        print(f"📋 Adiamentos: {len(adiados)} adiados, {len(remarcados)} remarcados")
     else:
         print("📋 Sem adiamentos detectados")
+    print(f"⏱️ Adiamentos: {len(eventos_db)} jogos lidos em {t_leitura * 1000:.0f} ms, "
+          f"cálculo {t_calculo * 1000:.1f} ms, escrita {t_escrita * 1000:.0f} ms ({pedidos} pedidos)")
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Scraper de futebol (ZeroZero) — Rota da Festa")
+    parser.add_argument("--completo", action="store_true",
+                        help="ignora os fingerprints do modo incremental e re-processa todas as edições")
+    parser.add_argument("--resume", action="store_true",
+                        help="continua a partir do checkpoint da última execução interrompida")
+    args = parser.parse_args()
+
     # 1. Quinta-feira: limpar eventos concluídos
     limpar_eventos_concluidos()
 
-    # 2. Scrape de novos eventos
-    eventos, datas_ok = scrape_zerozero()
+    # 2. Scrape e escrita em streaming: cada lote de ZZ_LOTE eventos vai para o
+    #    Supabase enquanto o crawl continua (só os novos ou alterados são escritos;
+    #    os apagados ficam a cargo de verificar_adiamentos)
+    print(f"\n📦 A guardar eventos no Supabase em lotes de {ZZ_LOTE}...")
+    estado = EstadoScrape()
+    checkpoint = Checkpoint(ZZ_CHECKPOINT, {"incremental": not args.completo},
+                            retomar=args.resume, validade_horas=ZZ_CHECKPOINT_HORAS)
+    sync = Sincronizador(supabase, rotulo="futebol")
+    eventos = em_fundo(
+        scrape_zerozero(incremental=not args.completo, estado=estado, checkpoint=checkpoint),
+        ZZ_FILA,
+    )
+    correcoes = 0
+    for lote in em_lotes(eventos, ZZ_LOTE):
+        # Uma correcção vem sempre depois do seu evento no stream: com o lote
+        # escrito primeiro, a linha já está na base quando é actualizada
+        sync.enviar([e for e in lote if not isinstance(e, CorrecaoLocal)])
+        correcoes += sync.corrigir([e for e in lote if isinstance(e, CorrecaoLocal)])
+    escrita = sync.fechar()
+    if correcoes:
+        print(f"📍 {correcoes} eventos com o estádio no lugar do centróide do distrito")
+    erros = escrita.erros
+    print(f"🏁 Feito. {len(estado.chaves)} eventos; {escrita.resumo()}")
+    if checkpoint.retomadas:
+        print(f"♻️  {checkpoint.retomadas} agendas/edições/competições reaproveitadas do checkpoint")
+
+    # Com tudo scrapeado e escrito, o checkpoint já não é preciso; senão fica
+    # para uma execução com --resume continuar daqui
+    if estado.completo and not erros:
+        checkpoint.concluir()
+    else:
+        checkpoint.close()
+        print(f"💾 Checkpoint guardado ({checkpoint.resumo()}) — correr com --resume para continuar")
 
-    if not eventos:
+    if not estado.chaves and not estado.chaves_inalteradas:
         print("⚠️ Nenhum evento português encontrado.")
         return
 
-    # 3. Verificar adiamentos (antes de guardar novos)
-    print("\n🔍 A verificar adiamentos...")
-    verificar_adiamentos(eventos, datas_ok)
-
-    # 4. Guardar na base de dados (upsert: atualiza existentes, insere novos)
-    print(f"\n📦 A guardar {len(eventos)} eventos no Supabase...")
-    guardados = 0
-    erros = 0
-    for ev in eventos:
-        try:
-            supabase.table("eventos").upsert(ev, on_conflict="nome,data").execute()
-            guardados += 1
-        except Exception as e:
-            erros += 1
-            if erros <= 5:
-                print(f"  Erro DB: {e}")
-            elif erros == 6:
-                print("  ... (mais erros omitidos)")
-
-    print(f"🏁 Feito. {guardados}/{len(eventos)} eventos guardados ({erros} erros).")
+    # 3. Verificar adiamentos (só com o crawl completo: um crawl interrompido
+    #    marcaria como adiados os jogos que ficaram por ver)
+    if estado.completo:
+        print("\n🔍 A verificar adiamentos...")
+        verificar_adiamentos(estado.chaves, estado.datas_ok, estado.chaves_inalteradas)
+    else:
+        print("⚠️ Scrape incompleto: verificação de adiamentos saltada")
 
-    # 5. Guardar cache de estádios para próximas execuções
+    # 4. Guardar cache de estádios e fingerprints para próximas execuções
+    #    (com erros de escrita ou crawl incompleto não se guardam fingerprints:
+    #    a próxima execução re-processa tudo)
     _save_cache()
+    print(f"🗺️ Geocoding: {geo_store.resumo()}; {gazetteer.resumo()}; "
+          f"{nominatim.pedidos} pedidos ao Nominatim")
+    if erros or not estado.completo:
+        print("⚠️ Fingerprints de edições não guardados (houve erros de escrita ou scrape incompleto)")
+    else:
+        _save_edicoes(estado.estado_edicoes)
 
 
 if __name__ == "__main__":
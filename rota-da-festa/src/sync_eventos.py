@@ -0,0 +1,264 @@
+"""
+Sincronização por diferenças com a tabela `eventos` — Rota da Festa
+====================================================================
+Em vez de fazer upsert de todos os eventos raspados, lê uma vez as linhas
+futuras da base, calcula um hash estável do conteúdo de cada evento (sem os
+campos voláteis id/created_at/updated_at, com os números normalizados)
+e produz um conjunto de alterações:
+  - inserir: (nome, data) que ainda não existe
+  - atualizar: existe mas o conteúdo mudou
+  - apagar: linha futura do âmbito do scraper que já não aparece no scrape
+    (só é aplicado com SYNC_APAGAR=1; por omissão fica no log)
+Linhas iguais não geram escrita nenhuma.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+
+from batch_writer import ResultadoEscrita, upsert_em_lotes
+
+_VOLATEIS = {"id", "created_at", "updated_at"}
+
+
+def _normalizar(valor):
+    if valor is None:
+        return ""
+    if isinstance(valor, bool):
+        return valor
+    if isinstance(valor, (int, float)):
+        return round(float(valor), 6)
+    return valor
+
+
+def hash_conteudo(evento: dict, campos=None) -> str:
+    """Hash do conteúdo de `evento` nos `campos` dados (por omissão, os seus)."""
+    campos = sorted(c for c in (campos if campos is not None else evento) if c not in _VOLATEIS)
+    dados = {c: _normalizar(evento.get(c)) for c in campos}
+    return hashlib.sha1(
+        json.dumps(dados, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+    ).hexdigest()
+
+
+class Alteracoes:
+    """Conjunto de alterações de uma sincronização."""
+
+    def __init__(self):
+        self.inserir = []
+        self.atualizar = []
+        self.apagar = []
+        self.iguais = 0
+        self.fundidos = 0
+
+    def somar(self, outras: "Alteracoes"):
+        self.inserir += outras.inserir
+        self.atualizar += outras.atualizar
+        self.apagar += outras.apagar
+        self.iguais += outras.iguais
+        self.fundidos += outras.fundidos
+
+    @property
+    def escrever(self) -> list:
+        return self.inserir + self.atualizar
+
+    def resumo(self) -> str:
+        return (f"{len(self.inserir)} novos, {len(self.atualizar)} alterados, "
+                f"{self.iguais} iguais (sem escrita), {len(self.apagar)} a apagar")
+
+
+def carregar_futuros(cliente, desde: str = None, colunas: str = "*", pagina: int = 1000,
+                     **filtros) -> list:
+    """Todas as linhas de `eventos` com data >= desde (hoje), paginadas (limite do PostgREST).
+
+    `filtros` são igualdades extra (ex: status="aprovado", tipo="Futebol").
+    """
+    desde = desde or datetime.now().strftime("%Y-%m-%d")
+    linhas = []
+    inicio = 0
+    while True:
+        query = cliente.table("eventos").select(colunas).gte("data", desde)
+        for coluna, valor in filtros.items():
+            query = query.eq(coluna, valor)
+        result = query.order("id").range(inicio, inicio + pagina - 1).execute()
+        bloco = result.data or []
+        linhas.extend(bloco)
+        if len(bloco) < pagina:
+            return linhas
+        inicio += pagina
+
+
+def _indexar(existentes: list) -> dict:
+    return {(r.get("nome"), r.get("data")): r for r in existentes}
+
+
+def _comparar(novos: list, por_chave: dict, alteracoes: "Alteracoes") -> dict:
+    """Classifica `novos` contra `por_chave` (acumula em `alteracoes`); devolve os únicos por chave."""
+    # Repetidos no próprio scrape: fundir como fariam os upserts em série
+    unicos = {}
+    for ev in novos:
+        k = (ev.get("nome"), ev.get("data"))
+        unicos[k] = {**unicos[k], **ev} if k in unicos else ev
+    alteracoes.fundidos += len(novos) - len(unicos)
+
+    for k, ev in unicos.items():
+        linha = por_chave.get(k)
+        if linha is None:
+            alteracoes.inserir.append(ev)
+        elif hash_conteudo(ev) == hash_conteudo(linha, campos=ev.keys()):
+            alteracoes.iguais += 1
+        else:
+            alteracoes.atualizar.append(ev)
+    return unicos
+
+
+def calcular_alteracoes(novos: list, existentes: list, ambito=None) -> Alteracoes:
+    """Compara os eventos raspados com as linhas da base, por (nome, data).
+
+    `ambito(linha)` diz que linhas da base pertencem a este scraper; só essas
+    podem ir para `apagar`. Sem âmbito nunca se propõe apagar nada.
+    """
+    alteracoes = Alteracoes()
+    por_chave = _indexar(existentes)
+    unicos = _comparar(novos, por_chave, alteracoes)
+    if ambito is not None:
+        alteracoes.apagar = [r for k, r in por_chave.items() if k not in unicos and ambito(r)]
+    return alteracoes
+
+
+def _apagar(cliente, linhas: list, lote: int = 200) -> int:
+    ids = [r["id"] for r in linhas if r.get("id") is not None]
+    apagados = 0
+    for i in range(0, len(ids), lote):
+        try:
+            cliente.table("eventos").delete().in_("id", ids[i:i + lote]).execute()
+            apagados += len(ids[i:i + lote])
+        except Exception as e:
+            print(f"  ⚠️ Erro a apagar eventos: {e}")
+    return apagados
+
+
+class Sincronizador:
+    """Sincronização incremental: os eventos chegam em lotes (pipeline em streaming).
+
+    As linhas futuras da base são lidas uma vez na criação; cada `enviar(lote)`
+    escreve logo os novos/alterados desse lote, `corrigir(correcoes)` actualiza
+    colunas de linhas já escritas, e `fechar()` trata dos apagados (que só se
+    conhecem no fim) e devolve o ResultadoEscrita acumulado.
+    Se a leitura da base falhar, escreve tudo como antes.
+    """
+
+    def __init__(self, cliente, ambito=None, rotulo: str = "eventos", **opcoes_escrita):
+        self.cliente = cliente
+        self.ambito = ambito
+        self.rotulo = rotulo
+        self.opcoes_escrita = opcoes_escrita
+        self.alteracoes = Alteracoes()
+        self.escrita = ResultadoEscrita(0)
+        self._vistas = set()
+        self._escritas = set()  # (nome, data) que se sabe estarem na base
+        try:
+            self._por_chave = _indexar(carregar_futuros(cliente))
+            self._originais = set(self._por_chave)
+        except Exception as e:
+            print(f"  ⚠️ Sync: erro a ler eventos existentes ({e}) — a escrever todos")
+            self._por_chave = None
+
+    @property
+    def por_diferencas(self) -> bool:
+        """False se a leitura da base falhou e tudo é escrito sem comparar."""
+        return self._por_chave is not None
+
+    def na_base(self, chave: tuple):
+        """Linha conhecida da base para (nome, data) `chave`; None se é nova ou sem leitura da base."""
+        return self._por_chave.get(chave) if self._por_chave is not None else None
+
+    def registar(self, chave: tuple, valores: dict):
+        """Junta `valores` ao que se sabe da linha (nome, data) `chave` na base."""
+        if self._por_chave is not None:
+            self._por_chave[chave] = {**self._por_chave.get(chave, {}), **valores}
+
+    def enviar(self, eventos: list):
+        if not eventos:
+            return
+        if self._por_chave is None:
+            self._escritas.update((ev.get("nome"), ev.get("data")) for ev in eventos)
+            self._escrever(eventos)
+            return
+        parcial = Alteracoes()
+        unicos = _comparar(eventos, self._por_chave, parcial)
+        self._vistas.update(unicos)
+        self.alteracoes.somar(parcial)
+        # Iguais já estavam na base; novos/alterados só se o upsert não falhar
+        self._escritas.update(unicos)
+        if parcial.escrever:
+            self._escrever(parcial.escrever)
+        # Um (nome, data) repetido num lote seguinte compara com o que já foi escrito
+        for k, ev in unicos.items():
+            self.registar(k, ev)
+
+    def _escrever(self, linhas: list):
+        resultado = upsert_em_lotes(self.cliente, "eventos", linhas,
+                                    on_conflict="nome,data", **self.opcoes_escrita)
+        self.escrita.somar(resultado)
+        self._escritas.difference_update((l.get("nome"), l.get("data")) for l, _ in resultado.falhados)
+
+    def corrigir(self, correcoes: list) -> int:
+        """Actualiza colunas de linhas já escritas nesta execução, por (nome, data).
+
+        Cada correcção traz `nome`, `data` e as colunas a mudar. Vai como
+        `update` filtrado pela chave e não como upsert: uma correcção para uma
+        linha que não chegou à base (lote falhado) não pode inserir uma linha
+        só com essas colunas. Essas são ignoradas. Devolve quantas se aplicaram.
+        """
+        aplicadas = 0
+        for correcao in correcoes:
+            chave = (correcao.get("nome"), correcao.get("data"))
+            if chave not in self._escritas:
+                continue
+            valores = {c: v for c, v in correcao.items() if c not in ("nome", "data")}
+            self.escrita.pedidos += 1
+            try:
+                self.cliente.table("eventos").update(valores).eq("nome", chave[0]).eq("data", chave[1]).execute()
+            except Exception as e:
+                self.escrita.falhados.append((correcao, e))
+                print(f"  Erro DB: {e}")
+                continue
+            aplicadas += 1
+            self.registar(chave, valores)
+        return aplicadas
+
+    def fechar(self):
+        """Fim do stream: regista o resumo, trata dos apagados e devolve o ResultadoEscrita."""
+        if self._por_chave is None:
+            return self.escrita
+        if self.ambito is not None:
+            self.alteracoes.apagar = [
+                self._por_chave[k] for k in self._originais - self._vistas
+                if self.ambito(self._por_chave[k])
+            ]
+        print(f"  🔄 Sync {self.rotulo}: {self.alteracoes.resumo()}")
+
+        apagar = self.alteracoes.apagar
+        if apagar:
+            if os.environ.get("SYNC_APAGAR") == "1":
+                n = _apagar(self.cliente, apagar)
+                print(f"  🗑️ Sync {self.rotulo}: {n} eventos apagados (já não aparecem na fonte)")
+            else:
+                for r in apagar[:5]:
+                    print(f"    · {r.get('nome')} ({r.get('data')})")
+                print(f"  ℹ️ Sync {self.rotulo}: {len(apagar)} eventos já não aparecem na fonte "
+                      f"(SYNC_APAGAR=1 para os apagar)")
+        return self.escrita
+
+
+def sincronizar(cliente, novos: list, ambito=None, rotulo: str = "eventos", **opcoes_escrita):
+    """Escreve só o que mudou, de uma vez. Devolve (Alteracoes ou None, ResultadoEscrita).
+
+    Se a leitura da base falhar, cai para o upsert de tudo (comportamento antigo).
+    `opcoes_escrita` segue para upsert_em_lotes.
+    """
+    sync = Sincronizador(cliente, ambito, rotulo, **opcoes_escrita)
+    sync.enviar(novos)
+    escrita = sync.fechar()
+    return (sync.alteracoes if sync.por_diferencas else None), escrita
@@ -0,0 +1,69 @@
+"""
+Índice de nomes de equipas — Rota da Festa
+===========================================
+Substitui a varredura linear `for k in CACHE_ESTADIOS: _team_match(k, nome)`.
+
+A regra de `_team_match(pt, nome)` é: `pt.lower()` igual ao nome normalizado
+(`nome.lower().strip()`) ou contido nele com len(pt)/len(nome) > 0.55. Ou
+seja, qualquer chave que coincida é uma *substring* do nome procurado com um
+comprimento mínimo. O índice guarda as chaves num dicionário e, para cada
+consulta, gera apenas as substrings do nome com comprimentos que existem no
+índice — o custo depende do tamanho do nome, não do número de equipas.
+
+Quando várias chaves coincidem devolve-se a que foi inserida primeiro, tal
+como a varredura pela ordem do dicionário.
+"""
+
+from itertools import islice
+
+
+class IndiceEquipas:
+    """Nomes de equipas indexados para a regra de `_team_match`."""
+
+    def __init__(self, nomes=()):
+        self._chaves = {}      # nome.lower() -> (ordem de inserção, nome original)
+        self._tamanhos = set()  # comprimentos de chave presentes
+        self._originais = set()
+        for nome in nomes:
+            self.adicionar(nome)
+
+    def __len__(self) -> int:
+        return len(self._originais)
+
+    def adicionar(self, nome: str):
+        if nome in self._originais:
+            return
+        chave = nome.lower()
+        if chave not in self._chaves:
+            self._chaves[chave] = (len(self._originais), nome)
+            self._tamanhos.add(len(chave))
+        self._originais.add(nome)
+
+    def sincronizar(self, nomes):
+        """Acrescenta as chaves novas de um dicionário que só cresce no fim (ex: CACHE_ESTADIOS)."""
+        if len(nomes) != len(self):
+            for nome in islice(nomes, len(self), None):
+                self.adicionar(nome)
+
+    def procurar(self, nome_equipa: str):
+        """Devolve a primeira chave (por ordem de inserção) que coincide com o nome, ou None."""
+        tl = nome_equipa.lower().strip()
+        n = len(tl)
+        if n == 0:
+            encontrado = self._chaves.get("")
+            return encontrado[1] if encontrado else None
+
+        melhor = None
+        for tamanho in range(n, 0, -1):
+            if not tamanho / n > 0.55:
+                break
+            if tamanho not in self._tamanhos:
+                continue
+            for i in range(n - tamanho + 1):
+                encontrado = self._chaves.get(tl[i:i + tamanho])
+                if encontrado and (melhor is None or encontrado[0] < melhor[0]):
+                    melhor = encontrado
+        return melhor[1] if melhor else None
+
+    def contem(self, nome_equipa: str) -> bool:
+        return self.procurar(nome_equipa) is not None